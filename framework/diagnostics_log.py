@@ -0,0 +1,55 @@
+"""
+Appendable Diagnostics Log
+run_sim.py appends one fixed-width float64 record per saved step, so a
+reader can pick up new samples by offset while the simulation is running.
+"""
+import numpy as np
+from pathlib import Path
+
+FIELDS = (
+    'time',
+    'total_entropy',
+    'entropy_production',
+    'kinetic_energy',
+    'potential_energy',
+)
+RECORD = np.dtype([(name, '<f8') for name in FIELDS])
+
+
+class DiagnosticsLogWriter:
+    """Append diagnostics dicts as binary records (truncates on open)"""
+
+    def __init__(self, filepath):
+        self.path = Path(filepath)
+        self.f = open(self.path, "wb")
+
+    def append(self, diag):
+        rec = np.array([tuple(float(diag[name]) for name in FIELDS)], dtype=RECORD)
+        self.f.write(rec.tobytes())
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class DiagnosticsLogReader:
+    """Incrementally read complete records appended since the last call"""
+
+    def __init__(self, filepath):
+        self.path = Path(filepath)
+        self.offset = 0
+
+    def read_new(self):
+        """Return {field: array} of new records (empty arrays if none)"""
+        if not self.path.exists():
+            return {name: np.empty(0) for name in FIELDS}
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            raw = f.read()
+
+        # Ignore a trailing partial record still being written
+        n = len(raw) // RECORD.itemsize
+        self.offset += n * RECORD.itemsize
+        recs = np.frombuffer(raw[:n * RECORD.itemsize], dtype=RECORD)
+        return {name: recs[name].copy() for name in FIELDS}
@@ -0,0 +1,174 @@
+"""
+Field → Geometry Buffers
+Pure NumPy conversion of (φ, v, S) snapshots into flat vertex attribute
+arrays. No bpy dependency: the Blender side only calls foreach_set once
+per attribute.
+"""
+import numpy as np
+
+
+def lattice_coords(indices, N):
+    """Map integer lattice indices to world coordinates in [-1, 1)"""
+    step = 2.0 / N
+    return (np.asarray(indices, dtype=np.float32) - N / 2) * step
+
+
+def lattice_trilinear(field, coords, periodic=True):
+    """
+    Trilinearly interpolate a lattice field at fractional index coordinates.
+
+    Args:
+        field    : (..., N, N, N) array; leading axes (e.g. the 3 of v) are kept
+        coords   : (M, 3) fractional lattice indices
+        periodic : wrap indices, otherwise clamp to the lattice
+
+    Returns:
+        (..., M) interpolated values
+    """
+    shape = np.array(field.shape[-3:])
+    coords = np.asarray(coords, dtype=np.float64)
+
+    if periodic:
+        coords = np.mod(coords, shape)
+    else:
+        coords = np.clip(coords, 0, shape - 1)
+
+    base = np.floor(coords).astype(np.intp)
+    frac = coords - base
+    if periodic:
+        nxt = (base + 1) % shape
+    else:
+        base = np.minimum(base, shape - 1)
+        nxt = np.minimum(base + 1, shape - 1)
+
+    i0, j0, k0 = base.T
+    i1, j1, k1 = nxt.T
+    fx, fy, fz = frac.T
+
+    c00 = field[..., i0, j0, k0] * (1 - fx) + field[..., i1, j0, k0] * fx
+    c10 = field[..., i0, j1, k0] * (1 - fx) + field[..., i1, j1, k0] * fx
+    c01 = field[..., i0, j0, k1] * (1 - fx) + field[..., i1, j0, k1] * fx
+    c11 = field[..., i0, j1, k1] * (1 - fx) + field[..., i1, j1, k1] * fx
+
+    c0 = c00 * (1 - fy) + c10 * fy
+    c1 = c01 * (1 - fy) + c11 * fy
+    return c0 * (1 - fz) + c1 * fz
+
+
+def build_point_buffers(phi, v, s, thresh, scale, stride=1, max_points=None):
+    """
+    Threshold φ and return contiguous float32 buffers for every voxel kept.
+
+    Args:
+        phi        : (N,N,N) scalar field
+        v          : (3,N,N,N) vector field (unused, kept for signature parity)
+        s          : (N,N,N) entropy field
+        thresh     : minimum φ to emit a point
+        scale      : radius = scale * φ
+        stride     : take every Nth voxel along each axis
+        max_points : if set, thin the cloud evenly down to this budget
+
+    Returns:
+        dict with:
+            - positions: (M,3) float32
+            - radius:    (M,)  float32
+            - entropy:   (M,)  float32
+            - color:     (M,4) float32 RGBA, colored by entropy
+            - count:     M
+    """
+    N = phi.shape[0]
+    stride = max(int(stride), 1)
+
+    phi_sub = phi[::stride, ::stride, ::stride]
+    s_sub = s[::stride, ::stride, ::stride]
+
+    mask = phi_sub >= thresh
+    i, j, k = np.nonzero(mask)
+
+    if max_points is not None and i.size > max_points:
+        keep = np.linspace(0, i.size - 1, int(max_points)).astype(np.intp)
+        i, j, k = i[keep], j[keep], k[keep]
+
+    count = i.size
+    vals = phi_sub[i, j, k].astype(np.float32)
+    ent = s_sub[i, j, k].astype(np.float32)
+
+    positions = np.empty((count, 3), dtype=np.float32)
+    positions[:, 0] = lattice_coords(i * stride, N)
+    positions[:, 1] = lattice_coords(j * stride, N)
+    positions[:, 2] = lattice_coords(k * stride, N)
+
+    color = np.empty((count, 4), dtype=np.float32)
+    color[:, 0] = ent
+    color[:, 1] = 0.5
+    color[:, 2] = 1.0 - ent
+    color[:, 3] = 1.0
+
+    return {
+        'positions': positions,
+        'radius': np.ascontiguousarray(scale * vals, dtype=np.float32),
+        'entropy': np.ascontiguousarray(ent),
+        'color': color,
+        'count': count,
+    }
+
+
+def histogram_bar_buffers(values, bins=20, position=(0, 0, 0), scale=1.0,
+                          min_height=0.01):
+    """
+    Build a 3D bar chart as one box mesh.
+
+    Bars are laid out along x, normalized to the tallest bin, and bins
+    below min_height are dropped (same layout as the old one-cube-per-bin
+    histogram).
+
+    Returns:
+        (vertices (B*8,3) float32, faces (B*6,4) int32)
+    """
+    hist, _ = np.histogram(values, bins=bins)
+    peak = hist.max()
+    hist = hist / peak if peak > 0 else hist.astype(np.float64)
+
+    idx = np.nonzero(hist >= min_height)[0]
+    heights = hist[idx] * scale
+    half_w = 0.5 * 0.8 * scale / bins
+
+    x = position[0] + (idx - bins / 2) * scale / bins
+
+    # Unit box corners: bottom ring then top ring
+    cx = np.array([-1, 1, 1, -1, -1, 1, 1, -1])
+    cy = np.array([-1, -1, 1, 1, -1, -1, 1, 1])
+    top = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+
+    verts = np.empty((idx.size, 8, 3), dtype=np.float32)
+    verts[:, :, 0] = x[:, None] + cx * half_w
+    verts[:, :, 1] = position[1] + cy * half_w
+    verts[:, :, 2] = position[2] + top * heights[:, None]
+
+    box_faces = np.array([
+        [0, 3, 2, 1],  # bottom
+        [4, 5, 6, 7],  # top
+        [0, 1, 5, 4],
+        [1, 2, 6, 5],
+        [2, 3, 7, 6],
+        [3, 0, 4, 7],
+    ], dtype=np.int32)
+    faces = box_faces[None, :, :] + 8 * np.arange(idx.size, dtype=np.int32)[:, None, None]
+
+    return verts.reshape(-1, 3), faces.reshape(-1, 4)
+
+
+# ========== Example usage ==========
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "sim/fields/t020.npz"
+    data = np.load(path)
+
+    t0 = time.perf_counter()
+    buf = build_point_buffers(data["phi"], data["v"], data["s"], 0.15, 0.3)
+    dt = time.perf_counter() - t0
+
+    print(f"{path}: {buf['count']} points in {1000 * dt:.2f} ms")
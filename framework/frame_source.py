@@ -0,0 +1,146 @@
+"""
+Prefetching Snapshot Loader
+Decodes the next K tNNN.npz files on a background thread pool while the
+current frame renders. Decoded frames live in a bounded LRU cache.
+"""
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+
+def load_snapshot(filepath):
+    """Fully decode one snapshot (np.load alone is lazy)"""
+    with np.load(filepath) as data:
+        return data["phi"], data["v"], data["s"]
+
+
+def select_frames(field_dir, start_frame=0, end_frame=None, pattern="t*.npz"):
+    """Sorted snapshot list sliced the same way as render_animation.py"""
+    files = sorted(Path(field_dir).glob(pattern))
+    if end_frame is not None:
+        return files[start_frame:end_frame+1]
+    return files[start_frame:]
+
+
+class FrameSource:
+    """
+    Iterate (index, path, (phi, v, s)) with read-ahead.
+
+    Args:
+        files      : ordered snapshot paths
+        prefetch   : how many frames ahead to decode
+        workers    : background decode threads
+        cache_size : max decoded frames kept (default prefetch + 1)
+        loader     : callable(path) -> (phi, v, s)
+
+    A request counts as a hit when the frame was already decoded by the
+    time the render loop asked for it. Time spent blocked waiting on a
+    decode is accumulated in stall_time.
+    """
+
+    def __init__(self, files, prefetch=4, workers=2, cache_size=None,
+                 loader=load_snapshot):
+        self.files = list(files)
+        self.prefetch = max(int(prefetch), 0)
+        self.cache_size = cache_size if cache_size is not None else self.prefetch + 1
+        self.loader = loader
+
+        self._pool = ThreadPoolExecutor(max_workers=max(int(workers), 1))
+        self._pending = {}
+        self._cache = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stall_time = 0.0
+
+    def __len__(self):
+        return len(self.files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    def _schedule(self, idx):
+        """Queue decodes for idx .. idx+prefetch that are not already in flight"""
+        for j in range(idx, min(idx + self.prefetch + 1, len(self.files))):
+            if j in self._cache or j in self._pending:
+                continue
+            self._pending[j] = self._pool.submit(self.loader, self.files[j])
+
+    def _store(self, idx, frame):
+        self._cache[idx] = frame
+        self._cache.move_to_end(idx)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get(self, idx):
+        """Return (phi, v, s) for frame idx, blocking only if not yet decoded"""
+        if not 0 <= idx < len(self.files):
+            raise IndexError(f"frame {idx} out of range (0..{len(self.files) - 1})")
+
+        if idx in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(idx)
+            self._schedule(idx + 1)
+            return self._cache[idx]
+
+        self._schedule(idx)
+        fut = self._pending.pop(idx)
+
+        if fut.done():
+            self.hits += 1
+            frame = fut.result()
+        else:
+            self.misses += 1
+            t0 = time.perf_counter()
+            frame = fut.result()
+            self.stall_time += time.perf_counter() - t0
+
+        self._store(idx, frame)
+        # Keep the pipeline full while the caller renders this frame
+        self._schedule(idx + 1)
+        return frame
+
+    def __iter__(self):
+        for idx, filepath in enumerate(self.files):
+            yield idx, filepath, self.get(idx)
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'stall_time': self.stall_time,
+        }
+
+    def report(self):
+        st = self.stats()
+        return (f"prefetch: {st['hits']}/{st['hits'] + st['misses']} hits "
+                f"({100 * st['hit_rate']:.0f}%), "
+                f"stalled {st['stall_time']:.2f}s on I/O")
+
+
+# ========== Example usage ==========
+
+if __name__ == "__main__":
+    import sys
+
+    field_dir = sys.argv[1] if len(sys.argv) > 1 else "sim/fields"
+    files = select_frames(field_dir)
+
+    with FrameSource(files, prefetch=4) as source:
+        for idx, filepath, (phi, v, s) in source:
+            time.sleep(0.01)   # stand-in for render time
+        print(f"{len(source)} frames, {source.report()}")
@@ -0,0 +1,124 @@
+"""
+Shared Instancing Layer
+One point mesh + instance-on-points node group, reused across frames.
+Replaces one bpy.ops sphere per voxel with attribute array updates.
+"""
+import bpy
+
+import field_points
+
+
+def create_instance_node_group(name="FieldInstances", material=None):
+    """Instance a UV sphere on every point, scaled by the 'radius' attribute"""
+    node_tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    node_tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    node_tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = node_tree.nodes
+    links = node_tree.links
+
+    input_node = nodes.new('NodeGroupInput')
+    output_node = nodes.new('NodeGroupOutput')
+    input_node.location = (-600, 0)
+    output_node.location = (400, 0)
+
+    sphere_node = nodes.new('GeometryNodeMeshUVSphere')
+    sphere_node.location = (-300, -200)
+    sphere_node.inputs["Radius"].default_value = 1.0
+
+    radius_node = nodes.new('GeometryNodeInputNamedAttribute')
+    radius_node.location = (-300, -400)
+    radius_node.data_type = 'FLOAT'
+    radius_node.inputs["Name"].default_value = "radius"
+
+    instance_node = nodes.new('GeometryNodeInstanceOnPoints')
+    instance_node.location = (0, 0)
+
+    links.new(input_node.outputs[0], instance_node.inputs["Points"])
+    links.new(sphere_node.outputs["Mesh"], instance_node.inputs["Instance"])
+    links.new(radius_node.outputs["Attribute"], instance_node.inputs["Scale"])
+
+    last = instance_node.outputs["Instances"]
+    if material is not None:
+        mat_node = nodes.new('GeometryNodeSetMaterial')
+        mat_node.location = (200, 0)
+        mat_node.inputs["Material"].default_value = material
+        links.new(last, mat_node.inputs["Geometry"])
+        last = mat_node.outputs["Geometry"]
+
+    links.new(last, output_node.inputs[0])
+    return node_tree
+
+
+def instance_color_material(name="FieldMat", emission=1.5):
+    """Material that reads the per-point 'Color' attribute from the instancer"""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    bsdf = nodes["Principled BSDF"]
+    bsdf.inputs["Emission Strength"].default_value = emission
+
+    attr = nodes.new('ShaderNodeAttribute')
+    attr.attribute_type = 'INSTANCER'
+    attr.attribute_name = "Color"
+    mat.node_tree.links.new(attr.outputs["Color"], bsdf.inputs["Base Color"])
+    return mat
+
+
+class FieldInstancer:
+    """
+    Persistent point-cloud object driven by field_points buffers.
+
+    Create once, then call update() per frame: only the vertex and
+    attribute arrays change, the object, node group and material persist.
+    """
+
+    def __init__(self, name="FieldViz", material=None):
+        mesh = bpy.data.meshes.new(name + "Mesh")
+        self.obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(self.obj)
+
+        mod = self.obj.modifiers.new("GeoNodes", 'NODES')
+        mod.node_group = create_instance_node_group(name + "Nodes", material)
+
+    def update(self, buf):
+        """Replace point data with a build_point_buffers() result"""
+        mesh = self.obj.data
+        mesh.clear_geometry()
+
+        count = buf['count']
+        if count == 0:
+            mesh.update()
+            return
+
+        mesh.vertices.add(count)
+        mesh.vertices.foreach_set("co", buf['positions'].ravel())
+
+        for name in ('radius', 'entropy'):
+            attr = mesh.attributes.get(name) or mesh.attributes.new(name, 'FLOAT', 'POINT')
+            attr.data.foreach_set("value", buf[name])
+
+        color = mesh.attributes.get("Color") or mesh.attributes.new("Color", 'FLOAT_COLOR', 'POINT')
+        color.data.foreach_set("color", buf['color'].ravel())
+
+        mesh.update()
+
+    def update_field(self, phi, v, s, thresh, scale, **kwargs):
+        """Threshold a snapshot and push it in one go"""
+        self.update(field_points.build_point_buffers(phi, v, s, thresh, scale, **kwargs))
+
+
+def create_histogram_object(values, bins=20, position=(0, 0, 0), scale=1.0,
+                            material=None, name="Histogram"):
+    """All histogram bars as a single procedurally generated mesh"""
+    verts, faces = field_points.histogram_bar_buffers(values, bins, position, scale)
+
+    mesh = bpy.data.meshes.new(name + "Mesh")
+    mesh.from_pydata(verts.tolist(), [], faces.tolist())
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    if material is not None:
+        obj.data.materials.append(material)
+    return obj
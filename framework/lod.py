@@ -0,0 +1,148 @@
+"""
+Octree Level of Detail
+Bins above-threshold voxels into an octree and merges low-variance cells
+into one representative point, so each camera distance band gets a fixed
+point budget. Output has the same layout as field_points.build_point_buffers.
+"""
+import numpy as np
+
+from field_points import lattice_coords
+
+
+def _cell_keys(idx, level, band):
+    """Pack (band, level, octree cell) into one int64 per point"""
+    level = np.asarray(level, dtype=np.int64)
+    cell = idx >> level[..., None]
+    return ((((band << 6) | level) << 16 | cell[:, 0]) << 16 | cell[:, 1]) << 16 | cell[:, 2]
+
+
+def build_lod_point_buffers(phi, v, s, thresh, scale, camera, bands,
+                            var_tol=1e-4):
+    """
+    Octree-decimated point cloud with a point budget per distance band.
+
+    Args:
+        phi, v, s : snapshot arrays (v unused, kept for signature parity)
+        thresh    : minimum φ to keep a voxel
+        scale     : radius = scale * φ for a single voxel
+        camera    : world-space camera position (3,)
+        bands     : [(max_distance, budget), ...] sorted by distance; use
+                    np.inf for the last band
+        var_tol   : per-voxel φ variance considered uniform
+
+    Cells start at the root and are split greedily until the band budget
+    would be exceeded. Cells whose φ variance exceeds var_tol go first,
+    then the rest, each by summed squared deviation and then by voxel
+    count; low-variance cells are the ones left merged. A merged cell
+    emits its mean position, the volume-preserving radius (Σr³)^(1/3)
+    and mean entropy.
+
+    Returns:
+        dict with positions, radius, entropy, color, count (as
+        build_point_buffers) plus per-point 'level' and 'band'
+    """
+    N = phi.shape[0]
+    idx = np.stack(np.nonzero(phi >= thresh), axis=1)
+    vals = phi[idx[:, 0], idx[:, 1], idx[:, 2]].astype(np.float64)
+    ent = s[idx[:, 0], idx[:, 1], idx[:, 2]].astype(np.float64)
+    world = lattice_coords(idx, N).astype(np.float64)
+
+    dist = np.linalg.norm(world - np.asarray(camera, dtype=np.float64), axis=1)
+    edges = np.array([b[0] for b in bands], dtype=np.float64)
+    budgets = np.array([b[1] for b in bands], dtype=np.int64)
+    band = np.minimum(np.searchsorted(edges, dist), len(bands) - 1)
+
+    max_level = int(np.ceil(np.log2(max(N, 2))))
+    level = np.full(idx.shape[0], max_level, dtype=np.int64)
+
+    # Representatives already fixed at coarser levels, per band
+    finished = np.zeros(len(bands), dtype=np.int64)
+
+    for lvl in range(max_level, 0, -1):
+        here = np.nonzero(level == lvl)[0]
+        if here.size == 0:
+            continue
+
+        keys = _cell_keys(idx[here], lvl, band[here])
+        _, parent = np.unique(keys, return_inverse=True)
+        parent = parent.ravel()
+        n_parent = parent.max() + 1
+
+        count = np.bincount(parent, minlength=n_parent)
+        mean = np.bincount(parent, weights=vals[here], minlength=n_parent) / count
+        sq = np.bincount(parent, weights=vals[here] ** 2, minlength=n_parent)
+        sse = np.maximum(sq - count * mean ** 2, 0.0)
+
+        # Occupied octants per cell
+        octant = ((idx[here] >> (lvl - 1)) & 1) @ np.array([4, 2, 1])
+        pairs = np.unique(parent * 8 + octant)
+        n_children = np.bincount(pairs // 8, minlength=n_parent)
+        parent_band = np.zeros(n_parent, dtype=np.int64)
+        parent_band[parent] = band[here]
+
+        used = finished + np.bincount(parent_band, minlength=len(bands))
+
+        # Greedy: highest-error cells first, while the band budget allows
+        split = n_children == 1   # descending a single-child cell is free
+        rough = sse > var_tol * count
+        candidates = np.nonzero(n_children > 1)[0]
+        for b in range(len(bands)):
+            cand = candidates[parent_band[candidates] == b]
+            if cand.size == 0:
+                continue
+            cand = cand[np.lexsort((-count[cand], -sse[cand], ~rough[cand]))]
+            extra = np.cumsum(n_children[cand] - 1)
+            split[cand[extra <= budgets[b] - used[b]]] = True
+
+        finished += np.bincount(parent_band[~split], minlength=len(bands))
+        level[here[split[parent]]] = lvl - 1
+
+    # Aggregate each final (band, level, cell) group
+    groups, inverse = np.unique(_cell_keys(idx, level, band), return_inverse=True)
+    inverse = inverse.ravel()
+    n = groups.shape[0]
+
+    count = np.bincount(inverse, minlength=n)
+    positions = np.stack([
+        np.bincount(inverse, weights=world[:, c], minlength=n) / count
+        for c in range(3)
+    ], axis=1)
+    radius = np.cbrt(np.bincount(inverse, weights=(scale * vals) ** 3, minlength=n))
+    entropy = np.bincount(inverse, weights=ent, minlength=n) / count
+
+    color = np.empty((n, 4), dtype=np.float32)
+    color[:, 0] = entropy
+    color[:, 1] = 0.5
+    color[:, 2] = 1.0 - entropy
+    color[:, 3] = 1.0
+
+    return {
+        'positions': positions.astype(np.float32),
+        'radius': radius.astype(np.float32),
+        'entropy': entropy.astype(np.float32),
+        'color': color,
+        'count': n,
+        'level': ((groups >> 48) & 63).astype(np.int32),
+        'band': (groups >> 54).astype(np.int32),
+    }
+
+
+# ========== Example usage ==========
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "sim/fields/t020.npz"
+    data = np.load(path)
+    bands = [(8.0, 4000), (10.0, 2000), (np.inf, 500)]
+
+    t0 = time.perf_counter()
+    buf = build_lod_point_buffers(data["phi"], data["v"], data["s"], 0.15, 0.3,
+                                  camera=(6, -6, 4), bands=bands)
+    dt = time.perf_counter() - t0
+
+    per_band = np.bincount(buf['band'], minlength=len(bands))
+    print(f"{path}: {buf['count']} LOD points in {1000 * dt:.1f} ms")
+    for (edge, budget), got in zip(bands, per_band):
+        print(f"  band ≤ {edge}: {got} / {budget}")
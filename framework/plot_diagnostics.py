@@ -1,100 +1,305 @@
 """
 Plot RSVP simulation diagnostics
 Shows: entropy evolution, energy components, entropy production
+
+Long runs are drawn from min/max envelopes with a fixed bucket budget, so
+redraw cost does not grow with run length. With --watch, new samples are
+read incrementally from sim/fields/diagnostics.log while run_sim.py runs.
+
+Usage:
+    python plot_diagnostics.py
+    python plot_diagnostics.py --watch --interval 2
 """
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-def plot_diagnostics():
-    """Generate diagnostic plots from simulation data"""
-    
-    # Load diagnostics
-    data = np.load("sim/fields/diagnostics.npz")
-    
-    time = data['time']
-    S = data['total_entropy']
-    dS_dt = data['entropy_production']
-    KE = data['kinetic_energy']
-    PE = data['potential_energy']
-    
-    # Create figure with subplots
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    fig.suptitle('RSVP Field Evolution Diagnostics', fontsize=16, fontweight='bold')
-    
+from diagnostics_log import FIELDS, DiagnosticsLogReader
+
+FIELD_DIR = Path("sim/fields")
+OUT_PATH = Path("out/diagnostics.png")
+
+SERIES = ('total_entropy', 'entropy_production', 'kinetic_energy',
+          'potential_energy', 'total_energy')
+
+
+class EnvelopeSeries:
+    """
+    Streaming min/max envelope of the diagnostics series.
+
+    Samples are reduced into buckets of `width` consecutive samples; each
+    bucket keeps the first value plus the min and max (with their times)
+    of every series. When the bucket count reaches `capacity`, adjacent
+    buckets are merged pairwise and the width doubles, so memory and draw
+    cost stay O(capacity) however long the run is.
+    """
+
+    def __init__(self, capacity=2000):
+        self.capacity = max(2, int(capacity) // 2 * 2)
+        self.width = 1
+        self.buckets = {'time': np.empty(0)}
+        for name in SERIES:
+            for key in ('first', 'min', 'max', 'tmin', 'tmax'):
+                self.buckets[f'{name}.{key}'] = np.empty(0)
+        self.pending = {name: np.empty(0) for name in ('time',) + SERIES}
+
+        # Exact running statistics over every sample seen
+        self.n = 0
+        self.first = None
+        self.last = None
+        self.violations = 0
+        self.production_sum = 0.0
+        self.production_max = -np.inf
+
+    def __len__(self):
+        return self.n
+
+    def append(self, chunk):
+        """Add {field: array} samples (as returned by DiagnosticsLogReader)"""
+        chunk = dict(chunk)
+        if chunk['time'].size == 0:
+            return
+        chunk['total_energy'] = chunk['kinetic_energy'] + chunk['potential_energy']
+
+        S = chunk['total_entropy']
+        prev = self.last['total_entropy'] if self.last is not None else S[0]
+        self.violations += int(np.sum(np.diff(S, prepend=prev) < 0))
+        self.production_sum += float(chunk['entropy_production'].sum())
+        self.production_max = max(self.production_max,
+                                  float(chunk['entropy_production'].max()))
+        if self.first is None:
+            self.first = {name: chunk[name][0] for name in SERIES}
+        self.last = {name: chunk[name][-1] for name in SERIES}
+        self.n += S.size
+
+        for name in self.pending:
+            self.pending[name] = np.concatenate([self.pending[name], chunk[name]])
+        self._reduce()
+
+    def _reduce(self):
+        """Fold complete buckets out of the pending buffer"""
+        while True:
+            if self.buckets['time'].size >= self.capacity:
+                self._merge()
+            room = self.capacity - self.buckets['time'].size
+            full = min(self.pending['time'].size // self.width, room)
+            if full == 0:
+                return
+
+            take = full * self.width
+            t = self.pending['time'][:take].reshape(full, self.width)
+            rows = np.arange(full)
+            new = {'time': t[:, 0]}
+            for name in SERIES:
+                x = self.pending[name][:take].reshape(full, self.width)
+                lo = np.argmin(x, axis=1)
+                hi = np.argmax(x, axis=1)
+                new[f'{name}.first'] = x[:, 0]
+                new[f'{name}.min'] = x[rows, lo]
+                new[f'{name}.max'] = x[rows, hi]
+                new[f'{name}.tmin'] = t[rows, lo]
+                new[f'{name}.tmax'] = t[rows, hi]
+
+            for key in self.buckets:
+                self.buckets[key] = np.concatenate([self.buckets[key], new[key]])
+            for name in self.pending:
+                self.pending[name] = self.pending[name][take:]
+
+    def _merge(self):
+        """Merge adjacent bucket pairs and double the bucket width"""
+        b = self.buckets
+        out = {'time': b['time'][0::2]}
+        for name in SERIES:
+            mn = b[f'{name}.min'].reshape(-1, 2)
+            mx = b[f'{name}.max'].reshape(-1, 2)
+            lo = np.argmin(mn, axis=1)
+            hi = np.argmax(mx, axis=1)
+            rows = np.arange(mn.shape[0])
+            out[f'{name}.first'] = b[f'{name}.first'][0::2]
+            out[f'{name}.min'] = mn[rows, lo]
+            out[f'{name}.max'] = mx[rows, hi]
+            out[f'{name}.tmin'] = b[f'{name}.tmin'].reshape(-1, 2)[rows, lo]
+            out[f'{name}.tmax'] = b[f'{name}.tmax'].reshape(-1, 2)[rows, hi]
+        self.buckets = out
+        self.width *= 2
+
+    def curve(self, name):
+        """(t, y) polyline through each bucket's extremes, in time order"""
+        b = self.buckets
+        tmin, tmax = b[f'{name}.tmin'], b[f'{name}.tmax']
+        ymin, ymax = b[f'{name}.min'], b[f'{name}.max']
+
+        # The partial bucket still being filled is drawn as one more bucket
+        tail_t, tail_y = self.pending['time'], self.pending[name]
+        if tail_t.size:
+            lo, hi = np.argmin(tail_y), np.argmax(tail_y)
+            tmin = np.append(tmin, tail_t[lo])
+            tmax = np.append(tmax, tail_t[hi])
+            ymin = np.append(ymin, tail_y[lo])
+            ymax = np.append(ymax, tail_y[hi])
+
+        t = np.stack([tmin, tmax], axis=1)
+        y = np.stack([ymin, ymax], axis=1)
+        order = np.argsort(t, axis=1, kind="stable")
+        return (np.take_along_axis(t, order, axis=1).ravel(),
+                np.take_along_axis(y, order, axis=1).ravel())
+
+    def phase(self):
+        """(S, E) trajectory sampled at the first sample of each bucket"""
+        S = np.append(self.buckets['total_entropy.first'], self.last['total_entropy'])
+        E = np.append(self.buckets['total_energy.first'], self.last['total_energy'])
+        return S, E
+
+
+def read_npz(path):
+    """Whole-run diagnostics from the end-of-run diagnostics.npz"""
+    with np.load(path) as data:
+        return {name: data[name].astype(np.float64) for name in FIELDS}
+
+
+def draw_panels(fig, axes, env):
+    """Redraw the four panels from the envelope (cost is O(capacity))"""
+    for ax in axes.flat:
+        ax.clear()
+
+    title = 'RSVP Field Evolution Diagnostics'
+    if env.width > 1:
+        title += f'  ({len(env)} samples, {env.width}/bucket)'
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
     # 1. Total Entropy
     ax = axes[0, 0]
-    ax.plot(time, S, 'b-', linewidth=2)
+    ax.plot(*env.curve('total_entropy'), 'b-', linewidth=2)
     ax.set_xlabel('Time')
     ax.set_ylabel('Total Entropy ∫S dV')
     ax.set_title('Entropy Evolution (should be monotonic)')
     ax.grid(True, alpha=0.3)
-    
-    # Check monotonicity
-    violations = np.sum(np.diff(S) < 0)
-    if violations > 0:
-        ax.text(0.95, 0.05, f'⚠️ {violations} decreases', 
+
+    # Check monotonicity (tracked exactly over every sample)
+    if env.violations > 0:
+        ax.text(0.95, 0.05, f'⚠️ {env.violations} decreases',
                transform=ax.transAxes, ha='right', va='bottom',
                bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.5))
     else:
-        ax.text(0.95, 0.05, '✓ Monotonic', 
+        ax.text(0.95, 0.05, '✓ Monotonic',
                transform=ax.transAxes, ha='right', va='bottom',
                bbox=dict(boxstyle='round', facecolor='green', alpha=0.3))
-    
+
     # 2. Entropy Production Rate
     ax = axes[0, 1]
-    ax.plot(time, dS_dt, 'r-', linewidth=2)
+    ax.plot(*env.curve('entropy_production'), 'r-', linewidth=2)
     ax.set_xlabel('Time')
     ax.set_ylabel('Entropy Production dS/dt')
     ax.set_title('Dissipation Rate (should be ≥ 0)')
     ax.grid(True, alpha=0.3)
     ax.axhline(y=0, color='k', linestyle='--', alpha=0.3)
-    
+
     # 3. Energy Components
     ax = axes[1, 0]
-    ax.plot(time, KE, 'b-', linewidth=2, label='Kinetic: (1/2)∫|v|² dV')
-    ax.plot(time, PE, 'r-', linewidth=2, label='Potential: (1/2)∫|∇φ|² dV')
-    ax.plot(time, KE + PE, 'k--', linewidth=2, label='Total')
+    ax.plot(*env.curve('kinetic_energy'), 'b-', linewidth=2, label='Kinetic: (1/2)∫|v|² dV')
+    ax.plot(*env.curve('potential_energy'), 'r-', linewidth=2, label='Potential: (1/2)∫|∇φ|² dV')
+    ax.plot(*env.curve('total_energy'), 'k--', linewidth=2, label='Total')
     ax.set_xlabel('Time')
     ax.set_ylabel('Energy')
     ax.set_title('Energy Components')
     ax.legend()
     ax.grid(True, alpha=0.3)
-    
+
     # 4. Phase Space: Energy vs Entropy
     ax = axes[1, 1]
-    total_E = KE + PE
+    S, total_E = env.phase()
     ax.plot(S, total_E, 'g-', linewidth=2, alpha=0.7)
-    ax.scatter(S[0], total_E[0], c='blue', s=100, marker='o', label='Start', zorder=10)
-    ax.scatter(S[-1], total_E[-1], c='red', s=100, marker='s', label='End', zorder=10)
+    ax.scatter(env.first['total_entropy'], env.first['total_energy'],
+               c='blue', s=100, marker='o', label='Start', zorder=10)
+    ax.scatter(env.last['total_entropy'], env.last['total_energy'],
+               c='red', s=100, marker='s', label='End', zorder=10)
     ax.set_xlabel('Total Entropy')
     ax.set_ylabel('Total Energy')
     ax.set_title('Phase Space Trajectory')
     ax.legend()
     ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    
-    # Save
-    out_path = Path("out/diagnostics.png")
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(out_path, dpi=150, bbox_inches='tight')
-    print(f"Saved diagnostic plot to {out_path}")
-    
-    # Summary statistics
+
+    fig.tight_layout()
+
+
+def print_summary(env):
+    S0, S1 = env.first['total_entropy'], env.last['total_entropy']
+    E0, E1 = env.first['total_energy'], env.last['total_energy']
+
     print("\n" + "="*60)
     print("Summary Statistics")
     print("="*60)
-    print(f"Initial entropy:  {S[0]:.6f}")
-    print(f"Final entropy:    {S[-1]:.6f}")
-    print(f"ΔS:               {S[-1] - S[0]:.6f} ({100*(S[-1]/S[0]-1):.1f}%)")
-    print(f"Mean dS/dt:       {dS_dt.mean():.6f}")
-    print(f"Max dS/dt:        {dS_dt.max():.6f}")
-    print(f"\nInitial energy:   {total_E[0]:.6f}")
-    print(f"Final energy:     {total_E[-1]:.6f}")
-    print(f"ΔE:               {total_E[-1] - total_E[0]:.6f} ({100*(total_E[-1]/total_E[0]-1):.1f}%)")
+    print(f"Initial entropy:  {S0:.6f}")
+    print(f"Final entropy:    {S1:.6f}")
+    print(f"ΔS:               {S1 - S0:.6f} ({100*(S1/S0-1):.1f}%)")
+    print(f"Mean dS/dt:       {env.production_sum / len(env):.6f}")
+    print(f"Max dS/dt:        {env.production_max:.6f}")
+    print(f"\nInitial energy:   {E0:.6f}")
+    print(f"Final energy:     {E1:.6f}")
+    print(f"ΔE:               {E1 - E0:.6f} ({100*(E1/E0-1):.1f}%)")
     print("="*60)
 
+
+def plot_diagnostics(watch=False, interval=2.0, capacity=2000):
+    """Generate diagnostic plots from simulation data"""
+
+    env = EnvelopeSeries(capacity)
+    log_path = FIELD_DIR / "diagnostics.log"
+
+    # Prefer the appendable log; fall back to the end-of-run npz
+    if log_path.exists():
+        reader = DiagnosticsLogReader(log_path)
+        env.append(reader.read_new())
+    elif watch:
+        raise SystemExit(f"--watch needs {log_path} (run run_sim.py with diagnostics on)")
+    else:
+        env.append(read_npz(FIELD_DIR / "diagnostics.npz"))
+
+    if len(env) == 0 and not watch:
+        raise SystemExit("No diagnostics samples found")
+
+    # Create figure with subplots
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    if watch:
+        print(f"Watching {log_path} (Ctrl+C to stop)")
+        shown = -1
+        try:
+            while plt.fignum_exists(fig.number):
+                env.append(reader.read_new())
+                if len(env) != shown and len(env) > 0:
+                    draw_panels(fig, axes, env)
+                    fig.savefig(OUT_PATH, dpi=150, bbox_inches='tight')
+                    shown = len(env)
+                plt.pause(interval)
+        except KeyboardInterrupt:
+            pass
+        if len(env) == 0:
+            return
+    else:
+        draw_panels(fig, axes, env)
+        fig.savefig(OUT_PATH, dpi=150, bbox_inches='tight')
+
+    print(f"Saved diagnostic plot to {OUT_PATH}")
+    print_summary(env)
+
+
 if __name__ == "__main__":
-    plot_diagnostics()
-    plt.show()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Plot RSVP simulation diagnostics")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep refreshing from diagnostics.log while the sim runs")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Seconds between refreshes in --watch mode")
+    parser.add_argument("--capacity", type=int, default=2000,
+                        help="Max envelope buckets per series (bounds redraw cost)")
+    args = parser.parse_args()
+
+    plot_diagnostics(args.watch, args.interval, args.capacity)
+    if not args.watch:
+        plt.show()
@@ -3,12 +3,14 @@ Time Evolution Animation
 One Blender run renders all t000–tNNN
 """
 import bpy
-import numpy as np
 from pathlib import Path
 import sys, os
+import time
 
 sys.path.append(os.path.dirname(__file__))
 import common
+import instancing
+import frame_source
 
 # ========== Parameters ==========
 FIELD_DIR = Path("sim/fields")
@@ -17,77 +19,49 @@ THRESH = 0.15
 SCALE = 0.15
 START_FRAME = 0
 END_FRAME = 50  # or None for all
+PREFETCH = 4    # snapshots decoded ahead of the render
 # ================================
 
 def load_timestep(filepath):
     """Load a single timestep"""
-    data = np.load(filepath)
-    return data["phi"], data["v"], data["s"]
+    return frame_source.load_snapshot(filepath)
 
 
-def update_spheres(phi, thresh, scale):
+def update_spheres(field_viz, phi, v, s, thresh, scale):
     """Update sphere positions and sizes for current timestep"""
-    # Clear existing spheres
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    
-    # Recreate camera and lights
-    common.camera()
-    common.lights()
-    
-    N = phi.shape[0]
-    step = 2.0 / N
-    
-    mat = bpy.data.materials.new("Phi")
-    mat.use_nodes = True
-    mat.node_tree.nodes["Principled BSDF"].inputs["Emission Strength"].default_value = 2.0
-    
-    for i in range(N):
-        for j in range(N):
-            for k in range(N):
-                val = phi[i, j, k]
-                if val < thresh:
-                    continue
-                
-                bpy.ops.mesh.primitive_uv_sphere_add(
-                    radius=scale * val,
-                    location=(
-                        (i - N/2) * step,
-                        (j - N/2) * step,
-                        (k - N/2) * step
-                    )
-                )
-                obj = bpy.context.active_object
-                obj.data.materials.append(mat)
+    # Camera, lights, object and node group persist; only arrays change
+    field_viz.update_field(phi, v, s, thresh, scale)
 
 
 def main():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     common.reset()
+    common.camera()
+    common.lights()
     
-    # Find all timestep files
-    files = sorted(FIELD_DIR.glob("t*.npz"))
+    mat = instancing.instance_color_material("Phi", emission=2.0)
+    field_viz = instancing.FieldInstancer("FieldViz", material=mat)
     
-    if END_FRAME is not None:
-        files = files[START_FRAME:END_FRAME+1]
-    else:
-        files = files[START_FRAME:]
+    # Find all timestep files
+    files = frame_source.select_frames(FIELD_DIR, START_FRAME, END_FRAME)
     
     print(f"Rendering {len(files)} frames...")
     
-    for idx, filepath in enumerate(files):
-        print(f"Frame {idx:03d}: {filepath.name}")
-        
-        # Load field
-        phi, v, s = load_timestep(filepath)
-        
-        # Update geometry
-        update_spheres(phi, THRESH, SCALE)
+    with frame_source.FrameSource(files, prefetch=PREFETCH) as source:
+        for idx, filepath, (phi, v, s) in source:
+            print(f"Frame {idx:03d}: {filepath.name}")
+            
+            # Update geometry
+            t0 = time.perf_counter()
+            update_spheres(field_viz, phi, v, s, THRESH, SCALE)
+            print(f"  setup: {1000 * (time.perf_counter() - t0):.1f} ms")
+            
+            # Render (next snapshots decode in the background meanwhile)
+            frame_path = OUT_DIR / f"frame_{idx:04d}.png"
+            bpy.context.scene.render.filepath = str(frame_path)
+            bpy.ops.render.render(write_still=True)
         
-        # Render
-        frame_path = OUT_DIR / f"frame_{idx:04d}.png"
-        bpy.context.scene.render.filepath = str(frame_path)
-        bpy.ops.render.render(write_still=True)
+        print(source.report())
     
     print(f"\nRendered {len(files)} frames to {OUT_DIR}")
     print(f"Create video: ffmpeg -framerate 30 -i {OUT_DIR}/frame_%04d.png -c:v libx264 -pix_fmt yuv420p out/evolution.mp4")
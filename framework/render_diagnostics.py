@@ -9,45 +9,21 @@ import sys, os
 
 sys.path.append(os.path.dirname(__file__))
 import common
+import instancing
 
 # ========== Parameters ==========
 FIELD_FILE = "sim/fields/t020.npz"
 # ================================
 
 def create_histogram_mesh(values, bins=20, position=(0, 0, 0), scale=1.0):
-    """Create 3D bar chart histogram"""
-    hist, edges = np.histogram(values, bins=bins)
-    hist = hist / hist.max()  # normalize
-    
-    collection = bpy.data.collections.new("Histogram")
-    bpy.context.scene.collection.children.link(collection)
-    
+    """Create 3D bar chart histogram as a single mesh"""
     mat = bpy.data.materials.new("HistMat")
     mat.use_nodes = True
     mat.node_tree.nodes["Principled BSDF"].inputs["Base Color"].default_value = (1.0, 0.5, 0.2, 1.0)
     
-    width = 0.8 * scale / bins
-    
-    for i, h in enumerate(hist):
-        if h < 0.01:
-            continue
-        
-        x = position[0] + (i - bins/2) * scale / bins
-        
-        bpy.ops.mesh.primitive_cube_add(
-            size=1.0,
-            location=(x, position[1], position[2] + h * scale / 2)
-        )
-        obj = bpy.context.active_object
-        obj.scale = (width, width, h * scale)
-        obj.data.materials.append(mat)
-        
-        # Move to collection
-        for coll in obj.users_collection:
-            coll.objects.unlink(obj)
-        collection.objects.link(obj)
-    
-    return collection
+    return instancing.create_histogram_object(
+        values, bins=bins, position=position, scale=scale, material=mat
+    )
 
 
 def create_text_overlay(text, location=(0, 0, 0)):
@@ -126,32 +102,9 @@ def main():
     create_stats_panel(phi, v, s)
     
     # Also show field
-    N = phi.shape[0]
-    step = 2.0 / N
-    thresh = 0.15
-    scale = 0.15
-    
-    mat = bpy.data.materials.new("Phi")
-    mat.use_nodes = True
-    mat.node_tree.nodes["Principled BSDF"].inputs["Emission Strength"].default_value = 1.5
-    
-    for i in range(N):
-        for j in range(N):
-            for k in range(N):
-                val = phi[i, j, k]
-                if val < thresh:
-                    continue
-                
-                bpy.ops.mesh.primitive_uv_sphere_add(
-                    radius=scale * val,
-                    location=(
-                        (i - N/2) * step,
-                        (j - N/2) * step,
-                        (k - N/2) * step
-                    )
-                )
-                obj = bpy.context.active_object
-                obj.data.materials.append(mat)
+    mat = instancing.instance_color_material("Phi", emission=1.5)
+    field_viz = instancing.FieldInstancer("FieldViz", material=mat)
+    field_viz.update_field(phi, v, s, thresh=0.15, scale=0.15)
     
     # Render
     bpy.context.scene.render.filepath = "out/renders/diagnostics.png"
@@ -9,11 +9,20 @@ import sys, os
 
 sys.path.append(os.path.dirname(__file__))
 import common
+import field_points
+import isosurface
+import lod
 
 # ========== Parameters ==========
 FIELD_FILE = "sim/fields/t020.npz"
 THRESH = 0.15
 RADIUS_SCALE = 0.3
+STRIDE = 1          # take every Nth voxel
+MAX_POINTS = None   # point budget, or None for all
+MODE = "points"     # "points" or "isosurface"
+ISO_LEVEL = 0.5     # φ level for isosurface mode
+LOD_BANDS = None    # e.g. [(8.0, 500_000), (12.0, 100_000), (float("inf"), 20_000)]
+CAMERA_POS = (6, -6, 4)  # matches common.camera(); used for LOD bands
 # ================================
 
 def create_geonodes_visualizer():
@@ -60,60 +69,83 @@ def create_geonodes_visualizer():
 
 def populate_field_points(obj, phi, v, s, thresh, scale):
     """Convert field data to vertex cloud with attributes"""
-    N = phi.shape[0]
-    step = 2.0 / N
-    
-    # Collect valid points
-    points = []
-    radii = []
-    colors = []
-    entropies = []
-    
-    for i in range(N):
-        for j in range(N):
-            for k in range(N):
-                val = phi[i, j, k]
-                if val < thresh:
-                    continue
-                
-                x = (i - N/2) * step
-                y = (j - N/2) * step
-                z = (k - N/2) * step
-                
-                points.append([x, y, z])
-                radii.append(scale * val)
-                
-                # Color by entropy
-                s_val = s[i, j, k]
-                colors.append([s_val, 0.5, 1.0 - s_val, 1.0])
-                entropies.append(s_val)
-    
-    if not points:
+    if LOD_BANDS is not None:
+        buf = lod.build_lod_point_buffers(
+            phi, v, s, thresh, scale,
+            camera=CAMERA_POS, bands=LOD_BANDS
+        )
+    else:
+        buf = field_points.build_point_buffers(
+            phi, v, s, thresh, scale,
+            stride=STRIDE, max_points=MAX_POINTS
+        )
+    if buf['count'] == 0:
         return
     
     # Create mesh from points
     mesh = obj.data
     mesh.clear_geometry()
     
-    mesh.vertices.add(len(points))
-    mesh.vertices.foreach_set("co", np.array(points).flatten())
+    mesh.vertices.add(buf['count'])
+    mesh.vertices.foreach_set("co", buf['positions'].ravel())
     
     # Add custom attributes
     radius_attr = mesh.attributes.new("radius", 'FLOAT', 'POINT')
-    radius_attr.data.foreach_set("value", radii)
+    radius_attr.data.foreach_set("value", buf['radius'])
     
     entropy_attr = mesh.attributes.new("entropy", 'FLOAT', 'POINT')
-    entropy_attr.data.foreach_set("value", entropies)
+    entropy_attr.data.foreach_set("value", buf['entropy'])
     
     # Color attribute
     if not mesh.color_attributes:
         mesh.color_attributes.new("Color", 'FLOAT_COLOR', 'POINT')
     color_attr = mesh.color_attributes.active_color
-    color_attr.data.foreach_set("color", np.array(colors).flatten())
+    color_attr.data.foreach_set("color", buf['color'].ravel())
     
     mesh.update()
 
 
+def create_isosurface_object(phi, v, s, level):
+    """φ = level surface as one indexed mesh, S and |v| as vertex attributes"""
+    buf = isosurface.build_isosurface_buffers(
+        phi, level,
+        attributes={'entropy': s, 'speed': np.sqrt(np.sum(v**2, axis=0))}
+    )
+    
+    mesh = bpy.data.meshes.new("IsoMesh")
+    obj = bpy.data.objects.new("FieldViz", mesh)
+    bpy.context.collection.objects.link(obj)
+    if buf['count'] == 0:
+        return obj
+    
+    n_tri = buf['tri_count']
+    mesh.vertices.add(buf['count'])
+    mesh.vertices.foreach_set("co", buf['positions'].ravel())
+    mesh.loops.add(3 * n_tri)
+    mesh.loops.foreach_set("vertex_index", buf['triangles'].ravel())
+    mesh.polygons.add(n_tri)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, 3 * n_tri, 3, dtype=np.int32))
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", np.full(n_tri, 3, dtype=np.int32))
+    
+    for name in ('entropy', 'speed'):
+        attr = mesh.attributes.new(name, 'FLOAT', 'POINT')
+        attr.data.foreach_set("value", buf[name])
+    
+    # Same entropy coloring as the point cloud
+    color = np.empty((buf['count'], 4), dtype=np.float32)
+    color[:, 0] = buf['entropy']
+    color[:, 1] = 0.5
+    color[:, 2] = 1.0 - buf['entropy']
+    color[:, 3] = 1.0
+    mesh.color_attributes.new("Color", 'FLOAT_COLOR', 'POINT')
+    mesh.color_attributes["Color"].data.foreach_set("color", color.ravel())
+    
+    mesh.polygons.foreach_set("use_smooth", np.ones(n_tri, dtype=bool))
+    mesh.update(calc_edges=True)
+    return obj
+
+
 def main():
     common.reset()
     common.camera()
@@ -128,11 +160,14 @@ def main():
     print(f"Loaded: φ∈[{phi.min():.3f},{phi.max():.3f}], "
           f"S∈[{s.min():.3f},{s.max():.3f}]")
     
-    # Create visualizer
-    obj = create_geonodes_visualizer()
-    
-    # Populate
-    populate_field_points(obj, phi, v, s, THRESH, RADIUS_SCALE)
+    if MODE == "isosurface":
+        obj = create_isosurface_object(phi, v, s, ISO_LEVEL)
+    else:
+        # Create visualizer
+        obj = create_geonodes_visualizer()
+        
+        # Populate
+        populate_field_points(obj, phi, v, s, THRESH, RADIUS_SCALE)
     
     # Material
     mat = bpy.data.materials.new("FieldMat")
@@ -10,6 +10,7 @@ import sys, os
 
 sys.path.append(os.path.dirname(__file__))
 import common
+import streamlines
 
 # ========== Parameters ==========
 FIELD_FILE = "sim/fields/t020.npz"
@@ -17,6 +18,10 @@ SUBSAMPLE = 4      # show every Nth vector
 V_SCALE = 2.0      # arrow length multiplier
 V_THRESH = 0.01    # minimum |v| to show
 ARROW_RADIUS = 0.02
+MODE = "arrows"    # "arrows" or "streamlines"
+LINE_COUNT = 2000  # streamline seeds
+LINE_STEPS = 200   # max RK4 steps per line
+LINE_BEVEL = 0.005
 # ================================
 
 def create_arrow(start, direction, length, radius=0.02):
@@ -53,6 +58,35 @@ def create_arrow(start, direction, length, radius=0.02):
     return arrow
 
 
+def create_streamlines(v, mat):
+    """All streamlines as splines of one curve object"""
+    lines = streamlines.build_streamline_buffers(
+        v, count=LINE_COUNT, max_steps=LINE_STEPS, v_thresh=V_THRESH
+    )
+    points = lines['points']
+    offsets = lines['offsets']
+    
+    # Curve points are (x, y, z, w)
+    co = np.ones((len(points), 4), dtype=np.float32)
+    co[:, :3] = points
+    
+    cd = bpy.data.curves.new("Streamlines", "CURVE")
+    cd.dimensions = "3D"
+    cd.bevel_depth = LINE_BEVEL
+    for n in range(len(offsets) - 1):
+        a, b = offsets[n], offsets[n + 1]
+        if b - a < 2:
+            continue
+        sp = cd.splines.new("POLY")
+        sp.points.add(b - a - 1)
+        sp.points.foreach_set("co", co[a:b].ravel())
+    
+    obj = bpy.data.objects.new("Streamlines", cd)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.data.materials.append(mat)
+    return obj, len(cd.splines)
+
+
 def main():
     common.reset()
     common.camera()
@@ -73,36 +107,40 @@ def main():
     mat.node_tree.nodes["Principled BSDF"].inputs["Base Color"].default_value = (0.2, 0.7, 1.0, 1.0)
     mat.node_tree.nodes["Principled BSDF"].inputs["Metallic"].default_value = 0.8
     
-    count = 0
-    
-    for i in range(0, N, SUBSAMPLE):
-        for j in range(0, N, SUBSAMPLE):
-            for k in range(0, N, SUBSAMPLE):
-                # Get vector
-                vx, vy, vz = v[:, i, j, k]
-                vmag = np.sqrt(vx**2 + vy**2 + vz**2)
-                
-                if vmag < V_THRESH:
-                    continue
-                
-                # Position
-                x = (i - N/2) * step
-                y = (j - N/2) * step
-                z = (k - N/2) * step
-                
-                # Create arrow
-                arrow = create_arrow(
-                    (x, y, z),
-                    (vx, vy, vz),
-                    vmag * V_SCALE,
-                    ARROW_RADIUS
-                )
-                
-                if arrow:
-                    arrow.data.materials.append(mat)
-                    count += 1
-    
-    print(f"Created {count} vector arrows")
+    if MODE == "streamlines":
+        _, count = create_streamlines(v, mat)
+        print(f"Created {count} streamlines")
+    else:
+        count = 0
+        
+        for i in range(0, N, SUBSAMPLE):
+            for j in range(0, N, SUBSAMPLE):
+                for k in range(0, N, SUBSAMPLE):
+                    # Get vector
+                    vx, vy, vz = v[:, i, j, k]
+                    vmag = np.sqrt(vx**2 + vy**2 + vz**2)
+                    
+                    if vmag < V_THRESH:
+                        continue
+                    
+                    # Position
+                    x = (i - N/2) * step
+                    y = (j - N/2) * step
+                    z = (k - N/2) * step
+                    
+                    # Create arrow
+                    arrow = create_arrow(
+                        (x, y, z),
+                        (vx, vy, vz),
+                        vmag * V_SCALE,
+                        ARROW_RADIUS
+                    )
+                    
+                    if arrow:
+                        arrow.data.materials.append(mat)
+                        count += 1
+        
+        print(f"Created {count} vector arrows")
     
     # Render
     bpy.context.scene.render.filepath = "out/renders/vectors.png"
@@ -10,6 +10,7 @@ from rsvp_core import (
     compute_diagnostics, 
     check_stability
 )
+from diagnostics_log import DiagnosticsLogWriter
 import json
 
 # ========== Configuration ==========
@@ -47,6 +48,8 @@ def main():
     # Diagnostics storage
     if CONFIG["diagnostics"]:
         diag_history = []
+        # Appendable log: plot_diagnostics.py --watch tails this while we run
+        diag_log = DiagnosticsLogWriter(OUT / "diagnostics.log")
     
     # Save initial state
     np.savez_compressed(
@@ -59,6 +62,7 @@ def main():
         diag = compute_diagnostics(phi, v, s, dx)
         diag['time'] = 0.0
         diag_history.append(diag)
+        diag_log.append(diag)
         
         print("\nInitial state:")
         print(f"  Total entropy:     {diag['total_entropy']:.6f}")
@@ -94,6 +98,7 @@ def main():
                 diag = compute_diagnostics(phi, v, s, dx)
                 diag['time'] = t * dt
                 diag_history.append(diag)
+                diag_log.append(diag)
                 
                 print(f"t={save_count:03d} ({t*dt:.2f}): "
                       f"φ∈[{phi.min():.3f},{phi.max():.3f}] "
@@ -118,6 +123,7 @@ def main():
             'potential_energy': [d['potential_energy'] for d in diag_history],
         }
         np.savez_compressed(OUT / "diagnostics.npz", **diag_array)
+        diag_log.close()
         
         print("\n" + "=" * 60)
         print("Final diagnostics:")
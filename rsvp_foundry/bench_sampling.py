@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_sampling.py — error of field means against sample count, per sampler.
+
+Usage:
+    python bench_sampling.py [--preset PRESET] [--repeats R] [--max-log2 K]
+
+For each sample count n = 2^8 .. 2^K, estimates the mean of phi and
+closure over the probe box R times (independent seeds / scramblings) with
+pseudo-random, Sobol and Halton points, and prints the RMS error against
+a 2^22-point Sobol reference. The last column is how many pseudo-random
+samples would give the same error (random error falls as 1/sqrt(n)), as
+a multiple of n: the saving in field evaluations.
+
+Examples:
+    python bench_sampling.py
+    python bench_sampling.py --preset make_tree_operators --repeats 32
+"""
+
+from __future__ import annotations
+import argparse
+import math
+import sys
+import time
+
+sys.path.insert(0, ".")
+import rsvp
+
+PRESETS = {
+    "make_default_rsvp_field": rsvp.make_default_rsvp_field,
+    "make_tree_operators": rsvp.make_tree_operators,
+}
+
+SAMPLERS = ("random", "sobol", "halton")
+
+
+def estimate(fields, B: float, n: int, sampler: str, seed: int) -> dict[str, float]:
+    summaries = rsvp.probe_statistics(
+        fields, (-B, -B, -B), (B, B, B), samples=n, seed=seed, workers=1,
+        sketch=0, sampler=sampler, replicates=1,
+    )
+    return {name: s.mean for name, s in summaries.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark probe samplers")
+    parser.add_argument("--preset", default="make_default_rsvp_field", choices=list(PRESETS))
+    parser.add_argument("--repeats", type=int, default=16)
+    parser.add_argument("--max-log2", type=int, default=16)
+    parser.add_argument("--bounds", type=float, default=1.2)
+    args = parser.parse_args()
+
+    phi, _, closure = PRESETS[args.preset]()
+    fields = {"phi": phi, "closure": closure}
+    B = args.bounds
+
+    t0 = time.perf_counter()
+    ref = estimate(fields, B, 1 << 22, "sobol", seed=-1)
+    print(f"[bench] preset={args.preset}  repeats={args.repeats}  reference "
+          f"(sobol 2^22, {time.perf_counter() - t0:.1f}s): "
+          + "  ".join(f"{k}={v:.6f}" for k, v in ref.items()))
+
+    for name in fields:
+        print(f"\n  {name}: RMS error of the mean")
+        print(f"  {'n':>8s}  " + "  ".join(f"{s:>9s}" for s in SAMPLERS)
+              + "  " + "  ".join(f"{s + ' x':>9s}" for s in SAMPLERS[1:]))
+        for k in range(8, args.max_log2 + 1, 2):
+            n = 1 << k
+            rms = {}
+            for sampler in SAMPLERS:
+                errs = [estimate({name: fields[name]}, B, n, sampler, seed)[name] - ref[name]
+                        for seed in range(args.repeats)]
+                rms[sampler] = math.sqrt(sum(e * e for e in errs) / len(errs))
+            # Random samples needed for the same error, as a multiple of n
+            gain = [(rms["random"] / max(rms[s], 1e-300)) ** 2 for s in SAMPLERS[1:]]
+            print(f"  {n:8d}  " + "  ".join(f"{rms[s]:9.2e}" for s in SAMPLERS)
+                  + "  " + "  ".join(f"{g:9.0f}" for g in gain))
+    print()
+
+
+if __name__ == "__main__":
+    main()
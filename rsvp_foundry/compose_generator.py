@@ -5,20 +5,36 @@ rsvp field operators. Each generated script is self-contained and reproducible.
 
 Usage:
     python compose_generator.py [--count N] [--seed S] [--output-dir DIR] [--dry-run]
+                                [--candidates M] [--no-screen]
 
 The composer samples the space of admissible field compositions rather than
 constructing individual generators by hand. It is the first step toward
 self-directed exploration of the RSVP operator algebra.
+
+Before anything is emitted, candidates are screened headlessly: probe
+statistics of phi and closure over a box (flat phi, closure pinned at the
+entropy cap, closure coverage) and a trial trunk from trace_growth_path
+(leaving the box at once, curling in place). Survivors are ranked and the
+best --count are emitted; compositions whose field expressions are
+structurally identical (by canonical hash) to an earlier candidate or an
+existing composition in the output directory are skipped.
 """
 
 from __future__ import annotations
 import argparse
+import dataclasses
 import json
+import math
+import os
 import random
+import sys
 import textwrap
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import rsvp
+
 
 # ---------------------------------------------------------------------------
 # Symbolic field expression builders
@@ -151,6 +167,9 @@ cap = {cap_expr}
 # --- closure ---
 closure = rsvp.capped_field(rsvp.closure_field(phi, v_field), cap)
 
+# --- field cache key (RSVP_CACHE_DIR): the composition's expression trees ---
+FIELD_SPEC = {field_spec}
+
 print(f"[{name}] phi@origin={{phi(0,0,0):.4f}}  closure@origin={{closure(0,0,0):.4f}}")
 
 # --- scene ---
@@ -158,22 +177,27 @@ bpy.ops.object.select_all(action="SELECT")
 bpy.ops.object.delete()
 
 # --- growth path from field ---
-path = rsvp.trace_growth_path(
-    start=(0.0, 0.0, 0.0),
-    direction_field=v_field,
-    scalar_field=phi,
-    step_size={step_size},
-    steps={steps},
-    attraction={attraction},
+path = rsvp.cached(
+    ("composed", FIELD_SPEC, "trunk", {step_size}, {steps}, {attraction}),
+    lambda: rsvp.trace_growth_path(
+        start=(0.0, 0.0, 0.0),
+        direction_field=v_field,
+        scalar_field=phi,
+        step_size={step_size},
+        steps={steps},
+        attraction={attraction},
+    ),
 )
 
-branches = rsvp.branch_paths(
-    root_path=path,
-    direction_field=v_field,
-    branch_probability={branch_prob},
-    max_branches={max_branches},
-    lateral_strength={lateral_strength},
-    rng=rng,
+origins = rsvp.sample_branch_origins(len(path), {branch_prob}, {max_branches}, rng)
+branches = rsvp.cached(
+    ("composed", FIELD_SPEC, "branches", path, origins, {lateral_strength}),
+    lambda: rsvp.branch_paths(
+        root_path=path,
+        direction_field=v_field,
+        lateral_strength={lateral_strength},
+        origins=origins,
+    ),
 )
 
 print(f"[{name}] trunk={{len(path)}} pts  branches={{len(branches)}}")
@@ -220,6 +244,7 @@ class CompositionSpec:
     v_expr: str
     v_expr_tree: dict
     cap_expr: str
+    cap_expr_tree: dict
     step_size: float
     steps: int
     attraction: float
@@ -296,6 +321,7 @@ def compose_spec(name: str, composition_seed: int) -> CompositionSpec:
         v_expr=v_code,
         v_expr_tree=asdict(v_tree),
         cap_expr=cap_code,
+        cap_expr_tree=asdict(cap_tree),
         step_size=round(rng.uniform(0.03, 0.08), 3),
         steps=rng.randint(40, 120),
         attraction=round(rng.uniform(0.1, 0.5), 3),
@@ -307,7 +333,7 @@ def compose_spec(name: str, composition_seed: int) -> CompositionSpec:
     )
 
 
-def emit_script(spec: CompositionSpec, out_dir: Path) -> Path:
+def emit_script(spec: CompositionSpec, out_dir: Path, screen: dict | None = None) -> Path:
     code = SCRIPT_TEMPLATE.format(
         name=spec.name,
         composition_seed=spec.composition_seed,
@@ -315,6 +341,8 @@ def emit_script(spec: CompositionSpec, out_dir: Path) -> Path:
         phi_expr=spec.phi_expr,
         v_expr=spec.v_expr,
         cap_expr=spec.cap_expr,
+        field_spec=repr({"phi": spec.phi_expr_tree, "v": spec.v_expr_tree,
+                         "cap": spec.cap_expr_tree}),
         step_size=spec.step_size,
         steps=spec.steps,
         attraction=spec.attraction,
@@ -337,6 +365,7 @@ def emit_script(spec: CompositionSpec, out_dir: Path) -> Path:
         "phi_expr_tree": spec.phi_expr_tree,
         "v_expr": spec.v_expr,
         "cap_expr": spec.cap_expr,
+        "field_hash": field_key(spec),
         "growth_params": {
             "step_size": spec.step_size,
             "steps": spec.steps,
@@ -346,18 +375,175 @@ def emit_script(spec: CompositionSpec, out_dir: Path) -> Path:
             "lateral_strength": spec.lateral_strength,
         },
     }
+    if screen is not None:
+        sidecar["screen"] = screen
     sidecar_path = out_dir / f"generate_{spec.name}.composition.json"
     sidecar_path.write_text(json.dumps(sidecar, indent=2) + "\n", encoding="utf-8")
 
     return path
 
 
+# ---------------------------------------------------------------------------
+# Pre-render screening
+# ---------------------------------------------------------------------------
+
+COMMUTATIVE_OPS = ("rsvp.add_scalar_fields", "rsvp.mul_scalar_fields")
+
+
+@dataclass(frozen=True)
+class ScreenCriteria:
+    """Thresholds a composition must meet before it is emitted."""
+    bounds: float = 2.5            # probe and trial-growth box [-B, B]^3
+    samples: int = 4096            # Sobol probe points
+    min_phi_range: float = 0.05    # q99 - q01 of phi; below this phi is flat
+    max_saturation: float = 0.6    # fraction of closure pinned within 2% of the cap
+    min_coverage: float = 0.05     # fraction of the box with closure > 0
+    max_coverage: float = 1.0
+    min_inside: float = 0.25       # fraction of trunk steps taken before leaving the box
+    min_reach: float = 0.05        # trunk end-to-start distance / arc length
+
+
+def _canonical_tree(tree: dict) -> tuple:
+    """(op, params, children) with nested sums/products flattened and sorted."""
+    op = tree["op"]
+    children = [_canonical_tree(c) for c in tree.get("components", ())]
+    if op in COMMUTATIVE_OPS:
+        flat = []
+        for c in children:
+            flat.extend(c[2] if c[0] == op else [c])
+        children = sorted(flat, key=rsvp.canonical_hash)
+    return (op, tree.get("params", {}), children)
+
+
+def field_key(spec: CompositionSpec) -> str:
+    """Hash of the composition's fields, equal for structurally identical ones."""
+    return rsvp.canonical_hash(
+        "composition-fields",
+        _canonical_tree(spec.phi_expr_tree),
+        _canonical_tree(spec.v_expr_tree),
+        _canonical_tree(spec.cap_expr_tree),
+    )
+
+
+def existing_keys(out_dir: Path) -> set[str]:
+    """field_key of every composition sidecar already in out_dir."""
+    keys = set()
+    for path in sorted(out_dir.glob("generate_*.composition.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if "field_hash" in data:
+            keys.add(data["field_hash"])
+        elif "composition_seed" in data:
+            keys.add(field_key(compose_spec(data.get("name", ""), data["composition_seed"])))
+    return keys
+
+
+def build_fields(spec: CompositionSpec):
+    """(phi, v_field, cap, closure) exactly as the emitted script builds them."""
+    # The expressions are the composer's own output, evaluated against rsvp only
+    namespace = {"__builtins__": {}, "rsvp": rsvp}
+    phi = eval(spec.phi_expr, namespace)
+    v_field = eval(spec.v_expr, namespace)
+    cap = eval(spec.cap_expr, namespace)
+    closure = rsvp.capped_field(rsvp.closure_field(phi, v_field), cap)
+    return phi, v_field, cap, closure
+
+
+def screen_spec(spec: CompositionSpec, criteria: ScreenCriteria) -> dict:
+    """
+    Probe metrics of one composition, its ranking score and "reject" (the
+    first failed criterion, or None).
+
+    score = balance * (1 - saturation) * inside * min(1, phi_range / 0.5),
+    with balance = 1 - |2 coverage - 1|: highest for closure positive over
+    about half the box, an unsaturated closure, a trunk that stays in the
+    box and a phi with some relief.
+    """
+    phi, v_field, cap, closure = build_fields(spec)
+    pinned = 0.98 * cap.threshold
+
+    def probe(x, y, z):
+        c = closure(x, y, z)
+        return phi(x, y, z), c, (c > 0) * 1.0, (abs(c) >= pinned) * 1.0
+
+    B = criteria.bounds
+    summaries = rsvp.probe_statistics(
+        (("phi", "closure", "coverage", "saturation"), probe),
+        (-B, -B, -B), (B, B, B), samples=criteria.samples, workers=1,
+        sampler="sobol", replicates=1, seed=spec.composition_seed,
+    )
+    s_phi = summaries["phi"]
+    q01, q99 = s_phi.quantile([0.01, 0.99])
+    report = {
+        "phi_mean": s_phi.mean,
+        "phi_std": s_phi.std,
+        "phi_range": float(q99 - q01),
+        "closure_mean": summaries["closure"].mean,
+        "coverage": summaries["coverage"].mean,
+        "saturation": summaries["saturation"].mean,
+        "nonfinite": sum(s.nonfinite for s in summaries.values()),
+    }
+
+    # Trial trunk, as the emitted script grows it
+    path = rsvp.trace_growth_path(
+        start=(0.0, 0.0, 0.0), direction_field=v_field, scalar_field=phi,
+        step_size=spec.step_size, steps=spec.steps, attraction=spec.attraction,
+    )
+    finite = all(math.isfinite(c) for p in path for c in p)
+    exit_step = next((i for i, p in enumerate(path) if max(abs(c) for c in p) > B), len(path))
+    report["inside"] = (exit_step - 1) / spec.steps
+    report["reach"] = (math.dist(path[0], path[-1]) / (spec.step_size * spec.steps)
+                       if finite else 0.0)
+    report["score"] = (
+        (1.0 - abs(2.0 * report["coverage"] - 1.0)) * (1.0 - report["saturation"])
+        * min(report["inside"], 1.0) * min(1.0, report["phi_range"] / 0.5)
+    )
+
+    checks = (
+        (report["nonfinite"] == 0 and finite, "non-finite field values"),
+        (report["phi_range"] >= criteria.min_phi_range, "flat phi"),
+        (report["saturation"] <= criteria.max_saturation, "closure saturated by cap"),
+        (report["coverage"] >= criteria.min_coverage, "closure coverage too low"),
+        (report["coverage"] <= criteria.max_coverage, "closure coverage too high"),
+        (report["inside"] >= criteria.min_inside, "growth leaves bounds"),
+        (report["reach"] >= criteria.min_reach, "growth curls in place"),
+    )
+    report["reject"] = next((reason for ok, reason in checks if not ok), None)
+    return report
+
+
+def _free_names(out_dir: Path):
+    """auto_NNN names with no generator in out_dir yet, in order."""
+    i = 0
+    while True:
+        name = f"auto_{i:03d}"
+        if not (out_dir / f"generate_{name}.py").exists():
+            yield name
+        i += 1
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compose new rsvp generator scripts")
     parser.add_argument("--count", type=int, default=5, help="Number of generators to emit")
     parser.add_argument("--seed", type=int, default=0, help="Master seed for composition RNG")
     parser.add_argument("--output-dir", default=".", help="Directory for emitted scripts")
     parser.add_argument("--dry-run", action="store_true", help="Print composition specs without writing")
+    parser.add_argument("--no-screen", action="store_true",
+                        help="Emit the first --count compositions unscreened, as auto_000..")
+    parser.add_argument("--candidates", type=int, default=0,
+                        help="Compositions to screen (default: 4 x count)")
+    defaults = ScreenCriteria()
+    parser.add_argument("--probe-samples", type=int, default=defaults.samples)
+    parser.add_argument("--bounds", type=float, default=defaults.bounds,
+                        help="Probe and trial-growth box [-B, B]^3")
+    parser.add_argument("--min-phi-range", type=float, default=defaults.min_phi_range)
+    parser.add_argument("--max-saturation", type=float, default=defaults.max_saturation)
+    parser.add_argument("--min-coverage", type=float, default=defaults.min_coverage)
+    parser.add_argument("--max-coverage", type=float, default=defaults.max_coverage)
+    parser.add_argument("--min-inside", type=float, default=defaults.min_inside)
+    parser.add_argument("--min-reach", type=float, default=defaults.min_reach)
     args = parser.parse_args()
 
     out_dir = Path(args.output_dir)
@@ -365,18 +551,65 @@ def main() -> None:
 
     master_rng = random.Random(args.seed)
 
-    for i in range(args.count):
+    def show(spec: CompositionSpec) -> None:
+        print(f"[compose] {spec.name}  seed={spec.composition_seed}")
+        print(f"  phi:    {spec.phi_expr[:80]}")
+        print(f"  v:      {spec.v_expr[:80]}")
+        print(f"  steps:  {spec.steps}  attraction: {spec.attraction}")
+
+    if args.no_screen:
+        for i in range(args.count):
+            composition_seed = master_rng.randint(0, 2**31)
+            spec = compose_spec(f"auto_{i:03d}", composition_seed)
+            if args.dry_run:
+                show(spec)
+            else:
+                path = emit_script(spec, out_dir)
+                print(f"[compose] {path}")
+        return
+
+    criteria = ScreenCriteria(
+        bounds=args.bounds, samples=args.probe_samples,
+        min_phi_range=args.min_phi_range, max_saturation=args.max_saturation,
+        min_coverage=args.min_coverage, max_coverage=args.max_coverage,
+        min_inside=args.min_inside, min_reach=args.min_reach,
+    )
+    seen = existing_keys(out_dir)
+    kept = []
+    rejected: dict[str, int] = {}
+    for i in range(args.candidates or 4 * args.count):
         composition_seed = master_rng.randint(0, 2**31)
-        name = f"auto_{i:03d}"
-        spec = compose_spec(name, composition_seed)
-
+        spec = compose_spec(f"candidate_{i:03d}", composition_seed)
+        key = field_key(spec)
+        if key in seen:
+            reason, report = "duplicate fields", None
+        else:
+            seen.add(key)
+            report = screen_spec(spec, criteria)
+            reason = report["reject"]
+        if reason is not None:
+            rejected[reason] = rejected.get(reason, 0) + 1
+            print(f"[screen] seed={composition_seed:<10d}  reject: {reason}")
+            continue
+        kept.append((report["score"], i, spec, report))
+        print(f"[screen] seed={composition_seed:<10d}  score={report['score']:.3f}  "
+              f"coverage={report['coverage']:.2f}  saturation={report['saturation']:.2f}  "
+              f"phi_range={report['phi_range']:.3f}  inside={report['inside']:.2f}")
+
+    kept.sort(key=lambda k: (-k[0], k[1]))
+    summary = ", ".join(f"{n} {reason}" for reason, n in sorted(rejected.items()))
+    print(f"[screen] {len(kept)} viable, {sum(rejected.values())} rejected"
+          + (f" ({summary})" if summary else "")
+          + f"; emitting {min(len(kept), args.count)}")
+
+    names = _free_names(out_dir)
+    for _, _, spec, report in kept[:args.count]:
+        spec = dataclasses.replace(spec, name=next(names))
         if args.dry_run:
-            print(f"[compose] {name}  seed={composition_seed}")
-            print(f"  phi:    {spec.phi_expr[:80]}")
-            print(f"  v:      {spec.v_expr[:80]}")
-            print(f"  steps:  {spec.steps}  attraction: {spec.attraction}")
+            show(spec)
+            print(f"  score:  {report['score']:.3f}")
         else:
-            path = emit_script(spec, out_dir)
+            path = emit_script(spec, out_dir, screen=report)
             print(f"[compose] {path}")
 
 
@@ -13,6 +13,10 @@ Usage:
         --seam-width 0.2 \
         --add-water
 
+    --lod-camera X Y Z meshes the terrain as a quadtree whose density follows
+    screen-space error from that world-space camera (--lod-error pixels),
+    within --lod-budget vertices, instead of the uniform --resolution grid.
+
 Produces a displaced mesh terrain with optional water plane and seam artifact,
 suitable for use as a station exterior or surface environment in KOMMUNIKATION.
 
@@ -43,6 +47,16 @@ def parse_args() -> argparse.Namespace:
                         help="Vertices per side (64 = 64x64 grid)")
     parser.add_argument("--size", type=float, default=10.0,
                         help="World-space width and depth of terrain")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Processes for height-map tiles (0 = one per CPU)")
+    parser.add_argument("--lod-camera", nargs=3, type=float, default=None,
+                        metavar=("X", "Y", "Z"),
+                        help="World-space camera; builds a quadtree LOD mesh "
+                             "instead of the uniform grid")
+    parser.add_argument("--lod-error", type=float, default=1.0,
+                        help="LOD screen-space error tolerance in pixels")
+    parser.add_argument("--lod-budget", type=int, default=65536,
+                        help="LOD vertex budget")
 
     # Height
     parser.add_argument("--height-scale", type=float, default=1.5)
@@ -81,6 +95,7 @@ import bmesh
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 
+import numpy as np
 import rsvp
 
 
@@ -95,14 +110,14 @@ terrain: rsvp.ScalarFn = landscape_ops["terrain"]   # type: ignore[assignment]
 
 # Optionally layer in a second harmonic with a random phase offset
 # to break the preset's bilateral symmetry
-extra = rsvp.HarmonicField(
+extra_spec = rsvp.HarmonicField(
     weights=(rng.uniform(0.3, 0.8), rng.uniform(0.3, 0.8), 0.0),
     frequencies=(rng.uniform(2.0, 4.5), rng.uniform(1.5, 3.5), 0.0),
     phase=(rng.uniform(0, 6.28), rng.uniform(0, 6.28), 0.0),
     amplitude=rng.uniform(0.12, 0.25),
-).scalar()
+)
 
-terrain = rsvp.add_scalar_fields(terrain, extra)
+terrain = rsvp.add_scalar_fields(terrain, extra_spec.scalar())
 
 # Closure field — used to modulate seam visibility and as a debug channel
 phi, v_field, closure = rsvp.make_default_rsvp_field()
@@ -114,63 +129,51 @@ phi, v_field, closure = rsvp.make_default_rsvp_field()
 
 N = args.resolution
 B = args.bounds_scale
-hmap = rsvp.sample_height_map(
-    terrain,
-    nx=N, ny=N,
-    bounds_min=(-B, -B),
-    bounds_max=(B, B),
-    z_scale=args.height_scale,
+# Everything the terrain depends on, for the field cache (RSVP_CACHE_DIR)
+terrain_key = ("landscape-terrain", rsvp.preset_spec(rsvp.make_landscape_operators), extra_spec)
+hmap = rsvp.cached(
+    (*terrain_key, "height_map", N, B, args.height_scale),
+    lambda: rsvp.rasterize_height_map(
+        terrain,
+        nx=N, ny=N,
+        bounds_min=(-B, -B),
+        bounds_max=(B, B),
+        z_scale=args.height_scale,
+        workers=args.workers or None,
+    ),
 )
 
+# Seam parameters; the grid's field-space vertices (ix-major, like hmap)
+seams = [] if args.no_seam else [rsvp.Seam(
+    axis=args.seam_axis,
+    position=args.seam_position,
+    width=args.seam_width,
+    offset=(args.seam_offset_x, args.seam_offset_y, 0.0),
+    twist=args.seam_twist,
+)]
+gx, gy = np.meshgrid(np.linspace(-B, B, N), np.linspace(-B, B, N), indexing="ij")
+grid_pts = np.stack([gx.ravel(), gy.ravel(), np.zeros(N * N)], axis=1)
+
 # Seam metric map — same grid, used for material masking
-if not args.no_seam:
-    seam_map = [
-        [
-            rsvp.seam_obstruction_metric(
-                x=(ix / max(N - 1, 1)) * 2 * B - B,
-                y=(iy / max(N - 1, 1)) * 2 * B - B,
-                z=0.0,
-                seam_axis=args.seam_axis,
-                seam_position=args.seam_position,
-                width=args.seam_width,
-            )
-            for iy in range(N)
-        ]
-        for ix in range(N)
-    ]
+if seams:
+    grid_disp, grid_masks = rsvp.apply_seams(grid_pts, seams)
+    seam_map = grid_masks.max(axis=0).reshape(N, N)
 else:
-    seam_map = [[0.0] * N for _ in range(N)]
+    grid_disp = grid_pts
+    seam_map = np.zeros((N, N))
 
 print(f"[rsvp] height map: {N}x{N}  "
-      f"min={min(h for row in hmap for h in row):.3f}  "
-      f"max={max(h for row in hmap for h in row):.3f}")
+      f"min={hmap.min():.3f}  "
+      f"max={hmap.max():.3f}")
 
 
 # ---------------------------------------------------------------------------
 # Apply seam displacement to xy positions if requested
 # ---------------------------------------------------------------------------
 
-def displaced_xy(ix: int, iy: int) -> tuple[float, float]:
-    """Return world-space xy after seam displacement."""
-    raw_x = rsvp.lerp(-args.size / 2, args.size / 2, ix / max(N - 1, 1))
-    raw_y = rsvp.lerp(-args.size / 2, args.size / 2, iy / max(N - 1, 1))
-    if args.no_seam:
-        return raw_x, raw_y
-    # Normalise to field coords for seam_displacement, then rescale
-    fx = rsvp.lerp(-B, B, ix / max(N - 1, 1))
-    fy = rsvp.lerp(-B, B, iy / max(N - 1, 1))
-    dx, dy, _ = rsvp.seam_displacement(
-        fx, fy, 0.0,
-        seam_axis=args.seam_axis,
-        seam_position=args.seam_position,
-        width=args.seam_width,
-        offset=(args.seam_offset_x, args.seam_offset_y, 0.0),
-        twist=args.seam_twist,
-    )
-    # Map displaced field coords back to world space
-    world_x = (dx + B) / (2 * B) * args.size - args.size / 2
-    world_y = (dy + B) / (2 * B) * args.size - args.size / 2
-    return world_x, world_y
+# Map displaced field coords back to world space
+world_xy = (grid_disp[:, :2] + B) / (2 * B) * args.size - args.size / 2
+world_xy = world_xy.reshape(N, N, 2).tolist()
 
 
 # ---------------------------------------------------------------------------
@@ -185,35 +188,69 @@ bpy.ops.object.delete()
 # Build terrain mesh via bmesh
 # ---------------------------------------------------------------------------
 
-bm = bmesh.new()
-
-# Create vertex grid
-verts: list[list[bmesh.types.BMVert]] = []
-for ix in range(N):
-    row = []
-    for iy in range(N):
-        wx, wy = displaced_xy(ix, iy)
-        wz = hmap[ix][iy]
-        row.append(bm.verts.new((wx, wy, wz)))
-    verts.append(row)
-
-# Create faces
-for ix in range(N - 1):
-    for iy in range(N - 1):
-        v00 = verts[ix][iy]
-        v10 = verts[ix + 1][iy]
-        v11 = verts[ix + 1][iy + 1]
-        v01 = verts[ix][iy + 1]
-        try:
-            bm.faces.new((v00, v10, v11, v01))
-        except ValueError:
-            pass  # duplicate face guard
-
-bm.normal_update()
-
 terrain_mesh = bpy.data.meshes.new("TerrainMesh")
-bm.to_mesh(terrain_mesh)
-bm.free()
+lod_seam = None
+
+if args.lod_camera is not None:
+    # Mesh in world units so camera distance and height error agree
+    to_world = args.size / (2 * B)
+    H = args.size / 2
+    lod = rsvp.QuadtreeTerrain(
+        lambda x, y, z: terrain(x / to_world, y / to_world, z),
+        (-H, -H), (H, H), z_scale=args.height_scale,
+    )
+    lod_stats: dict = {}
+    lod_verts, lod_tris = rsvp.cached(
+        (*terrain_key, "lod", args.size, B, args.height_scale,
+         args.lod_camera, args.lod_error, args.lod_budget),
+        lambda: list(lod.mesh(
+            tuple(args.lod_camera),
+            pixel_error=args.lod_error,
+            vertex_budget=args.lod_budget,
+            stats=lod_stats,
+        )),
+    )
+    field_pts = np.zeros((len(lod_verts), 3))
+    field_pts[:, :2] = lod_verts[:, :2] / to_world
+    if seams:
+        disp, masks = rsvp.apply_seams(field_pts, seams)
+        lod_seam = masks.max(axis=0).tolist()
+    else:
+        disp, lod_seam = field_pts, [0.0] * len(lod_verts)
+    coords = np.column_stack([disp[:, :2] * to_world, lod_verts[:, 2]])
+    terrain_mesh.from_pydata(coords.tolist(), [], lod_tris.tolist())
+    terrain_mesh.update()
+    if lod_stats:
+        print(f"[rsvp] LOD mesh: {lod_stats['tiles']} tiles  "
+              f"levels<={lod_stats['max_level']}  {lod_stats['vertices']} verts")
+else:
+    bm = bmesh.new()
+
+    # Create vertex grid
+    verts: list[list[bmesh.types.BMVert]] = []
+    for ix in range(N):
+        row = []
+        for iy in range(N):
+            wx, wy = world_xy[ix][iy]
+            wz = hmap[ix][iy]
+            row.append(bm.verts.new((wx, wy, wz)))
+        verts.append(row)
+
+    # Create faces
+    for ix in range(N - 1):
+        for iy in range(N - 1):
+            v00 = verts[ix][iy]
+            v10 = verts[ix + 1][iy]
+            v11 = verts[ix + 1][iy + 1]
+            v01 = verts[ix][iy + 1]
+            try:
+                bm.faces.new((v00, v10, v11, v01))
+            except ValueError:
+                pass  # duplicate face guard
+
+    bm.normal_update()
+    bm.to_mesh(terrain_mesh)
+    bm.free()
 
 terrain_obj = bpy.data.objects.new("Terrain", terrain_mesh)
 bpy.context.scene.collection.objects.link(terrain_obj)
@@ -240,6 +277,9 @@ flat_idx = {(ix * N + iy): (ix, iy) for ix in range(N) for iy in range(N)}
 for poly in terrain_mesh.polygons:
     for loop_idx in poly.loop_indices:
         vert_idx = terrain_mesh.loops[loop_idx].vertex_index
+        if lod_seam is not None:
+            color_layer.data[loop_idx].color = (*[lod_seam[vert_idx]] * 3, 1.0)
+            continue
         # Recover ix, iy from linear index (robust fallback)
         ix = vert_idx // N
         iy = vert_idx % N
@@ -391,6 +431,9 @@ bpy.context.scene.render.resolution_y = 1080
 # Save
 # ---------------------------------------------------------------------------
 
+if rsvp.default_cache() is not None:
+    print(f"[rsvp] {rsvp.default_cache().report()}")
+
 bpy.ops.wm.save_as_mainfile(filepath=args.output)
 print(f"[rsvp] saved landscape to {args.output}")
 print(f"[rsvp] seam axis={args.seam_axis}  water={args.add_water}  "
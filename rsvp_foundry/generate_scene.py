@@ -13,6 +13,16 @@ Usage:
         --tree-count 12 \\
         --resolution 64 \\
         --size 10.0
+
+    --bake-res N bakes the closure field onto an NxN grid before tree
+    seeding (tricubic lookup); 0 keeps exact evaluation.
+    --seeding importance samples tree positions in vectorised batches from
+    a coarse grid CDF; the default rejection sampler is topped up the same
+    way when it finds fewer than --tree-count positions.
+    --spacing R keeps trees at least R apart (up to 2R where closure is
+    low) using Poisson-disk seeding; it overrides --seeding.
+    --workers N rasterises the height map in tiles across N processes
+    (default: one per CPU; the result does not depend on N).
 """
 
 from __future__ import annotations
@@ -33,11 +43,24 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--tree-count", type=int, default=10)
     p.add_argument("--resolution", type=int, default=64)
     p.add_argument("--size", type=float, default=10.0)
+    p.add_argument("--workers", type=int, default=0,
+                   help="Processes for height-map tiles (0 = one per CPU)")
     p.add_argument("--height-scale", type=float, default=1.4)
     p.add_argument("--bounds-scale", type=float, default=1.2)
     p.add_argument("--trunk-steps", type=int, default=60)
     p.add_argument("--branch-count", type=int, default=8)
     p.add_argument("--no-seam", action="store_true")
+    p.add_argument("--bake-res", type=int, default=0,
+                   help="Bake closure to an NxN grid for seeding (0 = exact)")
+    p.add_argument("--spacing", type=float, default=0.0,
+                   help="Min tree spacing (Poisson-disk seeding, wider where closure "
+                        "is low); 0 = unconstrained")
+    p.add_argument("--seeding", choices=("rejection", "importance", "interval", "sobol"),
+                   default="rejection",
+                   help="Tree seeding: per-point rejection (topped up if short), "
+                        "batched importance sampling over a coarse grid, or over "
+                        "boxes kept by interval bounds, or importance sampling "
+                        "driven by a scrambled Sobol sequence (evenly spread trees)")
     return p.parse_args(argv)
 
 
@@ -59,13 +82,13 @@ landscape_ops = rsvp.make_landscape_operators()
 terrain: rsvp.ScalarFn = landscape_ops["terrain"]   # type: ignore[assignment]
 
 # Extra harmonic variation per seed
-extra = rsvp.HarmonicField(
+extra_spec = rsvp.HarmonicField(
     weights=(rng.uniform(0.3, 0.8), rng.uniform(0.3, 0.8), 0.0),
     frequencies=(rng.uniform(2.0, 4.0), rng.uniform(1.5, 3.5), 0.0),
     phase=(rng.uniform(0, 6.28), rng.uniform(0, 6.28), 0.0),
     amplitude=rng.uniform(0.1, 0.22),
-).scalar()
-terrain = rsvp.add_scalar_fields(terrain, extra)
+)
+terrain = rsvp.add_scalar_fields(terrain, extra_spec.scalar())
 
 tree_ops = rsvp.make_tree_operators()
 tree_v: rsvp.VectorFn = tree_ops["v_field"]   # type: ignore[assignment]
@@ -81,10 +104,16 @@ B = args.bounds_scale
 # Terrain mesh
 # ---------------------------------------------------------------------------
 
-hmap = rsvp.sample_height_map(
-    terrain, nx=N, ny=N,
-    bounds_min=(-B, -B), bounds_max=(B, B),
-    z_scale=args.height_scale,
+# Field cache (RSVP_CACHE_DIR) keys: the specs each stage depends on
+terrain_key = ("scene-terrain", rsvp.preset_spec(rsvp.make_landscape_operators), extra_spec)
+hmap = rsvp.cached(
+    (*terrain_key, "height_map", N, B, args.height_scale),
+    lambda: rsvp.rasterize_height_map(
+        terrain, nx=N, ny=N,
+        bounds_min=(-B, -B), bounds_max=(B, B),
+        z_scale=args.height_scale,
+        workers=args.workers or None,
+    ),
 )
 
 bpy.ops.object.select_all(action="SELECT")
@@ -160,14 +189,65 @@ def terrain_z_at(fx: float, fy: float) -> float:
             + h01 * (1 - fx_) * fy_
             + h11 * fx_ * fy_)
 
-seed_pts = rsvp.seed_points_from_field(
-    closure,
-    count=args.tree_count,
-    bounds_min=(-B * 0.85, -B * 0.85, 0.0),
-    bounds_max=( B * 0.85,  B * 0.85, 0.0),
-    threshold=0.3,
-    rng=rng,
+seed_stats: dict = {}
+
+
+def seed_trees() -> list[rsvp.Vec3]:
+    seed_field = closure
+    if args.bake_res > 0:
+        seed_field = rsvp.BakedField(
+            closure,
+            bounds_min=(-B * 0.85, -B * 0.85, 0.0),
+            bounds_max=( B * 0.85,  B * 0.85, 0.0),
+            resolution=(args.bake_res, args.bake_res, 1),
+            method="tricubic",
+        )
+        print(f"[scene] {seed_field.report(500)}")
+
+    seed_box = dict(bounds_min=(-B * 0.85, -B * 0.85, 0.0), bounds_max=(B * 0.85, B * 0.85, 0.0))
+    if args.spacing > 0:
+        # Blue-noise candidates, denser where closure is high, then a random
+        # subset of tree_count; spacing survives the subsetting
+        candidates = rsvp.poisson_disk_points(
+            radius=args.spacing, max_radius=2.0 * args.spacing,
+            density_field=seed_field, density_range=(0.3, 1.0),
+            field=seed_field, threshold=0.3, rng=rng, stats=seed_stats, **seed_box,
+        )
+        seed_pts = rng.sample(candidates, min(args.tree_count, len(candidates)))
+        print(f"[scene] poisson-disk seeding: {len(candidates)} spaced candidates, "
+              f"{seed_stats['evaluations']} evals")
+    elif args.seeding == "sobol":
+        seed_pts = rsvp.seed_points_importance(
+            seed_field, count=args.tree_count, threshold=0.3, rng=rsvp.Sobol(args.seed),
+            stats=seed_stats, **seed_box,
+        )
+    elif args.seeding in ("importance", "interval"):
+        seed_pts = rsvp.seed_points_importance(
+            seed_field, count=args.tree_count, threshold=0.3, rng=rng, stats=seed_stats,
+            intervals=6 if args.seeding == "interval" else None, **seed_box,
+        )
+    else:
+        # Rejection keeps existing seeds' placements; only a short result is topped up
+        seed_pts = rsvp.seed_points_from_field(
+            seed_field, count=args.tree_count, threshold=0.3, rng=rng, **seed_box,
+        )
+        if len(seed_pts) < args.tree_count:
+            seed_pts += rsvp.seed_points_importance(
+                seed_field, count=args.tree_count - len(seed_pts), threshold=0.3,
+                rng=rng, stats=seed_stats, **seed_box,
+            )
+    return seed_pts
+
+
+seed_pts = rsvp.cached(
+    ("scene-seeds", rsvp.preset_spec(rsvp.make_default_rsvp_field), B, args.bake_res, args.spacing,
+     args.seeding, args.tree_count),
+    seed_trees, rng=rng,
 )
+if seed_stats.get("candidates"):
+    print(f"[scene] importance seeding: {seed_stats['evaluations']} evals, "
+          f"acceptance {seed_stats['acceptance_rate']:.1%}, "
+          f"admissible {seed_stats['admissible_fraction']:.1%}")
 
 print(f"[scene] tree positions found: {len(seed_pts)}")
 
@@ -201,39 +281,55 @@ def make_tree_curve(pts: list[rsvp.Vec3], name: str, bevel: float) -> bpy.types.
     obj.data.materials.append(bark_mat)
     return obj
 
-for t_idx, (fx, fy, _) in enumerate(seed_pts):
+# Per-tree parameters, drawn in the same rng order as growing one tree at a
+# time, then every trunk and every branch is traced in one lockstep batch
+starts, biases, step_sizes, bevels, laterals, origins = [], [], [], [], [], []
+for fx, fy, _ in seed_pts:
     wx, wy = field_to_world(fx, fy)
-    wz = terrain_z_at(fx, fy)
+    starts.append((wx, wy, terrain_z_at(fx, fy)))
 
     # Per-tree directional perturbation for variety
-    perturb_v = rsvp.add_vector_fields(
-        tree_v,
-        rsvp.DirectionalBias(
-            direction=(rng.gauss(0, 0.2), rng.gauss(0, 0.2), 1.0),
-            strength=0.6,
-            curl=rng.uniform(0.1, 0.45),
-        ).vector(),
-    )
-
-    trunk = rsvp.trace_growth_path(
-        start=(wx, wy, wz),
+    biases.append(rsvp.DirectionalBias(
+        direction=(rng.gauss(0, 0.2), rng.gauss(0, 0.2), 1.0),
+        strength=0.6,
+        curl=rng.uniform(0.1, 0.45),
+    ))
+    step_sizes.append(rng.uniform(0.04, 0.07))
+    bevels.append(rng.uniform(0.05, 0.10))
+    laterals.append(rng.uniform(0.5, 0.8))
+    origins.append(rsvp.sample_branch_origins(
+        args.trunk_steps + 1, branch_probability=0.10,
+        max_branches=args.branch_count, rng=rng,
+    ))
+
+
+def grow_trees() -> list:
+    perturb_v = rsvp.DirectionalBank(biases, shared=tree_v)
+    trunks = rsvp.trace_growth_paths(
+        starts,
         direction_field=perturb_v,
-        scalar_field=None,
-        step_size=rng.uniform(0.04, 0.07),
+        step_size=step_sizes,
         steps=args.trunk_steps,
     )
-    make_tree_curve(trunk, f"trunk_{t_idx:03d}", bevel=rng.uniform(0.05, 0.10))
-
-    branches = rsvp.branch_paths(
-        root_path=trunk,
+    branch_sets = rsvp.branch_paths_batched(
+        trunks,
         direction_field=perturb_v,
-        branch_probability=0.10,
-        max_branches=args.branch_count,
         step_size=0.035,
         branch_steps=30,
-        lateral_strength=rng.uniform(0.5, 0.8),
-        rng=rng,
+        lateral_strength=laterals,
+        origins=origins,
     )
+    return [trunks, branch_sets]
+
+
+trunks, branch_sets = rsvp.cached(
+    ("scene-trees", rsvp.preset_spec(rsvp.make_tree_operators), starts, biases, step_sizes,
+     laterals, origins, args.trunk_steps),
+    grow_trees,
+)
+
+for t_idx, (trunk, branches) in enumerate(zip(trunks, branch_sets)):
+    make_tree_curve(trunk, f"trunk_{t_idx:03d}", bevel=bevels[t_idx])
     for b_idx, bpath in enumerate(branches):
         make_tree_curve(bpath, f"branch_{t_idx:03d}_{b_idx:02d}", bevel=0.025)
 
@@ -280,5 +376,8 @@ bpy.context.scene.cycles.use_denoising = True
 bpy.context.scene.render.resolution_x = 1920
 bpy.context.scene.render.resolution_y = 1080
 
+if rsvp.default_cache() is not None:
+    print(f"[scene] {rsvp.default_cache().report()}")
+
 bpy.ops.wm.save_as_mainfile(filepath=args.output)
 print(f"[scene] saved to {args.output}")
\ No newline at end of file
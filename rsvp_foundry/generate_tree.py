@@ -6,7 +6,8 @@ Usage:
         --output /tmp/rsvp_tree.blend \
         --seed 42 \
         --trunk-steps 80 \
-        --branch-count 12
+        --branch-count 12 \
+        --integrator rk45
 
 The script builds an RSVP-field-driven tree, converts growth paths to
 bevelled curves, assigns a simple bark material, and saves the .blend file.
@@ -42,6 +43,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--branch-bevel", type=float, default=0.03)
     parser.add_argument("--lateral-strength", type=float, default=0.70)
     parser.add_argument("--curl", type=float, default=0.30)
+    parser.add_argument("--integrator", choices=("euler", "rk45"), default="euler",
+                        help="Trunk integrator: fixed-step Euler or adaptive RK45")
     return parser.parse_args(argv)
 
 args = parse_args()
@@ -69,35 +72,65 @@ v_field: rsvp.VectorFn = ops["v_field"]   # type: ignore[assignment]
 grad_phi: rsvp.VectorFn = ops["grad_phi"] # type: ignore[assignment]
 
 # Perturb the directional bias slightly per seed so each tree is unique
-perturb = rsvp.DirectionalBias(
+perturb_spec = rsvp.DirectionalBias(
     direction=(rng.gauss(0, 0.15), rng.gauss(0, 0.15), 1.0),
     strength=1.0,
     curl=args.curl,
-).vector()
-v_field = rsvp.add_vector_fields(v_field, perturb)
+)
+v_field = rsvp.add_vector_fields(v_field, perturb_spec.vector())
+
+# Field cache (RSVP_CACHE_DIR) key: everything v_field depends on
+field_key = ("tree", rsvp.preset_spec(rsvp.make_tree_operators), perturb_spec)
 
 
 # ---------------------------------------------------------------------------
 # Geometry generation
 # ---------------------------------------------------------------------------
 
-trunk_path = rsvp.trace_growth_path(
-    start=(0.0, 0.0, 0.0),
-    direction_field=v_field,
-    scalar_field=None,      # pure flow integration for trunk
-    step_size=args.trunk_step_size,
-    steps=args.trunk_steps,
-)
+trace_stats: dict = {}
+
+
+def trace_trunk() -> list[rsvp.Vec3]:
+    if args.integrator == "rk45":
+        return rsvp.trace_growth_path_adaptive(
+            start=(0.0, 0.0, 0.0),
+            direction_field=v_field,
+            step_size=args.trunk_step_size,   # output spacing; steps adapt
+            steps=args.trunk_steps,
+            stats=trace_stats,
+        )
+    return rsvp.trace_growth_path(
+        start=(0.0, 0.0, 0.0),
+        direction_field=v_field,
+        scalar_field=None,      # pure flow integration for trunk
+        step_size=args.trunk_step_size,
+        steps=args.trunk_steps,
+    )
 
-branches = rsvp.branch_paths(
-    root_path=trunk_path,
-    direction_field=v_field,
-    branch_probability=args.branch_probability,
-    max_branches=args.branch_count,
-    step_size=0.04,
-    branch_steps=args.branch_steps,
-    lateral_strength=args.lateral_strength,
-    rng=rng,
+
+trunk_path = rsvp.cached(
+    (*field_key, "trunk", args.integrator, args.trunk_step_size, args.trunk_steps),
+    trace_trunk,
+)
+if trace_stats:
+    print(f"[rsvp] rk45 trunk: {trace_stats['evaluations']} field evals "
+          f"(euler {trace_stats['euler_evaluations']}, saved {trace_stats['saved']}), "
+          f"{trace_stats['accepted']} steps, {trace_stats['rejected']} rejected")
+
+# Origins draw from rng as branch_paths would; the tracing itself is cached
+origins = rsvp.sample_branch_origins(
+    len(trunk_path), args.branch_probability, args.branch_count, rng,
+)
+branches = rsvp.cached(
+    (*field_key, "branches", trunk_path, origins, args.branch_steps, args.lateral_strength),
+    lambda: rsvp.branch_paths(
+        root_path=trunk_path,
+        direction_field=v_field,
+        step_size=0.04,
+        branch_steps=args.branch_steps,
+        lateral_strength=args.lateral_strength,
+        origins=origins,
+    ),
 )
 
 print(f"[rsvp] trunk: {len(trunk_path)} pts  branches: {len(branches)}")
@@ -208,5 +241,8 @@ sun_obj.rotation_euler = (0.6, 0.0, -0.8)
 # Save
 # ---------------------------------------------------------------------------
 
+if rsvp.default_cache() is not None:
+    print(f"[rsvp] {rsvp.default_cache().report()}")
+
 bpy.ops.wm.save_as_mainfile(filepath=args.output)
 print(f"[rsvp] saved to {args.output}")
\ No newline at end of file
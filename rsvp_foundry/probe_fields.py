@@ -4,20 +4,28 @@ probe_fields.py — explore rsvp field statistics without running Blender.
 
 Usage:
     python probe_fields.py [--preset PRESET] [--seed S] [--samples N] [--grid G]
+                           [--workers W] [--batch B] [--sampler random|sobol|halton]
 
 Prints closure, phi, and divergence stats across random and grid samples.
 Use this to scan the parameter space cheaply before committing to renders.
+Random samples are evaluated in array batches across worker processes and
+streamed into one-pass summaries (rsvp.probe_statistics), so millions of
+samples take seconds; the mean's convergence is printed as they come in.
+--sampler sobol/halton draws scrambled low-discrepancy points instead,
+reaching the same standard error with far fewer samples (see
+bench_sampling.py).
 
 Examples:
     python probe_fields.py --preset make_tree_operators --samples 2000
+    python probe_fields.py --samples 5000000 --workers 8
+    python probe_fields.py --samples 100000 --sampler sobol
     python probe_fields.py --grid 16 --seed 7
+    python probe_fields.py --symbolic      # fused DAG evaluation + eval counts
 """
 
 from __future__ import annotations
 import argparse
-import random
 import sys
-import math
 
 sys.path.insert(0, ".")
 import rsvp
@@ -30,47 +38,99 @@ PRESETS = {
 }
 
 
-def stats(values: list[float]) -> dict:
-    n = len(values)
-    if n == 0:
+def stats(values) -> dict:
+    """One-pass summary of values (a list, array or rsvp.StreamingStats)."""
+    s = values
+    if not isinstance(s, rsvp.StreamingStats):
+        s = rsvp.StreamingStats(sketch=0)
+        s.update(values)
+    if s.n == 0:
         return {}
-    mean = sum(values) / n
-    var = sum((v - mean) ** 2 for v in values) / n
     return {
-        "min":    round(min(values), 5),
-        "max":    round(max(values), 5),
-        "mean":   round(mean, 5),
-        "std":    round(math.sqrt(var), 5),
-        "n":      n,
+        "min":    round(s.min, 5),
+        "max":    round(s.max, 5),
+        "mean":   round(s.mean, 5),
+        "std":    round(s.std, 5),
+        "n":      s.n,
     }
 
 
-def print_stats(label: str, values: list[float]) -> None:
+def print_stats(label: str, values) -> None:
     s = stats(values)
     print(f"  {label:20s}  min={s['min']:9.5f}  max={s['max']:9.5f}"
           f"  mean={s['mean']:9.5f}  std={s['std']:8.5f}  n={s['n']}")
 
 
+def print_quantiles(label: str, s: rsvp.StreamingStats) -> None:
+    q = s.quantile([0.01, 0.25, 0.5, 0.75, 0.99])
+    print(f"  {label:20s}  q01={q[0]:9.5f}  q25={q[1]:9.5f}  q50={q[2]:9.5f}"
+          f"  q75={q[3]:9.5f}  q99={q[4]:9.5f}")
+
+
+def print_histogram(label: str, s: rsvp.StreamingStats, width: int = 40) -> None:
+    counts, edges = s.histogram()
+    # Regroup the fine bins into 8 rows
+    rows = counts.reshape(8, -1).sum(axis=1) if len(counts) % 8 == 0 else counts
+    step = len(counts) // len(rows)
+    top = max(int(rows.max()), 1)
+    print(f"  {label}:")
+    for i, c in enumerate(rows):
+        lo, hi = edges[i * step], edges[(i + 1) * step]
+        print(f"    [{lo:9.5f}, {hi:9.5f})  {'#' * round(width * int(c) / top):{width}s}  {int(c)}")
+
+
+class Convergence:
+    """progress callback: prints running means each time n quadruples."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.next = 1
+
+    def __call__(self, done: int, summaries: dict) -> None:
+        if done < self.next and done < self.total:
+            return
+        while self.next <= done:
+            self.next *= 4
+        cells = "  ".join(f"{name}={s.mean:9.5f}±{s.stderr:.1e}"
+                          for name, s in summaries.items())
+        print(f"  n={done:<10d}  {cells}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Probe rsvp field statistics")
     parser.add_argument("--preset", default="make_default_rsvp_field",
                         choices=list(PRESETS))
     parser.add_argument("--seed", type=int, default=0)
-    parser.add_argument("--samples", type=int, default=1000,
+    parser.add_argument("--samples", type=int, default=100_000,
                         help="Random sample count")
     parser.add_argument("--grid", type=int, default=0,
                         help="If > 0, also sample a GxGxG grid")
     parser.add_argument("--bounds", type=float, default=1.2,
                         help="Sampling bounds [-B, B] per axis")
+    parser.add_argument("--symbolic", action="store_true",
+                        help="Build fields as a DAG and evaluate phi/closure/div(v) fused")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for random samples (default: one per CPU)")
+    parser.add_argument("--batch", type=int, default=1 << 16,
+                        help="Points per array batch")
+    parser.add_argument("--sampler", choices=("random", "sobol", "halton"), default="random",
+                        help="Random samples: pseudo-random or scrambled low-discrepancy "
+                             "(standard errors then come from 8 independent scramblings)")
+    parser.add_argument("--histogram", action="store_true",
+                        help="Also print value histograms of the random samples")
     args = parser.parse_args()
 
-    rng = random.Random(args.seed)
     B = args.bounds
 
     print(f"[probe] preset={args.preset}  seed={args.seed}  bounds=±{B}")
 
     preset_fn = PRESETS[args.preset]
-    result = preset_fn()
+    if args.symbolic:
+        if args.preset == "make_landscape_operators":
+            parser.error("--symbolic is not supported for make_landscape_operators")
+        result = preset_fn(symbolic=True)
+    else:
+        result = preset_fn()
 
     # Unpack whichever structure the preset returns
     if isinstance(result, tuple):
@@ -80,19 +140,38 @@ def main() -> None:
         v_field  = result.get("v_field") or result.get("direction")
         closure  = result.get("closure")
 
-    # Random samples
-    pts = [(rng.uniform(-B, B), rng.uniform(-B, B), rng.uniform(-B, B))
-           for _ in range(args.samples)]
-
-    phi_vals     = [phi(*p) for p in pts] if phi else []
-    closure_vals = [closure(*p) for p in pts] if closure else []
     div_field    = rsvp.divergence(v_field) if v_field else None
-    div_vals     = [div_field(*p) for p in pts] if div_field else []
 
-    print(f"\n  Random samples (n={args.samples}):")
-    if phi_vals:     print_stats("phi",      phi_vals)
-    if closure_vals: print_stats("closure",  closure_vals)
-    if div_vals:     print_stats("div(v)",   div_vals)
+    if args.symbolic:
+        # One fused function for all three outputs: shared leaves run once
+        fields = (("phi", "closure", "div(v)"), rsvp.compile_fields(phi, closure, div_field))
+
+        report = rsvp.evaluation_report(phi, closure, div_field)
+        print(f"\n  Leaf evaluations per point (unshared -> fused):")
+        for label, (before, after) in report["leaves"].items():
+            print(f"  {label:20s}  {before:4d} -> {after:4d}")
+        print(f"  {'total':20s}  {report['naive']:4d} -> {report['fused']:4d}")
+    else:
+        fields = {name: f for name, f in
+                  (("phi", phi), ("closure", closure), ("div(v)", div_field)) if f}
+
+    # Random samples, streamed in batches
+    print(f"\n  Convergence of the mean (± standard error):")
+    summaries = rsvp.probe_statistics(
+        fields, (-B, -B, -B), (B, B, B), samples=args.samples, batch=args.batch,
+        workers=args.workers, seed=args.seed, progress=Convergence(args.samples),
+        sampler=args.sampler,
+    )
+
+    print(f"\n  Random samples (n={args.samples}, {args.sampler}):")
+    for name, s in summaries.items():
+        print_stats(name, s)
+    for name, s in summaries.items():
+        print_quantiles(name, s)
+    if args.histogram:
+        print()
+        for name, s in summaries.items():
+            print_histogram(name, s)
 
     # Growth path quick probe
     if v_field:
@@ -35,6 +35,10 @@ done
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 mkdir -p "$OUTPUT_DIR"
 
+# Same field cache as rsvp_batch.sh: a rerun skips all field sampling and
+# growth tracing (cached values are bit-identical; RSVP_CACHE_DIR= disables)
+export RSVP_CACHE_DIR="${RSVP_CACHE_DIR-${SCRIPT_DIR}/rsvp_output/.cache}"
+
 BLEND="${OUTPUT_DIR}/${GENERATOR}_seed${SEED}.blend"
 PNG="${OUTPUT_DIR}/${GENERATOR}_seed${SEED}.png"
 GENERATOR_SCRIPT="${SCRIPT_DIR}/generate_${GENERATOR}.py"
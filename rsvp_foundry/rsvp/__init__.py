@@ -4,6 +4,8 @@ rsvp — RSVP field and operator suite for procedural geometry.
 Public API is flat: import what you need directly from rsvp.
 """
 
+__version__ = "0.5.0"
+
 from .vec import (
     Vec3,
     v_add, v_sub, v_mul, v_dot, v_cross,
@@ -19,15 +21,37 @@ from .operators import (
     scalar_gradient, divergence, curl,
     closure_field, capped_field,
 )
-from .sampling import GridSpec, sample_scalar_grid, seed_points_from_field
+from .autodiff import Dual, jacobian, register_derivative
+from .interval import Interval, register_bounds, field_bounds, prune_boxes
+from .graph import Expr, symbolic_field, compile_fields, evaluation_report
+from .baking import BakedField
+from .sampling import (
+    GridSpec, sample_scalar_grid, seed_points_from_field, seed_points_importance,
+    poisson_disk_points,
+)
+from .raster import (
+    FieldRecipe, rasterize_grid, rasterize_height_map, rasterize_scalar_grid,
+)
+from .lod import QuadtreeTerrain
+from .isosurface import dual_contour
+from .cache import FieldCache, canonical_hash, cached, default_cache
+from .qmc import LowDiscrepancy, Sobol, Halton
+from .probe import QuantileSketch, StreamingStats, probe_statistics
 from .terrain import sample_height_map, terrain_field, residue_profile, tower_radius
-from .growth import trace_growth_path, branch_paths
-from .seams import seam_displacement, seam_obstruction_metric
+from .growth import (
+    trace_growth_path, trace_growth_path_adaptive, branch_paths,
+    trace_growth_paths, branch_paths_batched, sample_branch_origins, DirectionalBank,
+)
+from .seams import (
+    seam_displacement, seam_obstruction_metric,
+    Seam, seam_displacement_points, seam_obstruction_points, apply_seams,
+)
 from .presets import (
     make_default_rsvp_field,
     make_tree_operators,
     make_landscape_operators,
     make_seam_operators,
+    preset_spec,
 )
 
 __all__ = [
@@ -38,10 +62,22 @@ __all__ = [
     "add_scalar_fields", "mul_scalar_fields", "add_vector_fields",
     "scalar_gradient", "divergence", "curl",
     "closure_field", "capped_field",
-    "GridSpec", "sample_scalar_grid", "seed_points_from_field",
+    "Dual", "jacobian", "register_derivative",
+    "Interval", "register_bounds", "field_bounds", "prune_boxes",
+    "Expr", "symbolic_field", "compile_fields", "evaluation_report",
+    "BakedField",
+    "GridSpec", "sample_scalar_grid", "seed_points_from_field", "seed_points_importance",
+    "poisson_disk_points",
+    "FieldRecipe", "rasterize_grid", "rasterize_height_map", "rasterize_scalar_grid",
+    "QuadtreeTerrain", "dual_contour",
+    "FieldCache", "canonical_hash", "cached", "default_cache",
+    "LowDiscrepancy", "Sobol", "Halton",
+    "QuantileSketch", "StreamingStats", "probe_statistics",
     "sample_height_map", "terrain_field", "residue_profile", "tower_radius",
-    "trace_growth_path", "branch_paths",
+    "trace_growth_path", "trace_growth_path_adaptive", "branch_paths",
+    "trace_growth_paths", "branch_paths_batched", "sample_branch_origins", "DirectionalBank",
     "seam_displacement", "seam_obstruction_metric",
+    "Seam", "seam_displacement_points", "seam_obstruction_points", "apply_seams",
     "make_default_rsvp_field", "make_tree_operators",
-    "make_landscape_operators", "make_seam_operators",
+    "make_landscape_operators", "make_seam_operators", "preset_spec",
 ]
@@ -0,0 +1,93 @@
+"""
+Optional NumPy support for evaluating fields on arrays.
+
+Primitives and operators work on plain floats with only the stdlib. When
+NumPy is importable the same callables also accept arrays of x, y, z
+(any broadcast-compatible shapes) and return arrays for scalar fields and
+(3, ...) stacks for vector fields. Scalar calls never touch NumPy, so their
+results are unchanged.
+"""
+
+from __future__ import annotations
+import math
+from typing import Callable, Sequence
+
+try:
+    import numpy as np
+except ImportError:   # stdlib-only interpreter: scalar path only
+    np = None
+
+
+def is_array(*values) -> bool:
+    """True if any argument is a NumPy array."""
+    if np is None:
+        return False
+    for v in values:
+        if isinstance(v, np.ndarray):
+            return True
+    return False
+
+
+def is_sparse_grid(*values) -> bool:
+    """
+    True if broadcasting the arguments together makes them larger, as
+    with sparse meshgrid axes. Separable primitives then evaluate their
+    per-axis factors before broadcasting (O(N) transcendentals per axis
+    instead of O(N^3)).
+    """
+    sizes = 0
+    for v in values:
+        sizes += np.size(v)
+    shape = np.broadcast_shapes(*(np.shape(v) for v in values))
+    return sizes < math.prod(shape)
+
+
+def xmath(*values):
+    """The math module to use for these arguments: numpy for arrays, else math."""
+    return np if is_array(*values) else math
+
+
+def stack_vector(a, b, c):
+    """Broadcast three components to one shape and stack them as (3, ...)."""
+    return np.stack(np.broadcast_arrays(a, b, c))
+
+
+def as_vector(vec):
+    """Return vec as a (3, ...) stack if any component is an array, else unchanged."""
+    if is_array(*vec):
+        return stack_vector(vec[0], vec[1], vec[2])
+    return vec
+
+
+def evaluate_grid(
+    field: Callable,
+    axes: Sequence[Sequence[float]],
+    fixed: Sequence[float] = (),
+):
+    """
+    Evaluate field once over the tensor grid of 1-D coordinate axes.
+
+    axes are the coordinates along x (and y, z ...) in argument order;
+    fixed are trailing constant arguments (e.g. z=0.0 for a height map).
+    Axes are passed as sparse broadcastable arrays, so separable terms
+    are computed on the axis vectors only.
+
+    Returns an ndarray of shape (len(axes[0]), len(axes[1]), ...), or None
+    if NumPy is unavailable or the field is not array-aware (raises
+    TypeError / ValueError on arrays) — callers then evaluate per point.
+    """
+    if np is None:
+        return None
+    grids = np.meshgrid(*[np.asarray(a, dtype=float) for a in axes],
+                        indexing="ij", sparse=True)
+    shape = tuple(len(a) for a in axes)
+    try:
+        values = np.asarray(field(*grids, *fixed), dtype=float)
+    except (TypeError, ValueError):
+        return None
+    if values.shape != shape:
+        try:
+            values = np.broadcast_to(values, shape)
+        except ValueError:
+            return None
+    return values
@@ -0,0 +1,354 @@
+"""
+Content-addressed on-disk cache for sampled fields and generated geometry.
+
+Entries are keyed by canonical_hash() of whatever describes the work —
+field specs (frozen dataclasses, FieldRecipes, FieldExpr trees), grids,
+bounds, parameters — together with the rsvp package version. Values are
+arrays, height maps and growth paths (nested lists of points), stored as
+compressed .npz files; they come back exactly as stored, ints as ints and
+tuples as tuples.
+
+Writes go to a temporary file that is renamed into place, so parallel
+jobs sharing a cache directory never see partial entries. The cache is
+bounded in bytes and evicts least recently used entries (hits refresh a
+file's mtime). Hit/miss counts are kept per FieldCache.
+
+Generators use cached(), which consults the directory named by
+RSVP_CACHE_DIR and simply computes when it is unset.
+"""
+
+from __future__ import annotations
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from typing import Callable
+
+from .arrays import np
+
+_STALE_TMP = 3600.0     # seconds before an orphaned temp file is removed
+_FORMAT = 2             # value layout version, part of every key
+_PRESETS = __name__.rsplit(".", 1)[0] + ".presets"
+
+
+# ---------------------------------------------------------------------------
+# Canonical hashing
+# ---------------------------------------------------------------------------
+
+def _canonical(obj):
+    """JSON-able form of obj that is equal exactly when the content is."""
+    if obj is None or isinstance(obj, (bool, str)):
+        return obj
+    if np is not None and isinstance(obj, np.ndarray):
+        data = np.ascontiguousarray(obj)
+        return {"nd": [data.dtype.str, list(data.shape),
+                       hashlib.sha256(data.tobytes()).hexdigest()]}
+    if np is not None and isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, int):
+        return obj
+    if isinstance(obj, float):
+        return {"f": obj.hex()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, dict):
+        return {"dict": sorted([str(k), _canonical(v)] for k, v in obj.items())}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"type": type(obj).__name__,
+                "fields": [[f.name, _canonical(getattr(obj, f.name))]
+                           for f in dataclasses.fields(obj)]}
+    qualname = getattr(obj, "__qualname__", None)
+    if callable(obj) and qualname and "<locals>" not in qualname and "<lambda>" not in qualname:
+        if obj.__module__ == _PRESETS:
+            # Preset builders hash by their parameters, not just their name
+            from .presets import preset_spec
+            try:
+                return {"preset": _canonical(preset_spec(obj))}
+            except ValueError:
+                pass
+        return {"fn": f"{obj.__module__}.{qualname}"}
+    raise TypeError(
+        f"cannot hash {type(obj).__name__} by content; describe it with "
+        f"dataclass specs or a FieldRecipe"
+    )
+
+
+def canonical_hash(*parts) -> str:
+    """
+    SHA-256 hex digest of parts by content. Floats hash exactly, tuples and
+    lists alike, dict order is ignored, dataclasses by type name and
+    fields, arrays by dtype, shape and bytes, preset builders by
+    preset_spec, other module-level functions by qualified name. Closures
+    and lambdas raise TypeError.
+    """
+    text = json.dumps(_canonical(list(parts)), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Value encoding: nested lists of arrays / points <-> flat arrays + layout
+# ---------------------------------------------------------------------------
+
+def _number_dtype(v):
+    """int64 / float64 for a number, None for anything else (bools too)."""
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, (int, np.integer)):
+        return np.int64
+    if isinstance(v, (float, np.floating)):
+        return np.float64
+    return None
+
+
+def _common_dtype(values):
+    """The one number dtype of all values, or None."""
+    kinds = {_number_dtype(v) for v in values}
+    return kinds.pop() if len(kinds) == 1 else None
+
+
+def _seq(value) -> str:
+    return "tuple" if isinstance(value, tuple) else "list"
+
+
+def _encode(value, arrays: list):
+    """Layout node for value, appending its arrays."""
+    if value is None or isinstance(value, (bool, str)):
+        return {"raw": value}
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {"nd": len(arrays) - 1}
+    if isinstance(value, (list, tuple)):
+        # Runs of numbers (and of equal-length number rows) become one array
+        dtype = _common_dtype(value) if value else None
+        if dtype is not None:
+            arrays.append(np.asarray(value, dtype=dtype))
+            return {"vec": len(arrays) - 1, "seq": _seq(value)}
+        if (value and len({type(v) for v in value}) == 1 and isinstance(value[0], (list, tuple))
+                and value[0] and len({len(v) for v in value}) == 1):
+            dtype = _common_dtype([c for v in value for c in v])
+            if dtype is not None:
+                arrays.append(np.asarray(value, dtype=dtype))
+                return {"rows": len(arrays) - 1, "seq": _seq(value), "row": _seq(value[0])}
+        items = [_encode(v, arrays) for v in value]
+        return {"tuple": items} if isinstance(value, tuple) else items
+    dtype = _number_dtype(value)
+    if dtype is not None:
+        arrays.append(np.asarray(value, dtype=dtype))
+        return {"num": len(arrays) - 1}
+    raise TypeError(f"cannot cache values of type {type(value).__name__}")
+
+
+def _decode(layout, arrays):
+    if isinstance(layout, list):
+        return [_decode(v, arrays) for v in layout]
+    if "raw" in layout:
+        return layout["raw"]
+    if "tuple" in layout:
+        return tuple(_decode(v, arrays) for v in layout["tuple"])
+    if "nd" in layout:
+        return arrays[f"a{layout['nd']}"]
+    if "num" in layout:
+        return arrays[f"a{layout['num']}"].item()
+    seq = tuple if layout["seq"] == "tuple" else list
+    if "vec" in layout:
+        return seq(arrays[f"a{layout['vec']}"].tolist())
+    row = tuple if layout["row"] == "tuple" else list
+    return seq(row(r) for r in arrays[f"a{layout['rows']}"].tolist())
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class FieldCache:
+    """
+    Directory of compressed entries, at most max_bytes in total.
+
+    Args:
+        root      : cache directory (created on demand)
+        max_bytes : size bound; least recently used entries are evicted
+        version   : mixed into every key (default: rsvp.__version__)
+
+    Requires NumPy.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 2 << 30, version: str | None = None):
+        if np is None:
+            raise RuntimeError("FieldCache requires NumPy")
+        if version is None:
+            from . import __version__ as version
+        self.root = os.path.abspath(root)
+        self.max_bytes = int(max_bytes)
+        self.version = version
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0,
+                      "bytes_read": 0, "bytes_written": 0}
+
+    def key(self, *parts) -> str:
+        return canonical_hash(self.version, _FORMAT, *parts)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".npz")
+
+    # Entries ---------------------------------------------------------------
+
+    def get(self, key: str):
+        """Stored value for key, or None (counted as a miss)."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                layout = json.loads(str(data["layout"]))
+                value = _decode(layout, {k: data[k] for k in data.files})
+            size = os.path.getsize(path)
+            os.utime(path)   # LRU: a hit makes the entry recent
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # Unreadable entry (e.g. from an older layout): drop and recompute
+            self._remove(path)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["bytes_read"] += size
+        return value
+
+    def put(self, key: str, value) -> None:
+        """Store value atomically, then evict down to max_bytes."""
+        arrays: list = []
+        layout = _encode(value, arrays)
+        path = self._path(key)
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=shard)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, layout=np.array(json.dumps(layout)),
+                                    **{f"a{i}": a for i, a in enumerate(arrays)})
+            os.replace(tmp, path)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self.stats["writes"] += 1
+        self.stats["bytes_written"] += os.path.getsize(path)
+        self.evict()
+
+    def get_or_compute(self, parts, compute: Callable):
+        """Value for the key of parts; computed and stored on a miss."""
+        key = self.key(*parts)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    # Housekeeping ----------------------------------------------------------
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every entry; clears stale temp files."""
+        out = []
+        now = time.time()
+        try:
+            shards = [e.path for e in os.scandir(self.root) if e.is_dir()]
+        except FileNotFoundError:
+            return out
+        for shard in shards:
+            try:
+                files = list(os.scandir(shard))
+            except FileNotFoundError:
+                continue
+            for e in files:
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                if e.name.startswith(".tmp-"):
+                    if now - st.st_mtime > _STALE_TMP:
+                        self._remove(e.path)
+                    continue
+                out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until within max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        self.stats["evictions"] += removed
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def report(self) -> str:
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        rate = s["hits"] / lookups if lookups else 0.0
+        return (f"cache {self.root}: {s['hits']}/{lookups} hits ({rate:.0%}), "
+                f"{s['writes']} writes, {s['evictions']} evicted")
+
+
+_DEFAULT: dict = {}
+
+
+def default_cache() -> FieldCache | None:
+    """
+    The FieldCache at $RSVP_CACHE_DIR (bounded by $RSVP_CACHE_MAX_MB,
+    default 2048), or None if the variable is unset or empty.
+    """
+    root = os.environ.get("RSVP_CACHE_DIR", "")
+    if not root or np is None:
+        return None
+    if root not in _DEFAULT:
+        max_mb = float(os.environ.get("RSVP_CACHE_MAX_MB", "2048"))
+        _DEFAULT[root] = FieldCache(root, max_bytes=int(max_mb * (1 << 20)))
+    return _DEFAULT[root]
+
+
+def cached(parts, compute: Callable, cache: FieldCache | None = None, rng=None):
+    """
+    compute(), memoised on disk under the content hash of parts.
+
+    parts must describe everything compute depends on (field specs,
+    grid, parameters). If compute draws from rng (a random.Random), its
+    state joins the key and a hit leaves rng where compute would have,
+    gauss state included.
+    Without a cache (none given and RSVP_CACHE_DIR unset) this is just
+    compute().
+    """
+    cache = cache or default_cache()
+    if cache is None:
+        return compute()
+    if rng is None:
+        return cache.get_or_compute(parts, compute)
+
+    version, state, gauss = rng.getstate()
+
+    def run():
+        value = compute()
+        _, after, gauss_after = rng.getstate()
+        return [value, after, gauss_after]
+
+    value, after, gauss_after = cache.get_or_compute(
+        (*parts, "rng", version, state, gauss), run)
+    rng.setstate((version, after, gauss_after))
+    return value
@@ -1,11 +1,21 @@
-"""Field primitives. Each produces a callable ScalarFn or VectorFn."""
+"""
+Field primitives. Each produces a callable ScalarFn or VectorFn.
+
+Callables take floats, or NumPy arrays of x, y, z (see rsvp.arrays);
+vector fields return a Vec3 tuple for floats and a (3, ...) stack for arrays.
+Given Duals (see rsvp.autodiff) they return Duals, using the analytic
+derivatives registered below each primitive; given Intervals (see
+rsvp.interval) they return bounds, using the registered range rules.
+"""
 
 from __future__ import annotations
-import math
 from dataclasses import dataclass
 from typing import Callable
 
 from .vec import Vec3, v_add, v_mul, v_cross, v_normalize, sigmoid
+from .arrays import is_array, is_sparse_grid, xmath, np, stack_vector
+from .autodiff import is_dual, differentiate, register_derivative
+from .interval import Interval, is_interval, as_interval, bound, register_bounds
 
 ScalarFn = Callable[[float, float, float], float]
 VectorFn = Callable[[float, float, float], Vec3]
@@ -23,12 +33,39 @@ class Basin:
         r2 = max(self.radius * self.radius, 1e-9)
 
         def f(x: float, y: float, z: float) -> float:
+            if is_dual(x, y, z):
+                return differentiate(self, x, y, z)
+            if is_interval(x, y, z):
+                return bound(self, x, y, z)[0]
             dx, dy, dz = x - cx, y - cy, z - cz
-            return self.amplitude * math.exp(-(dx*dx + dy*dy + dz*dz) / r2)
+            if is_array(x, y, z) and is_sparse_grid(x, y, z):
+                # Separable: one exp per axis sample, then an outer product
+                return (self.amplitude * np.exp(-dx*dx / r2)) * np.exp(-dy*dy / r2) * np.exp(-dz*dz / r2)
+            return self.amplitude * xmath(x, y, z).exp(-(dx*dx + dy*dy + dz*dz) / r2)
 
         return f
 
 
+@register_derivative(Basin)
+def _basin_derivative(b: Basin, x, y, z):
+    cx, cy, cz = b.center
+    r2 = max(b.radius * b.radius, 1e-9)
+    dx, dy, dz = x - cx, y - cy, z - cz
+    value = b.amplitude * xmath(x, y, z).exp(-(dx*dx + dy*dy + dz*dz) / r2)
+    k = -2.0 * value / r2
+    return value, (k * dx, k * dy, k * dz)
+
+
+@register_bounds(Basin)
+def _basin_bounds(b: Basin, x, y, z):
+    cx, cy, cz = b.center
+    r2 = max(b.radius * b.radius, 1e-9)
+    dx, dy, dz = as_interval(x) - cx, as_interval(y) - cy, as_interval(z) - cz
+    value = ((dx.square() + dy.square() + dz.square()) / -r2).exp() * b.amplitude
+    k = value * (-2.0 / r2)
+    return value, (k * dx, k * dy, k * dz)
+
+
 @dataclass(frozen=True)
 class DirectionalBias:
     """Uniform flow with optional curl around the flow axis."""
@@ -42,13 +79,71 @@ class DirectionalBias:
         ox, oy, oz = self.origin
 
         def f(x: float, y: float, z: float) -> Vec3:
+            if is_dual(x, y, z):
+                return differentiate(self, x, y, z)
+            if is_interval(x, y, z):
+                return bound(self, x, y, z)[0]
             radial = (x - ox, y - oy, z - oz)
             twist = v_cross(base, radial)
+            if is_array(x, y, z):
+                # v_normalize per element: zero where |twist| < eps
+                length = np.sqrt(twist[0]*twist[0] + twist[1]*twist[1] + twist[2]*twist[2])
+                inv = np.where(length < 1e-9, 0.0, 1.0 / np.maximum(length, 1e-9))
+                return stack_vector(*(b * self.strength + t * inv * self.curl
+                                      for b, t in zip(base, twist)))
             return v_add(v_mul(base, self.strength), v_mul(v_normalize(twist), self.curl))
 
         return f
 
 
+@register_derivative(DirectionalBias)
+def _directional_derivative(d: DirectionalBias, x, y, z):
+    b = v_normalize(d.direction)
+    ox, oy, oz = d.origin
+    twist = v_cross(b, (x - ox, y - oy, z - oz))
+
+    m = xmath(x, y, z)
+    length = m.sqrt(twist[0]*twist[0] + twist[1]*twist[1] + twist[2]*twist[2])
+    if is_array(length):
+        inv = np.where(length < 1e-9, 0.0, 1.0 / np.maximum(length, 1e-9))
+    else:
+        inv = 0.0 if length < 1e-9 else 1.0 / length
+    n = (twist[0] * inv, twist[1] * inv, twist[2] * inv)
+    s, c = d.strength, d.curl
+    value = (b[0] * s + n[0] * c, b[1] * s + n[1] * c, b[2] * s + n[2] * c)
+
+    # twist = B @ radial with B the cross-product matrix of b, so
+    # d(twist/|twist|) = (I - n nᵀ) B / |twist| = (B - n (nᵀB)) / |twist|
+    B = ((0.0, -b[2], b[1]), (b[2], 0.0, -b[0]), (-b[1], b[0], 0.0))
+    nB = v_cross(n, b)      # nᵀB, since (nᵀB)_j = (n × b)_j
+    k = c * inv
+    jac = tuple(
+        (k * (B[i][0] - n[i] * nB[0]), k * (B[i][1] - n[i] * nB[1]), k * (B[i][2] - n[i] * nB[2]))
+        for i in range(3)
+    )
+    return value, jac
+
+
+@register_bounds(DirectionalBias)
+def _directional_bounds(d: DirectionalBias, x, y, z):
+    b = v_normalize(d.direction)
+    ox, oy, oz = d.origin
+    twist = v_cross(b, (as_interval(x) - ox, as_interval(y) - oy, as_interval(z) - oz))
+    length = (twist[0].square() + twist[1].square() + twist[2].square()).sqrt()
+    # 1/|twist|, and 0 where the field zeroes the twist near the axis;
+    # unbounded on boxes touching the axis
+    inv = length.reciprocal().hull(0.0, where=length.lo < 1e-9)
+    n = tuple((t * inv).clip(-1.0, 1.0) for t in twist)
+    s, c = d.strength, d.curl
+    value = tuple(n[i] * c + b[i] * s for i in range(3))
+
+    B = ((0.0, -b[2], b[1]), (b[2], 0.0, -b[0]), (-b[1], b[0], 0.0))
+    nB = v_cross(n, b)
+    k = inv * c
+    jac = tuple(tuple(k * (B[i][j] - n[i] * nB[j]) for j in range(3)) for i in range(3))
+    return value, jac
+
+
 @dataclass(frozen=True)
 class HarmonicField:
     """Separable sinusoidal scalar field."""
@@ -63,15 +158,47 @@ class HarmonicField:
         px, py, pz = self.phase
 
         def f(x: float, y: float, z: float) -> float:
+            if is_dual(x, y, z):
+                return differentiate(self, x, y, z)
+            if is_interval(x, y, z):
+                return bound(self, x, y, z)[0]
+            if is_array(x, y, z):
+                # Scale each 1-D term before the outer sum (cheap on sparse axes)
+                a = self.amplitude
+                return (a * wx) * np.sin(fx * x + px) + (a * wy) * np.sin(fy * y + py) \
+                    + (a * wz) * np.sin(fz * z + pz)
+            m = xmath(x, y, z)
             return self.amplitude * (
-                wx * math.sin(fx * x + px)
-                + wy * math.sin(fy * y + py)
-                + wz * math.sin(fz * z + pz)
+                wx * m.sin(fx * x + px)
+                + wy * m.sin(fy * y + py)
+                + wz * m.sin(fz * z + pz)
             )
 
         return f
 
 
+@register_derivative(HarmonicField)
+def _harmonic_derivative(h: HarmonicField, x, y, z):
+    m = xmath(x, y, z)
+    a = h.amplitude
+    (wx, wy, wz), (fx, fy, fz), (px, py, pz) = h.weights, h.frequencies, h.phase
+    value = a * (wx * m.sin(fx * x + px) + wy * m.sin(fy * y + py) + wz * m.sin(fz * z + pz))
+    return value, (
+        a * wx * fx * m.cos(fx * x + px),
+        a * wy * fy * m.cos(fy * y + py),
+        a * wz * fz * m.cos(fz * z + pz),
+    )
+
+
+@register_bounds(HarmonicField)
+def _harmonic_bounds(h: HarmonicField, x, y, z):
+    a = h.amplitude
+    args = [as_interval(c) * f + p for c, f, p in zip((x, y, z), h.frequencies, h.phase)]
+    value = sum(t.sin() * w for t, w in zip(args, h.weights)) * a
+    return value, tuple(t.cos() * (a * w * f)
+                        for t, w, f in zip(args, h.weights, h.frequencies))
+
+
 @dataclass(frozen=True)
 class EntropyCap:
     """Soft or hard amplitude limit modelling entropy ceiling."""
@@ -80,9 +207,49 @@ class EntropyCap:
     mode: str = "sigmoid"   # "sigmoid" | "hard"
 
     def apply(self, value: float) -> float:
+        if is_dual(value):
+            return differentiate(self, value)
+        if is_interval(value):
+            return bound(self, value)[0]
+        if is_array(value):
+            if self.mode == "hard":
+                return np.clip(value, -self.threshold, self.threshold)
+            if self.threshold == 0:
+                return np.zeros_like(value, dtype=float)
+            scaled = value / self.threshold
+            return self.threshold * (2.0 / (1.0 + np.exp(-self.softness * scaled)) - 1.0)
         if self.mode == "hard":
             return max(-self.threshold, min(self.threshold, value))
         if self.threshold == 0:
             return 0.0
         scaled = value / self.threshold
         return self.threshold * (2.0 * sigmoid(scaled, self.softness) - 1.0)
+
+
+@register_derivative(EntropyCap)
+def _cap_derivative(cap: EntropyCap, value):
+    out = cap.apply(value)
+    if cap.mode == "hard":
+        inside = abs(value) < cap.threshold
+        return out, (np.where(inside, 1.0, 0.0) if is_array(inside) else float(inside),)
+    if cap.threshold == 0:
+        return out, (0.0 * value,)
+    # out = t (2 s - 1), s = sigmoid(k v / t)  =>  d out/dv = 2 k s (1 - s)
+    s = (out / cap.threshold + 1.0) / 2.0
+    return out, (2.0 * cap.softness * s * (1.0 - s),)
+
+
+@register_bounds(EntropyCap)
+def _cap_bounds(cap: EntropyCap, value):
+    v = as_interval(value)
+    t = cap.threshold
+    if cap.mode == "hard":
+        a = abs(v)
+        # Slope 1 strictly inside the threshold, 0 outside
+        return v.clip(-t, t), (Interval(1.0 * (a.hi < t), 1.0 * (a.lo < t)),)
+    if t == 0:
+        return v * 0.0, (v * 0.0,)
+    # Monotone in v, so bounding s = sigmoid(k v / t) once is tight
+    s = 1.0 / ((v * (-cap.softness / t)).exp() + 1.0)
+    # d out/dv = 2 k s (1 - s) = 2 k (1/4 - (s - 1/2)^2)
+    return (s * 2.0 - 1.0) * t, ((0.25 - (s - 0.5).square()) * (2.0 * cap.softness),)
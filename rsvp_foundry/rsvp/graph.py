@@ -0,0 +1,298 @@
+"""
+Symbolic field graphs with common-subexpression elimination.
+
+symbolic_field() lifts a primitive into an Expr leaf. The composition and
+differential operators return Exprs whenever any input is one, building a
+hash-consed DAG: structurally identical subfields are the same node.
+
+compile_fields() lowers one or more roots into a single generated Python
+function. Differential operators are exact, as in the closure operators:
+the subgraph under grad/div/curl is evaluated once on dual numbers (each
+leaf through rsvp.autodiff.jacobian), and plain uses of the same nodes
+read their value from those Duals, so every leaf is evaluated once per
+point however many operators share it. The function accepts floats or
+NumPy arrays, like the primitives.
+"""
+
+from __future__ import annotations
+import weakref
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+
+from .fields import Basin, DirectionalBias, HarmonicField
+from .arrays import as_vector
+from .autodiff import Dual, jacobian, value_of, partials_of
+
+# Differential operators; params[0] is the central-difference step for
+# leaves that cannot take Duals
+_DIFF = ("grad", "div", "curl")
+
+# Hash-consing table: (op, kind, params, child ids) -> live node
+_TABLE: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+@dataclass(frozen=True, eq=False)
+class Expr:
+    """One node of a field DAG. Callable like the field it describes."""
+    op: str
+    kind: str                  # "scalar" | "vector"
+    args: tuple[Expr, ...] = ()
+    params: tuple = ()
+
+    @cached_property
+    def compiled(self) -> Callable:
+        fn = compile_fields(self)
+        return lambda x, y, z: fn(x, y, z)[0]
+
+    def __call__(self, x, y, z):
+        return self.compiled(x, y, z)
+
+    def __repr__(self) -> str:
+        if self.op == "leaf":
+            return _leaf_label(self.params[0])
+        inner = ", ".join(repr(a) for a in self.args)
+        return f"{self.op}({inner})"
+
+
+def node(op: str, kind: str, args=(), params=()) -> Expr:
+    """Return the unique Expr for this op, children and params."""
+    args = tuple(args)
+    params = tuple(params)
+    key = (op, kind, params, tuple(id(a) for a in args))
+    found = _TABLE.get(key)
+    if found is None:
+        found = Expr(op, kind, args, params)
+        _TABLE[key] = found
+    return found
+
+
+def is_symbolic(*fields) -> bool:
+    return any(isinstance(f, Expr) for f in fields)
+
+
+def symbolic_field(source, kind: str | None = None) -> Expr:
+    """
+    Lift a primitive (Basin, HarmonicField, DirectionalBias) or a plain
+    ScalarFn / VectorFn callable into a leaf Expr. kind is required for
+    plain callables.
+    """
+    if isinstance(source, Expr):
+        return source
+    if isinstance(source, (Basin, HarmonicField)):
+        return node("leaf", "scalar", params=(source,))
+    if isinstance(source, DirectionalBias):
+        return node("leaf", "vector", params=(source,))
+    if kind not in ("scalar", "vector"):
+        raise ValueError("kind='scalar' or 'vector' is required for plain callables")
+    return node("leaf", kind, params=(source,))
+
+
+def _leaf_fn(source) -> Callable:
+    if isinstance(source, (Basin, HarmonicField)):
+        return source.scalar()
+    if isinstance(source, DirectionalBias):
+        return source.vector()
+    return source
+
+
+def _leaf_label(source) -> str:
+    if isinstance(source, (Basin, HarmonicField, DirectionalBias)):
+        return type(source).__name__
+    return getattr(source, "__name__", "fn")
+
+
+# ---------------------------------------------------------------------------
+# Naive cost model: leaf calls per point without sharing
+# ---------------------------------------------------------------------------
+
+def _naive_counts(expr: Expr, out: dict) -> None:
+    """Every occurrence of a leaf is one call (an operator's Jacobian included)."""
+    if expr.op == "leaf":
+        out[expr] = out.get(expr, 0) + 1
+        return
+    for a in expr.args:
+        _naive_counts(a, out)
+
+
+def _lift(found):
+    """jacobian() output -> Dual, or a tuple of Duals for a vector field."""
+    value, jac = found
+    if isinstance(value, tuple):
+        return tuple(Dual(v, row) for v, row in zip(value, jac))
+    return Dual(value, jac)
+
+
+def _value(t):
+    if isinstance(t, tuple):
+        return tuple(value_of(c) for c in t)
+    return value_of(t)
+
+
+# ---------------------------------------------------------------------------
+# Compiler
+# ---------------------------------------------------------------------------
+
+class _Lowering:
+    """
+    Emit straight-line code, one assignment per distinct (node, mode): mode
+    None is a plain value, a float eps a Dual (value and Jacobian, with eps
+    as the central-difference step for leaves that cannot take Duals).
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.env: dict = {"_as_vector": as_vector, "_lift": _lift, "_value": _value,
+                          "_partials": partials_of}
+        self.memo: dict = {}
+        self.names: dict = {}
+        self.dual: dict = {}
+        self.marked: set = set()
+        self.leaf_calls: dict = {}
+
+    def const(self, value) -> str:
+        key = id(value)
+        if key not in self.names:
+            name = f"_k{len(self.names)}"
+            self.names[key] = name
+            self.env[name] = value
+        return self.names[key]
+
+    def leaf(self, source) -> str:
+        key = ("leaf", source)
+        if key not in self.names:
+            name = f"_f{len(self.names)}"
+            self.names[key] = name
+            self.env[name] = _leaf_fn(source)
+        return self.names[key]
+
+    def mark(self, expr: Expr, eps: float | None = None) -> None:
+        """Record which nodes are needed as Duals, before emitting."""
+        key = (id(expr), eps)
+        if key in self.marked:
+            return
+        self.marked.add(key)
+        if eps is not None:
+            self.dual.setdefault(id(expr), eps)
+            if expr.op in _DIFF:
+                return      # differentiated again as a whole, see emit()
+        if expr.op in _DIFF:
+            eps = expr.params[0]
+        for a in expr.args:
+            self.mark(a, eps)
+
+    def emit(self, expr: Expr, eps: float | None = None) -> str:
+        key = (id(expr), eps)
+        if key in self.memo:
+            return self.memo[key]
+
+        op, a = expr.op, expr.args
+        if eps is None and id(expr) in self.dual:
+            # Needed as a Dual anyway: read the value from it
+            code = f"_value({self.emit(expr, self.dual[id(expr)])})"
+        elif op in ("add", "mul", "vadd") and len(a) == 1:
+            self.memo[key] = self.emit(a[0], eps)
+            return self.memo[key]
+        elif op == "leaf":
+            if eps is None:
+                code = f"{self.leaf(expr.params[0])}(x, y, z)"
+            else:
+                jac = self.const(jacobian(_leaf_fn(expr.params[0]), eps))
+                code = f"_lift({jac}(x, y, z))"
+            self.leaf_calls[expr] = self.leaf_calls.get(expr, 0) + 1
+        elif op in ("add", "mul"):
+            sym = " + " if op == "add" else " * "
+            code = sym.join(self.emit(c, eps) for c in a)
+        elif op == "vadd":
+            vs = [self.emit(c, eps) for c in a]
+            code = "(" + ", ".join(
+                " + ".join(f"{v}[{i}]" for v in vs) for i in range(3)) + ",)"
+        elif op == "scale":
+            # float(): a NumPy scalar's repr (np.float64(...)) is not valid here
+            code = f"{float(expr.params[0])!r} * {self.emit(a[0], eps)}"
+        elif op == "dot":
+            u, v = self.emit(a[0], eps), self.emit(a[1], eps)
+            code = " + ".join(f"{u}[{i}] * {v}[{i}]" for i in range(3))
+        elif op == "cap":
+            code = f"{self.const(expr.params[0])}.apply({self.emit(a[0], eps)})"
+        elif op in _DIFF and eps is not None:
+            # Second derivatives: the operator's own fused function through
+            # jacobian(), which nests Duals (or falls back to differences)
+            jac = self.const(jacobian(expr.compiled, eps))
+            code = f"_lift({jac}(x, y, z))"
+            for leaf, n in _lower((expr,)).leaf_calls.items():
+                self.leaf_calls[leaf] = self.leaf_calls.get(leaf, 0) + n
+        elif op in _DIFF:
+            # J[i][j] = d component i / d axis j, from one Dual evaluation
+            c = self.emit(a[0], expr.params[0])
+
+            def d(axis, comp):
+                return f"_partials({c}[{comp}])[{axis}]"
+
+            if op == "grad":
+                code = f"_partials({c})"
+            elif op == "div":
+                code = f"{d(0, 0)} + {d(1, 1)} + {d(2, 2)}"
+            else:
+                code = (f"({d(1, 2)} - {d(2, 1)}, {d(2, 0)} - {d(0, 2)}, "
+                        f"{d(0, 1)} - {d(1, 0)})")
+        else:
+            raise ValueError(f"unknown field op {op!r}")
+
+        name = f"t{len(self.memo)}"
+        self.lines.append(f"{name} = {code}")
+        self.memo[key] = name
+        return name
+
+
+def _lower(roots: tuple[Expr, ...]) -> _Lowering:
+    low = _Lowering()
+    for r in roots:
+        low.mark(r)
+    outs = []
+    for r in roots:
+        v = low.emit(r)
+        outs.append(f"_as_vector({v})" if r.kind == "vector" else v)
+    low.lines.append(f"return ({', '.join(outs)},)")
+    return low
+
+
+def compile_fields(*roots: Expr) -> Callable:
+    """
+    Fuse one or more field Exprs into f(x, y, z) -> tuple of values.
+
+    Shared subfields are evaluated once for the whole tuple, including
+    those differentiated by grad/div/curl (exactly, as in rsvp.operators).
+    """
+    roots = tuple(symbolic_field(r) for r in roots)
+    low = _lower(roots)
+    src = "def _fused(x, y, z):\n" + "".join(f"    {ln}\n" for ln in low.lines)
+    exec(compile(src, "<rsvp.graph>", "exec"), low.env)
+    fn = low.env["_fused"]
+    fn.source = src
+    return fn
+
+
+def evaluation_report(*roots: Expr) -> dict:
+    """
+    Leaf evaluations per point: unshared vs the fused function.
+
+    Returns {"naive": int, "fused": int, "leaves": {label: (naive, fused)}}.
+    Naive counts each root evaluated separately and every occurrence of a
+    subfield recomputed; a differentiated leaf counts as one (Dual) call.
+    """
+    roots = tuple(symbolic_field(r) for r in roots)
+    naive: dict = {}
+    for r in roots:
+        _naive_counts(r, naive)
+    fused = _lower(roots).leaf_calls
+
+    leaves: dict = {}
+    for i, leaf in enumerate(naive):
+        label = f"{_leaf_label(leaf.params[0])}#{i}"
+        leaves[label] = (naive[leaf], fused.get(leaf, 0))
+    return {
+        "naive": sum(naive.values()),
+        "fused": sum(fused.values()),
+        "leaves": leaves,
+    }
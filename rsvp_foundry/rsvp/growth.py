@@ -3,15 +3,21 @@ Growth trajectory operators.
 
 trace_growth_path and branch_paths produce lists of Vec3 points suitable
 for conversion to Blender curves or for driving particle systems.
+trace_growth_path_adaptive is an error-controlled RK45 alternative to the
+fixed-step Euler tracer.
+trace_growth_paths and branch_paths_batched do the same for many paths at
+once, advancing them in lockstep as (K, 3) arrays.
 """
 
 from __future__ import annotations
+import math
 import random
 from typing import Sequence
 
-from .vec import Vec3, v_add, v_mul, v_cross, v_length, v_normalize
-from .fields import ScalarFn, VectorFn
+from .vec import Vec3, v_add, v_mul, v_dot, v_cross, v_length, v_normalize
+from .fields import ScalarFn, VectorFn, DirectionalBias
 from .operators import scalar_gradient
+from .arrays import np, stack_vector
 
 
 def trace_growth_path(
@@ -44,6 +50,148 @@ def trace_growth_path(
     return points
 
 
+# Dormand-Prince 5(4) tableau: stage weights, 5th-order row, error row
+_DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+_DP_E = (
+    35/384 - 5179/57600, 0.0, 500/1113 - 7571/16695, 125/192 - 393/640,
+    -2187/6784 + 92097/339200, 11/84 - 187/2100, -1/40,
+)
+
+
+def _combine(p: Vec3, h: float, ks: Sequence[Vec3], coeffs: Sequence[float]) -> Vec3:
+    x, y, z = p
+    for c, k in zip(coeffs, ks):
+        if c:
+            x += h * c * k[0]
+            y += h * c * k[1]
+            z += h * c * k[2]
+    return (x, y, z)
+
+
+def _hermite(p0: Vec3, d0: Vec3, p1: Vec3, d1: Vec3, h: float, t: float) -> Vec3:
+    """Cubic Hermite point at fraction t of a step of length h."""
+    t2, t3 = t * t, t * t * t
+    a, b = 2*t3 - 3*t2 + 1, (t3 - 2*t2 + t) * h
+    c, d = -2*t3 + 3*t2, (t3 - t2) * h
+    return tuple(a*p0[i] + b*d0[i] + c*p1[i] + d*d1[i] for i in range(3))
+
+
+def trace_growth_path_adaptive(
+    start: Vec3,
+    direction_field: VectorFn,
+    scalar_field: ScalarFn | None = None,
+    step_size: float = 0.05,
+    steps: int = 100,
+    attraction: float = 0.25,
+    tolerance: float = 1e-4,
+    max_turn: float = 0.3,
+    min_step: float | None = None,
+    max_step: float | None = None,
+    resample: bool = True,
+    stats: dict | None = None,
+) -> list[Vec3]:
+    """
+    Adaptive RK45 (Dormand-Prince) version of trace_growth_path.
+
+    Integrates the same unit direction over the same arc length
+    (step_size * steps), but picks each step so the local position error
+    stays under `tolerance` and the heading turns by at most `max_turn`
+    radians; smooth stretches take long steps, high-curl regions short ones.
+
+    With resample=True the curve is Hermite-interpolated at arc-length
+    spacing step_size while integrating (steps + 1 points, drop-in for
+    trace_growth_path); otherwise the accepted step endpoints are returned.
+    Only the current step is held besides the output; min_step (default
+    step_size / 10) bounds the number of accepted steps and max_step
+    (default 16 * step_size) the span of one Hermite segment.
+
+    If stats is a dict it receives the direction evaluations used, the
+    fixed-step Euler count for the same length (steps), the difference
+    (saved), and accepted / rejected step counts.
+    """
+    grad = scalar_gradient(scalar_field) if scalar_field is not None else None
+    evaluations = 0
+
+    def rhs(p: Vec3) -> Vec3:
+        nonlocal evaluations
+        evaluations += 1
+        direction = direction_field(*p)
+        if grad is not None:
+            direction = v_add(direction, v_mul(grad(*p), attraction))
+        return v_normalize(direction)
+
+    length = step_size * steps
+    h_min = min_step if min_step is not None else step_size * 0.1
+    h_max = max_step if max_step is not None else max(step_size * 16, h_min)
+
+    pos, s = start, 0.0
+    k1 = rhs(pos)
+    h = min(max(step_size, h_min), h_max)
+    points: list[Vec3] = [start]
+    next_s = step_size
+    accepted = rejected = 0
+    retry = False
+
+    while s < length - 1e-12:
+        h = min(h, length - s)
+        ks = [k1]
+        for row in _DP_A[1:]:
+            ks.append(rhs(_combine(pos, h, ks, row)))
+        new = _combine(pos, h, ks, _DP_A[6])
+        k7 = rhs(new)
+        ks.append(k7)
+
+        err = v_length(_combine((0.0, 0.0, 0.0), h, ks, _DP_E))
+        turn = math.acos(max(-1.0, min(1.0, v_dot(k1, k7))))
+        if v_length(k1) == 0.0 or v_length(k7) == 0.0:
+            turn = 0.0
+
+        # Step factor from the error (5th-order) and heading-change limits
+        factor = 2.0
+        if err > 0.0:
+            factor = min(factor, 0.9 * (tolerance / err) ** 0.2)
+        if turn > 0.0:
+            factor = min(factor, 0.9 * max_turn / turn)
+
+        if (err > tolerance or turn > max_turn) and h > h_min:
+            rejected += 1
+            retry = True
+            h = max(h * max(0.2, factor), h_min)
+            continue
+
+        # Accept; emit resampled points falling inside this step
+        if resample:
+            while next_s <= s + h and len(points) <= steps:
+                t = min((next_s - s) / h, 1.0)
+                points.append(_hermite(pos, k1, new, k7, h, t))
+                next_s = step_size * len(points)
+        else:
+            points.append(new)
+        accepted += 1
+        pos, s, k1 = new, s + h, k7   # FSAL: k7 is the next step's k1
+
+        # No growth straight after a rejection (avoids reject/grow cycling)
+        if retry:
+            factor, retry = min(factor, 1.0), False
+        h = min(max(h * max(0.2, factor), h_min), h_max)
+
+    if resample and len(points) <= steps:
+        points.append(pos)   # last sample lost to round-off in s
+
+    if stats is not None:
+        stats.update(evaluations=evaluations, euler_evaluations=steps,
+                     saved=steps - evaluations, accepted=accepted, rejected=rejected)
+    return points
+
+
 def branch_paths(
     root_path: Sequence[Vec3],
     direction_field: VectorFn,
@@ -53,26 +201,26 @@ def branch_paths(
     branch_steps: int = 40,
     lateral_strength: float = 0.65,
     rng: random.Random | None = None,
+    origins: Sequence[int] | None = None,
 ) -> list[list[Vec3]]:
     """
     Generate lateral branches from a root path.
 
     Each branch starts from a randomly selected interior point of root_path
-    and integrates with a laterally-offset direction field.
+    and integrates with a laterally-offset direction field. origins, if
+    given, are root indices from sample_branch_origins; rng is then unused.
 
     The lateral offset is computed once per branch and captured correctly
     into the closure — avoiding the late-binding trap via a default-argument
     capture pattern.
     """
-    rng = rng or random.Random()
+    if origins is None:
+        origins = sample_branch_origins(len(root_path), branch_probability, max_branches,
+                                        rng or random.Random())
     branches: list[list[Vec3]] = []
 
-    for point in root_path[1:-1]:
-        if len(branches) >= max_branches:
-            break
-        if rng.random() > branch_probability:
-            continue
-
+    for i in origins:
+        point = root_path[i]
         base = direction_field(*point)
 
         # Compute lateral once; fall back to y-cross if base is near-vertical
@@ -93,3 +241,243 @@ def branch_paths(
         )
 
     return branches
+
+
+def sample_branch_origins(
+    n_points: int,
+    branch_probability: float,
+    max_branches: int,
+    rng: random.Random,
+) -> list[int]:
+    """
+    Indices of interior root points that sprout a branch.
+
+    Draws from rng exactly as branch_paths does, so sampling origins up
+    front and tracing later reproduces the same branches.
+    """
+    origins: list[int] = []
+    for i in range(1, n_points - 1):
+        if len(origins) >= max_branches:
+            break
+        if rng.random() > branch_probability:
+            continue
+        origins.append(i)
+    return origins
+
+
+# ---------------------------------------------------------------------------
+# Batched (lockstep) tracing
+# ---------------------------------------------------------------------------
+
+class DirectionalBank:
+    """
+    K DirectionalBias fields evaluated row-aligned: row i of the query
+    arrays uses biases[i]. An optional shared VectorFn is added to every
+    row. Use with trace_growth_paths, which always queries all K rows.
+    """
+
+    def __init__(self, biases: Sequence[DirectionalBias], shared: VectorFn | None = None):
+        self.base = np.array([v_normalize(b.direction) for b in biases], dtype=float).reshape(-1, 3)
+        self.strength = np.array([b.strength for b in biases], dtype=float)
+        self.curl = np.array([b.curl for b in biases], dtype=float)
+        self.origin = np.array([b.origin for b in biases], dtype=float).reshape(-1, 3)
+        self.shared = shared
+
+    def __len__(self) -> int:
+        return len(self.strength)
+
+    def take(self, index) -> DirectionalBank:
+        """Bank re-aligned so row j uses bias index[j] (e.g. branch -> tree)."""
+        bank = DirectionalBank.__new__(DirectionalBank)
+        bank.base = self.base[index]
+        bank.strength = self.strength[index]
+        bank.curl = self.curl[index]
+        bank.origin = self.origin[index]
+        bank.shared = self.shared
+        return bank
+
+    def __call__(self, x, y, z):
+        b, o = self.base.T, self.origin.T
+        radial = (x - o[0], y - o[1], z - o[2])
+        twist = (
+            b[1] * radial[2] - b[2] * radial[1],
+            b[2] * radial[0] - b[0] * radial[2],
+            b[0] * radial[1] - b[1] * radial[0],
+        )
+        length = np.sqrt(twist[0]*twist[0] + twist[1]*twist[1] + twist[2]*twist[2])
+        inv = np.where(length < 1e-9, 0.0, 1.0 / np.maximum(length, 1e-9))
+        out = [b[i] * self.strength + twist[i] * inv * self.curl for i in range(3)]
+        if self.shared is not None:
+            extra = self.shared(x, y, z)
+            out = [out[i] + extra[i] for i in range(3)]
+        return stack_vector(*out)
+
+
+def _require_arrays(field, error: Exception) -> None:
+    """Re-raise an array-call failure of a DirectionalBank, which has no scalar form."""
+    if isinstance(field, DirectionalBank):
+        raise TypeError(
+            "DirectionalBank is row-aligned and must be called with arrays: its "
+            f"shared field must accept coordinate arrays ({error})"
+        ) from error
+
+
+def _per_path(value, k: int) -> list:
+    """Scalar or per-path sequence -> list of k values."""
+    return list(value) if hasattr(value, "__len__") else [value] * k
+
+
+def _rows(vec, k: int):
+    """VectorFn output (tuple or (3, K) stack) -> (K, 3) array."""
+    return np.stack([np.broadcast_to(np.asarray(c, dtype=float), (k,)) for c in vec], axis=1)
+
+
+def trace_growth_paths(
+    starts: Sequence[Vec3],
+    direction_field: VectorFn,
+    scalar_field: ScalarFn | None = None,
+    step_size: float | Sequence[float] = 0.05,
+    steps: int | Sequence[int] = 100,
+    attraction: float = 0.25,
+    offsets: Sequence[Vec3] | None = None,
+) -> list[list[Vec3]]:
+    """
+    trace_growth_path for K paths at once.
+
+    All paths advance in lockstep as a (K, 3) array; the fields are called
+    once per step with (K,) coordinate arrays (row i = path i, so
+    row-aligned fields such as DirectionalBank work). step_size and steps
+    may be per path; a path stops moving once its step count is reached.
+    offsets adds a constant per-path vector to the direction before
+    normalising (branch_paths' lateral push).
+
+    Falls back to one trace_growth_path per path without NumPy or for
+    fields that are not array-capable (decided by the first field call;
+    errors in later steps propagate). A DirectionalBank has no per-path
+    form, so its shared field must accept arrays.
+    """
+    k = len(starts)
+    if k == 0:
+        return []
+    step_list = _per_path(step_size, k)
+    steps_list = _per_path(steps, k)
+
+    if np is not None:
+        paths = _trace_lockstep(starts, direction_field, scalar_field, step_list,
+                                steps_list, attraction, offsets)
+        if paths is not None:
+            return paths
+
+    paths = []
+    for i in range(k):
+        field = direction_field
+        if offsets is not None:
+            def field(x: float, y: float, z: float, _off: Vec3 = tuple(offsets[i])) -> Vec3:
+                return v_add(direction_field(x, y, z), _off)
+        paths.append(trace_growth_path(starts[i], field, scalar_field,
+                                       step_list[i], steps_list[i], attraction))
+    return paths
+
+
+def _trace_lockstep(starts, direction_field, scalar_field, step_list, steps_list,
+                    attraction, offsets):
+    k = len(starts)
+    pos = np.array(starts, dtype=float).reshape(k, 3)
+    step = np.array(step_list, dtype=float)
+    count = np.array(steps_list, dtype=np.int64)
+    push = None if offsets is None else np.array(offsets, dtype=float).reshape(k, 3)
+    grad = scalar_gradient(scalar_field) if scalar_field is not None else None
+
+    def heading(pos):
+        direction = _rows(direction_field(pos[:, 0], pos[:, 1], pos[:, 2]), k)
+        if grad is not None:
+            direction = direction + _rows(grad(pos[:, 0], pos[:, 1], pos[:, 2]), k) * attraction
+        return direction
+
+    # Only the first call decides whether the fields are array-capable
+    try:
+        first = heading(pos)
+    except (TypeError, ValueError) as e:
+        _require_arrays(direction_field, e)
+        return None
+
+    history = np.empty((int(count.max()) + 1, k, 3))
+    history[0] = pos
+    for n in range(int(count.max())):
+        direction = first if n == 0 else heading(pos)
+        if push is not None:
+            direction = direction + push
+
+        length = np.linalg.norm(direction, axis=1, keepdims=True)
+        unit = np.where(length < 1e-9, 0.0, direction / np.maximum(length, 1e-9))
+        moving = (n < count)[:, None]
+        pos = np.where(moving, pos + unit * step[:, None], pos)
+        history[n + 1] = pos
+
+    return [
+        [tuple(p) for p in history[:count[i] + 1, i].tolist()]
+        for i in range(k)
+    ]
+
+
+def branch_paths_batched(
+    root_paths: Sequence[Sequence[Vec3]],
+    direction_field: VectorFn,
+    branch_probability: float = 0.08,
+    max_branches: int = 8,
+    step_size: float = 0.04,
+    branch_steps: int = 40,
+    lateral_strength: float | Sequence[float] = 0.65,
+    rng: random.Random | None = None,
+    origins: Sequence[Sequence[int]] | None = None,
+) -> list[list[list[Vec3]]]:
+    """
+    branch_paths for many roots, all branches traced in one lockstep pass.
+
+    Origins are sampled per root in order (same rng draws as calling
+    branch_paths root by root) unless given as per-root index lists from
+    sample_branch_origins. lateral_strength may be per root. If
+    direction_field has take() (DirectionalBank aligned with the roots)
+    it is re-aligned so each branch uses its root's field.
+
+    Returns one list of branches per root.
+    """
+    rng = rng or random.Random()
+    if origins is None:
+        origins = [sample_branch_origins(len(r), branch_probability, max_branches, rng)
+                   for r in root_paths]
+    strengths = _per_path(lateral_strength, len(root_paths))
+
+    parent = [r for r, idx in enumerate(origins) for _ in idx]
+    points = [root_paths[r][i] for r, idx in enumerate(origins) for i in idx]
+    if not points:
+        return [[] for _ in root_paths]
+
+    # Lateral per branch, as in branch_paths (y-cross fallback when vertical)
+    field = direction_field
+    bases = None
+    if np is not None:
+        if hasattr(direction_field, "take"):
+            field = direction_field.take(np.array(parent))
+        xs, ys, zs = (np.array([p[c] for p in points], dtype=float) for c in range(3))
+        try:
+            bases = _rows(field(xs, ys, zs), len(points)).tolist()
+        except (TypeError, ValueError) as e:
+            _require_arrays(field, e)
+    if bases is None:
+        bases = [field(*p) for p in points]
+
+    laterals = []
+    for b, r in zip(bases, parent):
+        seed = v_cross(b, (0.0, 0.0, 1.0))
+        if v_length(seed) < 1e-6:
+            seed = v_cross(b, (0.0, 1.0, 0.0))
+        laterals.append(v_mul(v_normalize(seed), strengths[r]))
+
+    traced = trace_growth_paths(points, field, step_size=step_size,
+                                steps=branch_steps, offsets=laterals)
+
+    out: list[list[list[Vec3]]] = [[] for _ in root_paths]
+    for r, path in zip(parent, traced):
+        out[r].append(path)
+    return out
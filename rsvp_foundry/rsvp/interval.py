@@ -0,0 +1,426 @@
+"""
+Interval arithmetic: guaranteed bounds of fields over boxes.
+
+An Interval is a closed range [lo, hi] of floats, or of equal-shape NumPy
+arrays (one range per box). Arithmetic on Intervals encloses every value
+the same expression takes at points inside them, rounded outward after
+each operation, so a field evaluated at any point of a box lands within
+the bounds computed for the box.
+
+Passing Intervals for x, y, z through a field therefore bounds the field
+over the box. Composition closures need no changes (they only use
+arithmetic); primitives dispatch to range rules registered with
+register_bounds. A rule bounds the value and the Jacobian, so Duals
+carrying Intervals (see rsvp.autodiff) bound the exact derivatives that
+closure_field and the differential operators use. Anything an Interval
+cannot bound (comparisons, truth tests, math module calls) raises
+TypeError, and such fields simply report no bounds.
+
+prune_boxes() subdivides a region and discards boxes where the field
+cannot reach a value range, before any point is sampled.
+"""
+
+from __future__ import annotations
+import math
+from typing import Callable
+
+from .vec import Vec3
+from .arrays import np, is_array
+
+_INF = float("inf")
+_TWO_PI = 2.0 * math.pi
+
+
+# ---------------------------------------------------------------------------
+# Elementwise helpers (floats or arrays)
+# ---------------------------------------------------------------------------
+
+def _down(v):
+    if is_array(v):
+        return np.nextafter(v, -np.inf)
+    return math.nextafter(v, -_INF)
+
+
+def _up(v):
+    if is_array(v):
+        return np.nextafter(v, np.inf)
+    return math.nextafter(v, _INF)
+
+
+def _min(a, b):
+    return np.minimum(a, b) if is_array(a, b) else min(a, b)
+
+
+def _max(a, b):
+    return np.maximum(a, b) if is_array(a, b) else max(a, b)
+
+
+def _where(cond, a, b):
+    if is_array(cond, a, b):
+        return np.where(cond, a, b)
+    return a if cond else b
+
+
+def _times(a, b):
+    """a * b with 0 * inf = 0, as interval products need."""
+    if is_array(a, b):
+        with np.errstate(invalid="ignore"):
+            p = a * b
+        return np.where(np.isnan(p), 0.0, p)
+    if a == 0.0 or b == 0.0:
+        return 0.0
+    return a * b
+
+
+def _exp(v):
+    if is_array(v):
+        with np.errstate(over="ignore"):
+            return np.exp(v)
+    return math.exp(v) if v < 709.0 else _INF
+
+
+def _periodic(lo, hi, fn, peak: float):
+    """
+    Range of fn (sin or cos) over [lo, hi]. peak is the first maximum of
+    fn; minima lie half a period after maxima.
+    """
+    if not is_array(lo, hi):
+        if not hi - lo < _TWO_PI:      # also catches infinite bounds
+            return -1.0, 1.0
+        a, b = fn(lo), fn(hi)
+        top = peak + _TWO_PI * math.ceil((lo - peak) / _TWO_PI)
+        bottom = peak + math.pi + _TWO_PI * math.ceil((lo - peak - math.pi) / _TWO_PI)
+        return (-1.0 if bottom <= hi else min(a, b)), (1.0 if top <= hi else max(a, b))
+    with np.errstate(invalid="ignore"):
+        full = ~(hi - lo < _TWO_PI)
+        a, b = fn(lo), fn(hi)
+        top = peak + _TWO_PI * np.ceil((lo - peak) / _TWO_PI)
+        bottom = peak + math.pi + _TWO_PI * np.ceil((lo - peak - math.pi) / _TWO_PI)
+    return (np.where(full | (bottom <= hi), -1.0, np.minimum(a, b)),
+            np.where(full | (top <= hi), 1.0, np.maximum(a, b)))
+
+
+def _operand(o):
+    """o as an Interval if it is one, a number or an array; else None."""
+    if isinstance(o, Interval):
+        return o
+    if isinstance(o, (int, float)) or is_array(o) or (np is not None and isinstance(o, np.number)):
+        return Interval(o, o)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Intervals
+# ---------------------------------------------------------------------------
+
+class Interval:
+    """[lo, hi], with lo and hi floats or equal-shape arrays."""
+    __slots__ = ("lo", "hi")
+    __array_ufunc__ = None     # ndarray <op> Interval defers to Interval
+    __hash__ = None
+
+    def __init__(self, lo, hi=None):
+        self.lo = lo
+        self.hi = lo if hi is None else hi
+
+    @staticmethod
+    def _outward(lo, hi) -> Interval:
+        return Interval(_down(lo), _up(hi))
+
+    def __repr__(self) -> str:
+        return f"Interval({self.lo!r}, {self.hi!r})"
+
+    def __bool__(self):
+        raise TypeError("an Interval has no single truth value")
+
+    def __eq__(self, o):
+        raise TypeError("Intervals cannot be compared")
+
+    # Arithmetic ------------------------------------------------------------
+
+    def __add__(self, o):
+        o = _operand(o)
+        if o is None:
+            return NotImplemented
+        return Interval._outward(self.lo + o.lo, self.hi + o.hi)
+
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        o = _operand(o)
+        if o is None:
+            return NotImplemented
+        return Interval._outward(self.lo - o.hi, self.hi - o.lo)
+
+    def __rsub__(self, o):
+        o = _operand(o)
+        return NotImplemented if o is None else o - self
+
+    def __mul__(self, o):
+        if isinstance(o, (int, float)):
+            a, b = _times(self.lo, o), _times(self.hi, o)
+            return Interval._outward(a, b) if o >= 0 else Interval._outward(b, a)
+        o = _operand(o)
+        if o is None:
+            return NotImplemented
+        p = (_times(self.lo, o.lo), _times(self.lo, o.hi),
+             _times(self.hi, o.lo), _times(self.hi, o.hi))
+        return Interval._outward(_min(_min(p[0], p[1]), _min(p[2], p[3])),
+                                 _max(_max(p[0], p[1]), _max(p[2], p[3])))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        if isinstance(o, (int, float)) and o != 0:
+            a, b = self.lo / o, self.hi / o
+            return Interval._outward(a, b) if o > 0 else Interval._outward(b, a)
+        o = _operand(o)
+        return NotImplemented if o is None else self * o.reciprocal()
+
+    def __rtruediv__(self, o):
+        o = _operand(o)
+        return NotImplemented if o is None else o * self.reciprocal()
+
+    def __pow__(self, k):
+        if k == 2:
+            return self.square()
+        if isinstance(k, int) and k >= 0:
+            if k % 2:
+                return Interval._outward(self.lo ** k, self.hi ** k)
+            a = abs(self)
+            return Interval._outward(a.lo ** k, a.hi ** k)
+        if isinstance(k, int):
+            return (self ** -k).reciprocal()
+        raise TypeError("Interval powers must be integers")
+
+    def __neg__(self):
+        return Interval(-self.hi, -self.lo)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        a, b = abs(self.lo), abs(self.hi)
+        straddle = (self.lo < 0.0) & (self.hi > 0.0)
+        return Interval(_where(straddle, 0.0, _min(a, b)), _max(a, b))
+
+    # Functions -------------------------------------------------------------
+
+    def reciprocal(self) -> Interval:
+        """1 / self; unbounded where self contains 0."""
+        lo, hi = self.lo, self.hi
+        full = ((lo < 0.0) & (hi > 0.0)) | ((lo == 0.0) & (hi == 0.0))
+        if is_array(lo, hi):
+            with np.errstate(divide="ignore"):
+                r_lo = np.where(hi == 0.0, -np.inf, 1.0 / hi)
+                r_hi = np.where(lo == 0.0, np.inf, 1.0 / lo)
+            r = Interval._outward(r_lo, r_hi)
+            return Interval(np.where(full, -np.inf, r.lo), np.where(full, np.inf, r.hi))
+        if full:
+            return Interval(-_INF, _INF)
+        r_lo = -_INF if hi == 0.0 else 1.0 / hi
+        r_hi = _INF if lo == 0.0 else 1.0 / lo
+        return Interval._outward(r_lo, r_hi)
+
+    def square(self) -> Interval:
+        a = abs(self)
+        return Interval(_max(_down(a.lo * a.lo), 0.0), _up(a.hi * a.hi))
+
+    def sqrt(self) -> Interval:
+        m = np if is_array(self.lo, self.hi) else math
+        return Interval(_max(_down(m.sqrt(_max(self.lo, 0.0))), 0.0),
+                        _up(m.sqrt(_max(self.hi, 0.0))))
+
+    def exp(self) -> Interval:
+        # Library exp is within an ulp; widen by two
+        return Interval(_max(_down(_down(_exp(self.lo))), 0.0), _up(_up(_exp(self.hi))))
+
+    def sin(self) -> Interval:
+        m = np if is_array(self.lo, self.hi) else math
+        lo, hi = _periodic(self.lo, self.hi, m.sin, 0.5 * math.pi)
+        return self._unit(lo, hi)
+
+    def cos(self) -> Interval:
+        m = np if is_array(self.lo, self.hi) else math
+        lo, hi = _periodic(self.lo, self.hi, m.cos, 0.0)
+        return self._unit(lo, hi)
+
+    @staticmethod
+    def _unit(lo, hi) -> Interval:
+        return Interval(_max(_down(_down(lo)), -1.0), _min(_up(_up(hi)), 1.0))
+
+    def clip(self, lo: float, hi: float) -> Interval:
+        """Range of clip(value, lo, hi) over self."""
+        return Interval(_min(_max(self.lo, lo), hi), _max(_min(self.hi, hi), lo))
+
+    def hull(self, other, where=True) -> Interval:
+        """Smallest Interval holding self and other (only where `where`)."""
+        o = _operand(other)
+        return Interval(_where(where, _min(self.lo, o.lo), self.lo),
+                        _where(where, _max(self.hi, o.hi), self.hi))
+
+
+def is_interval(*values) -> bool:
+    for v in values:
+        if isinstance(v, Interval):
+            return True
+    return False
+
+
+def as_interval(v) -> Interval:
+    """v as an Interval; a float or array becomes a point interval."""
+    return v if isinstance(v, Interval) else Interval(v, v)
+
+
+# ---------------------------------------------------------------------------
+# Range rule registry
+# ---------------------------------------------------------------------------
+
+_RULES: dict[type, Callable] = {}
+
+
+def register_bounds(cls: type) -> Callable:
+    """
+    Register rule(obj, *inputs) -> (value, jacobian) bounds for a primitive.
+
+    Inputs are Intervals or plain floats; value and jacobian have the
+    layout of register_derivative rules, with Intervals for entries.
+    """
+    def deco(rule: Callable) -> Callable:
+        _RULES[cls] = rule
+        return rule
+    return deco
+
+
+def bound(obj, *inputs):
+    """Apply obj's registered range rule: (value, jacobian) bounds."""
+    rule = _RULES.get(type(obj))
+    if rule is None:
+        raise TypeError(f"no interval bounds registered for {type(obj).__name__}")
+    return rule(obj, *inputs)
+
+
+# ---------------------------------------------------------------------------
+# Bounds over boxes
+# ---------------------------------------------------------------------------
+
+def field_bounds(field: Callable, box_min, box_max):
+    """
+    (lo, hi) bounds of a ScalarFn over the box [box_min, box_max], or over
+    M boxes at once when both are (M, 3) arrays (lo and hi are then (M,)
+    arrays). Axes with min == max are passed as plain floats.
+
+    Returns None if the field cannot be evaluated on Intervals.
+    """
+    if is_array(box_min, box_max):
+        box_min, box_max = np.asarray(box_min, dtype=float), np.asarray(box_max, dtype=float)
+        cols = [(box_min[:, i], box_max[:, i]) for i in range(3)]
+        shape = box_min.shape[:1]
+    else:
+        cols = list(zip(box_min, box_max))
+        shape = None
+    coords = []
+    for a, b in cols:
+        if is_array(a) and a.size and (a == b).all() and (a == a[0]).all():
+            coords.append(float(a[0]))
+        elif not is_array(a) and a == b:
+            coords.append(float(a))
+        else:
+            coords.append(Interval(a, b))
+
+    try:
+        out = field(*coords)
+    except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+        return None
+    if isinstance(out, (tuple, list)):
+        return None
+    out = as_interval(out)
+    if shape is None:
+        return out.lo, out.hi
+    return (np.broadcast_to(np.asarray(out.lo, dtype=float), shape),
+            np.broadcast_to(np.asarray(out.hi, dtype=float), shape))
+
+
+def prune_boxes(
+    field: Callable,
+    bounds_min: Vec3 = (-1.0, -1.0, -1.0),
+    bounds_max: Vec3 = (1.0, 1.0, 1.0),
+    lower: float = -_INF,
+    upper: float = _INF,
+    depth: int = 6,
+    max_boxes: int = 1 << 15,
+    stats: dict | None = None,
+):
+    """
+    Boxes covering every point of [bounds_min, bounds_max] where
+    lower <= field <= upper can hold.
+
+    The region is bisected along each axis with min < max, up to depth
+    times. A box whose field bounds miss [lower, upper] is dropped, one
+    whose bounds lie inside it is kept whole, and the rest are split;
+    boxes still undecided at depth (or once max_boxes would be exceeded)
+    are kept as partial. All boxes of one level are bounded in a single
+    vectorised call. For an isosurface pass lower = upper = level: the
+    kept boxes are those the surface may cross.
+
+    Returns (box_lo (M, 3), box_hi (M, 3), inside (M,) bool), with inside
+    marking boxes where the range holds at every point, or None if the
+    field has no interval bounds. If stats is a dict it receives levels,
+    boxes (bounded in total), kept, inside and volume_fraction (kept
+    share of the region). Requires NumPy.
+    """
+    if np is None:
+        raise RuntimeError("prune_boxes requires NumPy")
+    lo = np.array([bounds_min], dtype=float)
+    hi = np.array([bounds_max], dtype=float)
+    axes = [i for i in range(3) if hi[0, i] > lo[0, i]]
+    if not axes:
+        depth = 0
+
+    out_lo, out_hi, out_inside = [], [], []
+    evaluated = levels = 0
+    for level in range(depth + 1):
+        if not len(lo):
+            break
+        found = field_bounds(field, lo, hi)
+        if found is None:
+            return None
+        f_lo, f_hi = found
+        evaluated += len(lo)
+        levels = level + 1
+
+        meets = (f_hi >= lower) & (f_lo <= upper)
+        inside = meets & (f_lo >= lower) & (f_hi <= upper)
+        split = meets & ~inside
+        last = level == depth or int(split.sum()) << len(axes) > max_boxes
+        keep = inside | (split & last)
+        out_lo.append(lo[keep])
+        out_hi.append(hi[keep])
+        out_inside.append(inside[keep])
+        if last:
+            break
+
+        # Bisect the undecided boxes along every free axis
+        lo, hi = lo[split], hi[split]
+        for a in axes:
+            mid = 0.5 * (lo[:, a] + hi[:, a])
+            lo_b, hi_a = lo.copy(), hi.copy()
+            hi_a[:, a] = mid
+            lo_b[:, a] = mid
+            lo = np.concatenate([lo, lo_b])
+            hi = np.concatenate([hi_a, hi])
+
+    box_lo = np.concatenate(out_lo)
+    box_hi = np.concatenate(out_hi)
+    inside = np.concatenate(out_inside)
+    if stats is not None:
+        span = np.array(bounds_max, dtype=float)[axes] - np.array(bounds_min, dtype=float)[axes]
+        volume = np.prod(box_hi[:, axes] - box_lo[:, axes], axis=1).sum()
+        stats.update(
+            levels=levels,
+            boxes=evaluated,
+            kept=len(box_lo),
+            inside=int(inside.sum()),
+            volume_fraction=float(volume / np.prod(span)) if axes else 1.0,
+        )
+    return box_lo, box_hi, inside
@@ -0,0 +1,274 @@
+"""
+Quadtree level-of-detail terrain.
+
+QuadtreeTerrain splits the height-map domain into square tiles of a fixed
+sample count. Tiles are refined where their geometric error, projected to
+screen pixels from a camera, exceeds a tolerance, most visible error
+first, until a vertex budget is spent. Each tile is evaluated once and
+cached, so meshes for a moving camera reuse earlier work.
+
+Meshes are one welded vertex buffer plus one triangle index buffer.
+Vertices sit on a global integer lattice, so tiles share edge vertices
+exactly, and coarse triangles are split at the edge vertices of finer
+neighbours: no cracks and no T-junctions at any level difference.
+"""
+
+from __future__ import annotations
+import heapq
+import math
+
+from .vec import Vec3
+from .fields import ScalarFn
+from .arrays import np
+from .raster import rasterize_grid
+
+
+class QuadtreeTerrain:
+    """
+    Height field z = z_scale * field(x, y, 0) over a rectangle, meshed
+    adaptively.
+
+    Args:
+        field      : terrain ScalarFn (e.g. from terrain_field)
+        bounds_min : (x, y) lower corner, field coordinates
+        bounds_max : (x, y) upper corner
+        z_scale    : height multiplier
+        tile_size  : samples per tile edge, 2^k + 1
+        max_depth  : deepest quadtree level (root is 0)
+
+    Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        field: ScalarFn,
+        bounds_min: tuple[float, float] = (-1.0, -1.0),
+        bounds_max: tuple[float, float] = (1.0, 1.0),
+        z_scale: float = 1.0,
+        tile_size: int = 17,
+        max_depth: int = 10,
+    ):
+        if np is None:
+            raise RuntimeError("QuadtreeTerrain requires NumPy")
+        cells = tile_size - 1
+        if tile_size < 3 or cells & (cells - 1):
+            raise ValueError("tile_size must be 2^k + 1 (3, 5, 9, 17, ...)")
+        self.field = field
+        self.bounds_min = (float(bounds_min[0]), float(bounds_min[1]))
+        self.bounds_max = (float(bounds_max[0]), float(bounds_max[1]))
+        self.z_scale = float(z_scale)
+        self.tile_size = tile_size
+        self.max_depth = max_depth
+        # Lattice units per side; one unit is a cell at max_depth
+        self.extent = cells << max_depth
+        self._tiles: dict = {}
+        self.evaluations = 0
+
+    # Tiles -----------------------------------------------------------------
+
+    def _coords(self, g):
+        """Lattice index (array) -> (x, y) field coordinates."""
+        lo, hi = self.bounds_min, self.bounds_max
+        t = np.asarray(g, dtype=float) / self.extent
+        return lo[0] + (hi[0] - lo[0]) * t, lo[1] + (hi[1] - lo[1]) * t
+
+    def _origin(self, level: int, i: int, j: int) -> tuple[int, int, int]:
+        step = 1 << (self.max_depth - level)    # lattice units per cell
+        side = (self.tile_size - 1) * step
+        return i * side, j * side, step
+
+    def _heights(self, level: int, i: int, j: int, n: int):
+        """(n, n) heights on the tile's window of the lattice."""
+        gx, gy, step = self._origin(level, i, j)
+        step = step * (self.tile_size - 1) // (n - 1)
+        xs, _ = self._coords(gx + step * np.arange(n))
+        _, ys = self._coords(gy + step * np.arange(n))
+        self.evaluations += 1
+        return rasterize_grid(self.field, (xs, ys), fixed=(0.0,), scale=self.z_scale,
+                              tile=n, workers=1, dtype=float)
+
+    def tile(self, level: int, i: int, j: int) -> dict:
+        """
+        Cached tile record: "heights" (tile_size^2), "fine" (heights at
+        twice the density, None at max_depth), "error" (largest height
+        change refining would bring) and "z" (min, max).
+        """
+        key = (level, i, j)
+        rec = self._tiles.get(key)
+        if rec is not None:
+            return rec
+
+        n = self.tile_size
+        if level < self.max_depth:
+            fine = self._heights(level, i, j, 2 * n - 1)
+            heights = fine[::2, ::2]
+            # Bilinear interpolation of the coarse samples at fine positions
+            lin = np.empty_like(fine)
+            lin[::2, ::2] = heights
+            lin[1::2, ::2] = 0.5 * (heights[:-1] + heights[1:])
+            lin[:, 1::2] = 0.5 * (lin[:, :-1:2] + lin[:, 2::2])
+            error = float(np.abs(fine - lin).max())
+            z = (float(fine.min()), float(fine.max()))
+        else:
+            parent = self._tiles.get((level - 1, i >> 1, j >> 1))
+            if parent is not None:
+                h = n - 1
+                heights = parent["fine"][(i & 1) * h:(i & 1) * h + n,
+                                         (j & 1) * h:(j & 1) * h + n]
+            else:
+                heights = self._heights(level, i, j, n)
+            fine, error = None, 0.0
+            z = (float(heights.min()), float(heights.max()))
+
+        rec = {"heights": heights, "fine": fine, "error": error, "z": z}
+        self._tiles[key] = rec
+        return rec
+
+    def _distance(self, level: int, i: int, j: int, rec: dict, camera: Vec3) -> float:
+        """Camera distance to the tile's bounding box."""
+        gx, gy, step = self._origin(level, i, j)
+        side = (self.tile_size - 1) * step
+        xs, _ = self._coords([gx, gx + side])
+        _, ys = self._coords([gy, gy + side])
+        (x0, x1), (y0, y1) = sorted(xs), sorted(ys)
+        z0, z1 = rec["z"]
+        d = [max(lo - p, 0.0, p - hi) for p, lo, hi in
+             zip(camera, (x0, y0, z0), (x1, y1, z1))]
+        return math.sqrt(d[0] ** 2 + d[1] ** 2 + d[2] ** 2)
+
+    # Refinement ------------------------------------------------------------
+
+    def select(
+        self,
+        camera: Vec3,
+        pixel_error: float = 1.0,
+        vertex_budget: int = 65536,
+        fov: float = math.radians(60.0),
+        viewport: int = 1080,
+    ) -> list[tuple[int, int, int]]:
+        """
+        Leaf tiles (level, i, j) for a camera at field coordinates camera.
+
+        A tile's screen error is error * viewport / (2 tan(fov / 2)) /
+        distance, in pixels. The worst tile is split until every leaf is
+        within pixel_error, is at max_depth, or splitting would take the
+        leaves past vertex_budget (counted as tile_size^2 per leaf, an
+        upper bound on the welded count).
+        """
+        k = viewport / (2.0 * math.tan(0.5 * fov))
+        per_tile = self.tile_size ** 2
+        leaves: list = []
+        heap: list = []
+
+        def push(level, i, j):
+            rec = self.tile(level, i, j)
+            dist = self._distance(level, i, j, rec, camera)
+            rho = rec["error"] * k / max(dist, 1e-9)
+            heapq.heappush(heap, (-rho, level, i, j))
+
+        push(0, 0, 0)
+        count = 1
+        while heap:
+            neg, level, i, j = heap[0]
+            if -neg <= pixel_error or (count + 3) * per_tile > vertex_budget:
+                break
+            heapq.heappop(heap)
+            if level == self.max_depth:
+                leaves.append((level, i, j))
+                continue
+            for ci, cj in ((0, 0), (1, 0), (0, 1), (1, 1)):
+                push(level + 1, 2 * i + ci, 2 * j + cj)
+            count += 3
+
+        leaves.extend((level, i, j) for _, level, i, j in heap)
+        return sorted(leaves)
+
+    # Meshing ---------------------------------------------------------------
+
+    def mesh(
+        self,
+        camera: Vec3,
+        pixel_error: float = 1.0,
+        vertex_budget: int = 65536,
+        fov: float = math.radians(60.0),
+        viewport: int = 1080,
+        stats: dict | None = None,
+    ):
+        """
+        Crack-free mesh for camera: (vertices (V, 3) float32 in field
+        coordinates with z = height, triangles (T, 3) uint32, CCW seen
+        from +z). Arguments as for select.
+
+        stats, if given, receives tiles, max_level, vertices, triangles
+        and evaluations (tile grids evaluated so far by this terrain).
+        """
+        leaves = self.select(camera, pixel_error, vertex_budget, fov, viewport)
+        n = self.tile_size
+        side = np.arange(n)
+
+        # Lattice key and height for every tile sample
+        keys, heights = [], []
+        for level, i, j in leaves:
+            gx, gy, step = self._origin(level, i, j)
+            kx = (gx + step * side)[:, None]
+            ky = (gy + step * side)[None, :]
+            keys.append((kx * (self.extent + 1) + ky).ravel())
+            heights.append(self.tile(level, i, j)["heights"].ravel())
+        keys = np.concatenate(keys)
+        heights = np.concatenate(heights)
+
+        # Weld shared samples; first occurrence wins (they are equal anyway)
+        uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        gx, gy = np.divmod(uniq, self.extent + 1)
+        xs, _ = self._coords(gx)
+        _, ys = self._coords(gy)
+        vertices = np.stack([xs, ys, heights[first]], axis=1).astype(np.float32)
+
+        # Two triangles per cell, per tile, through the weld map
+        a = (side[:-1, None] * n + side[None, :-1]).ravel()
+        local = np.concatenate([
+            np.stack([a, a + n, a + n + 1], axis=1),
+            np.stack([a, a + n + 1, a + 1], axis=1),
+        ])
+        offsets = np.arange(len(leaves)) * n * n
+        tris = inverse.reshape(-1)[(offsets[:, None, None] + local[None]).reshape(-1, 3)]
+        tris = _split_t_junctions(tris, gx, gy, uniq, self.extent + 1)
+
+        if stats is not None:
+            stats.update(
+                tiles=len(leaves),
+                max_level=max(lv for lv, _, _ in leaves),
+                vertices=len(vertices),
+                triangles=len(tris),
+                evaluations=self.evaluations,
+            )
+        return vertices, tris.astype(np.uint32)
+
+
+def _split_t_junctions(tris, gx, gy, keys, width):
+    """
+    Split triangles at vertices lying on the midpoint of one of their
+    edges, repeatedly, so every edge is shared by at most two triangles.
+    keys is the sorted lattice key of each vertex (gx * width + gy).
+    """
+    done = []
+    while len(tris):
+        hit = np.zeros(len(tris), dtype=bool)
+        mid = np.zeros(len(tris), dtype=np.int64)
+        edge = np.zeros(len(tris), dtype=np.int64)
+        for e in (2, 1, 0):    # first matching edge wins
+            p, q = tris[:, e], tris[:, (e + 1) % 3]
+            sx, sy = gx[p] + gx[q], gy[p] + gy[q]
+            mk = (sx // 2) * width + sy // 2
+            pos = np.minimum(np.searchsorted(keys, mk), len(keys) - 1)
+            found = (sx % 2 == 0) & (sy % 2 == 0) & (keys[pos] == mk)
+            mid = np.where(found, pos, mid)
+            edge = np.where(found, e, edge)
+            hit |= found
+        done.append(tris[~hit])
+        t, m, e = tris[hit], mid[hit], edge[hit]
+        rows = np.arange(len(t))
+        p, q, r = t[rows, e], t[rows, (e + 1) % 3], t[rows, (e + 2) % 3]
+        # (p, q, r) with m on p-q -> (p, m, r) and (m, q, r), same winding
+        tris = np.concatenate([np.stack([p, m, r], axis=1), np.stack([m, q, r], axis=1)])
+    return np.concatenate(done) if done else tris
@@ -3,6 +3,11 @@ Field composition and differential operators.
 
 All operators are higher-order functions: they consume fields and return fields.
 No state, no side effects. Safe to compose arbitrarily.
+
+Operators pass NumPy arrays straight through to their input fields, so a
+composition is array-capable whenever its leaves are (see rsvp.arrays).
+If any input is a symbolic Expr (see rsvp.graph), the operator returns an
+Expr node instead of a closure.
 """
 
 from __future__ import annotations
@@ -10,6 +15,9 @@ from typing import Callable
 
 from .vec import Vec3, v_add, v_mul, v_dot
 from .fields import ScalarFn, VectorFn, EntropyCap
+from .arrays import as_vector
+from .graph import is_symbolic, node, symbolic_field
+from .autodiff import jacobian
 
 
 # ---------------------------------------------------------------------------
@@ -17,12 +25,18 @@ from .fields import ScalarFn, VectorFn, EntropyCap
 # ---------------------------------------------------------------------------
 
 def add_scalar_fields(*fields: ScalarFn) -> ScalarFn:
+    if is_symbolic(*fields):
+        return node("add", "scalar", [symbolic_field(f, "scalar") for f in fields])
+
     def f(x: float, y: float, z: float) -> float:
         return sum(field(x, y, z) for field in fields)
     return f
 
 
 def mul_scalar_fields(*fields: ScalarFn) -> ScalarFn:
+    if is_symbolic(*fields):
+        return node("mul", "scalar", [symbolic_field(f, "scalar") for f in fields])
+
     def f(x: float, y: float, z: float) -> float:
         out = 1.0
         for field in fields:
@@ -32,11 +46,14 @@ def mul_scalar_fields(*fields: ScalarFn) -> ScalarFn:
 
 
 def add_vector_fields(*fields: VectorFn) -> VectorFn:
+    if is_symbolic(*fields):
+        return node("vadd", "vector", [symbolic_field(f, "vector") for f in fields])
+
     def f(x: float, y: float, z: float) -> Vec3:
         out: Vec3 = (0.0, 0.0, 0.0)
         for field in fields:
             out = v_add(out, field(x, y, z))
-        return out
+        return as_vector(out)
     return f
 
 
@@ -45,36 +62,47 @@ def add_vector_fields(*fields: VectorFn) -> VectorFn:
 # ---------------------------------------------------------------------------
 
 def scalar_gradient(field: ScalarFn, eps: float = 1e-3) -> VectorFn:
+    """
+    Exact gradient by forward-mode AD (see rsvp.autodiff); eps is the
+    central-difference step for fields that cannot take Duals.
+    """
+    if is_symbolic(field):
+        return node("grad", "vector", [field], params=(eps,))
+
+    jac = jacobian(field, eps)
+
     def grad(x: float, y: float, z: float) -> Vec3:
-        dx = (field(x + eps, y, z) - field(x - eps, y, z)) / (2.0 * eps)
-        dy = (field(x, y + eps, z) - field(x, y - eps, z)) / (2.0 * eps)
-        dz = (field(x, y, z + eps) - field(x, y, z - eps)) / (2.0 * eps)
-        return (dx, dy, dz)
+        return as_vector(jac(x, y, z)[1])
     return grad
 
 
 def divergence(vector_field: VectorFn, eps: float = 1e-3) -> ScalarFn:
+    """Trace of one Jacobian evaluation (AD, central-difference fallback)."""
+    if is_symbolic(vector_field):
+        return node("div", "scalar", [vector_field], params=(eps,))
+
+    jac = jacobian(vector_field, eps)
+
     def div(x: float, y: float, z: float) -> float:
-        dfx = (vector_field(x + eps, y, z)[0] - vector_field(x - eps, y, z)[0]) / (2.0 * eps)
-        dfy = (vector_field(x, y + eps, z)[1] - vector_field(x, y - eps, z)[1]) / (2.0 * eps)
-        dfz = (vector_field(x, y, z + eps)[2] - vector_field(x, y, z - eps)[2]) / (2.0 * eps)
-        return dfx + dfy + dfz
+        J = jac(x, y, z)[1]
+        return J[0][0] + J[1][1] + J[2][2]
     return div
 
 
 def curl(vector_field: VectorFn, eps: float = 1e-3) -> VectorFn:
+    """Antisymmetric part of one Jacobian evaluation (AD, central-difference fallback)."""
+    if is_symbolic(vector_field):
+        return node("curl", "vector", [vector_field], params=(eps,))
+
+    jac = jacobian(vector_field, eps)
+
     def c(x: float, y: float, z: float) -> Vec3:
-        dFz_dy = (vector_field(x, y + eps, z)[2] - vector_field(x, y - eps, z)[2]) / (2.0 * eps)
-        dFy_dz = (vector_field(x, y, z + eps)[1] - vector_field(x, y, z - eps)[1]) / (2.0 * eps)
-        dFx_dz = (vector_field(x, y, z + eps)[0] - vector_field(x, y, z - eps)[0]) / (2.0 * eps)
-        dFz_dx = (vector_field(x + eps, y, z)[2] - vector_field(x - eps, y, z)[2]) / (2.0 * eps)
-        dFy_dx = (vector_field(x + eps, y, z)[1] - vector_field(x - eps, y, z)[1]) / (2.0 * eps)
-        dFx_dy = (vector_field(x, y + eps, z)[0] - vector_field(x, y - eps, z)[0]) / (2.0 * eps)
-        return (
-            dFz_dy - dFy_dz,
-            dFx_dz - dFz_dx,
-            dFy_dx - dFx_dy,
-        )
+        J = jac(x, y, z)[1]
+        return as_vector((
+            J[2][1] - J[1][2],
+            J[0][2] - J[2][0],
+            J[1][0] - J[0][1],
+        ))
     return c
 
 
@@ -95,18 +123,33 @@ def closure_field(
     Positive values indicate regions where the scalar field is self-sustaining
     against the vector flow — the RSVP 'closure' criterion.
     """
-    grad_phi = scalar_gradient(phi)
-    div_v = divergence(v_field)
+    if is_symbolic(phi, v_field):
+        phi = symbolic_field(phi, "scalar")
+        v_field = symbolic_field(v_field, "vector")
+        return node("add", "scalar", [
+            node("scale", "scalar", [phi], params=(alpha,)),
+            node("scale", "scalar", [divergence(v_field)], params=(-beta,)),
+            node("scale", "scalar", [node("dot", "scalar", [scalar_gradient(phi), v_field])],
+                 params=(gamma,)),
+        ])
+
+    # One Jacobian evaluation each for phi and v gives every term
+    phi_jac = jacobian(phi)
+    v_jac = jacobian(v_field)
 
     def f(x: float, y: float, z: float) -> float:
-        g = grad_phi(x, y, z)
-        adv = v_dot(g, v_field(x, y, z))
-        return alpha * phi(x, y, z) - beta * div_v(x, y, z) + gamma * adv
+        p, g = phi_jac(x, y, z)
+        v, J = v_jac(x, y, z)
+        adv = v_dot(g, v)
+        return alpha * p - beta * (J[0][0] + J[1][1] + J[2][2]) + gamma * adv
 
     return f
 
 
 def capped_field(field: ScalarFn, cap: EntropyCap) -> ScalarFn:
+    if is_symbolic(field):
+        return node("cap", "scalar", [field], params=(cap,))
+
     def f(x: float, y: float, z: float) -> float:
         return cap.apply(field(x, y, z))
     return f
@@ -4,9 +4,14 @@ in a headless bpy script.
 
 These are starting points, not final configurations. Compose your own
 fields from the primitives when a preset's defaults don't match the asset.
+
+Every parameter a preset uses lives in its spec function (frozen
+dataclasses by role); preset_spec(builder) returns it, so cache keys
+change whenever a preset's parameters do.
 """
 
 from __future__ import annotations
+from typing import Callable
 
 from .fields import Basin, DirectionalBias, HarmonicField, EntropyCap
 from .fields import ScalarFn, VectorFn
@@ -15,26 +20,87 @@ from .operators import (
     scalar_gradient, closure_field, capped_field,
 )
 from .terrain import terrain_field
+from .graph import symbolic_field
 from .seams import seam_displacement, seam_obstruction_metric
 
 
-def make_default_rsvp_field() -> tuple[ScalarFn, VectorFn, ScalarFn]:
-    """phi, v_field, closure — a general-purpose coupled field triple."""
+def _leaf(primitive, symbolic: bool):
+    if symbolic:
+        return symbolic_field(primitive)
+    return primitive.vector() if isinstance(primitive, DirectionalBias) else primitive.scalar()
+
+
+# ---------------------------------------------------------------------------
+# Specs
+# ---------------------------------------------------------------------------
+
+def default_rsvp_spec() -> dict[str, object]:
+    return {
+        "basin": Basin(center=(0.0, 0.0, 0.0), amplitude=1.2, radius=1.4),
+        "harmonic": HarmonicField(weights=(0.6, 0.8, 0.3), frequencies=(2.0, 3.0, 4.0), amplitude=0.35),
+        "directional": DirectionalBias(direction=(1.0, 0.2, 0.0), strength=0.8, curl=0.35),
+        "cap": EntropyCap(threshold=1.0, softness=5.0),
+    }
+
+
+def tree_spec() -> dict[str, object]:
+    return {
+        "basin": Basin(center=(0.0, 0.0, 0.2), amplitude=1.0, radius=1.0),
+        "harmonic": HarmonicField(weights=(0.2, 0.2, 0.8), frequencies=(1.5, 1.8, 3.5), amplitude=0.2),
+        "directional": DirectionalBias(direction=(0.0, 0.0, 1.0), strength=1.0, curl=0.25),
+    }
+
+
+def landscape_spec() -> dict[str, object]:
+    return {
+        "basin": Basin(center=(0.0, 0.0, 0.0), amplitude=1.1, radius=1.8),
+        "harmonic": HarmonicField(weights=(1.0, 0.8, 0.0), frequencies=(1.2, 2.6, 0.0), amplitude=0.4),
+        "directional": DirectionalBias(direction=(1.0, 0.25, 0.0), strength=0.6, curl=0.15),
+        "cap": EntropyCap(threshold=1.2, softness=4.5),
+    }
+
+
+def preset_spec(builder: Callable) -> dict[str, object]:
+    """
+    Content of a preset for hashing: the builder's name and its spec.
+    Use this, not the builder, in cache keys.
+    """
+    specs = {
+        make_default_rsvp_field: default_rsvp_spec,
+        make_tree_operators: tree_spec,
+        make_landscape_operators: landscape_spec,
+    }
+    if builder not in specs:
+        raise ValueError(f"{getattr(builder, '__name__', builder)!r} is not a spec'd preset")
+    return {"preset": builder.__name__, **specs[builder]()}
+
+
+# ---------------------------------------------------------------------------
+# Builders
+# ---------------------------------------------------------------------------
+
+def make_default_rsvp_field(symbolic: bool = False) -> tuple[ScalarFn, VectorFn, ScalarFn]:
+    """
+    phi, v_field, closure — a general-purpose coupled field triple.
+
+    symbolic=True returns graph Exprs (see rsvp.graph) instead of closures.
+    """
+    spec = default_rsvp_spec()
     phi = add_scalar_fields(
-        Basin(center=(0.0, 0.0, 0.0), amplitude=1.2, radius=1.4).scalar(),
-        HarmonicField(weights=(0.6, 0.8, 0.3), frequencies=(2.0, 3.0, 4.0), amplitude=0.35).scalar(),
+        _leaf(spec["basin"], symbolic),
+        _leaf(spec["harmonic"], symbolic),
     )
     v_field = add_vector_fields(
-        DirectionalBias(direction=(1.0, 0.2, 0.0), strength=0.8, curl=0.35).vector(),
+        _leaf(spec["directional"], symbolic),
     )
     closure = capped_field(
         closure_field(phi, v_field),
-        EntropyCap(threshold=1.0, softness=5.0),
+        spec["cap"],
     )
     return phi, v_field, closure
 
 
-def make_tree_operators() -> dict[str, object]:
+def make_tree_operators(symbolic: bool = False) -> dict[str, object]:
     """
     Upward-biased field set for tree trunk and branch generation.
 
@@ -43,12 +109,15 @@ def make_tree_operators() -> dict[str, object]:
     vertical trunk bias precisely where it should be strongest. If you want
     canopy-attraction behaviour, blend scalar_gradient(phi) in manually with
     a small weight (0.1–0.2) only in the branch phase, not the trunk phase.
+
+    symbolic=True returns graph Exprs (see rsvp.graph) instead of closures.
     """
+    spec = tree_spec()
     phi = add_scalar_fields(
-        Basin(center=(0.0, 0.0, 0.2), amplitude=1.0, radius=1.0).scalar(),
-        HarmonicField(weights=(0.2, 0.2, 0.8), frequencies=(1.5, 1.8, 3.5), amplitude=0.2).scalar(),
+        _leaf(spec["basin"], symbolic),
+        _leaf(spec["harmonic"], symbolic),
     )
-    v_field = DirectionalBias(direction=(0.0, 0.0, 1.0), strength=1.0, curl=0.25).vector()
+    v_field = _leaf(spec["directional"], symbolic)
     return {
         "phi": phi,
         "v_field": v_field,
@@ -58,13 +127,10 @@ def make_tree_operators() -> dict[str, object]:
 
 
 def make_landscape_operators() -> dict[str, object]:
-    basin = Basin(center=(0.0, 0.0, 0.0), amplitude=1.1, radius=1.8)
-    harmonic = HarmonicField(weights=(1.0, 0.8, 0.0), frequencies=(1.2, 2.6, 0.0), amplitude=0.4)
-    directional = DirectionalBias(direction=(1.0, 0.25, 0.0), strength=0.6, curl=0.15)
-    cap = EntropyCap(threshold=1.2, softness=4.5)
+    spec = landscape_spec()
     return {
-        "terrain": terrain_field(basin, harmonic, directional, cap),
-        "direction": directional.vector(),
+        "terrain": terrain_field(spec["basin"], spec["harmonic"], spec["directional"], spec["cap"]),
+        "direction": spec["directional"].vector(),
     }
 
 
@@ -0,0 +1,394 @@
+"""
+Streaming statistics of fields over random samples.
+
+StreamingStats summarises a stream of values fed in array batches, in one
+pass and constant memory: count, mean and variance (Welford's update,
+batch-merged as in Chan et al.), min/max, a fixed-bin histogram and a KLL
+quantile sketch. Summaries merge exactly (the sketch approximately), so
+batches can be summarised in separate processes and combined.
+
+probe_statistics() draws uniform samples in a box, evaluates fields on
+whole batches as arrays and streams the values into one StreamingStats
+per field, spreading batches across processes. Batch i always draws the
+same points for a given seed and batches merge in order, so results do
+not depend on the number of workers. Samples are pseudo-random or taken
+from scrambled Sobol / Halton sequences (rsvp.qmc), whose even coverage
+gives the same error with far fewer evaluations.
+"""
+
+from __future__ import annotations
+import math
+import os
+from typing import Callable, Mapping, Sequence
+
+from .vec import Vec3
+from .arrays import np
+from .raster import _pool_context
+from .qmc import SEQUENCES
+
+Progress = Callable[[int, dict], None]   # (samples so far, {name: StreamingStats})
+
+
+# ---------------------------------------------------------------------------
+# Summaries
+# ---------------------------------------------------------------------------
+
+class QuantileSketch:
+    """
+    KLL sketch (Karnin, Lang, Liberty): approximate quantiles in O(k)
+    memory, rank error around 1.7 / k. Level h holds items of weight 2^h;
+    a full level is sorted and every other item, from a random offset,
+    moves up a level.
+    """
+
+    def __init__(self, k: int = 256, seed: int = 0):
+        self.k = int(k)
+        self.n = 0
+        self.levels = [np.zeros(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                items = np.sort(items)
+                odd = len(items) % 2
+                keep, pairs = items[:odd], items[odd:]
+                up = pairs[int(self._rng.integers(2))::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], up])
+            h += 1
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, q: float | Sequence[float]):
+        """Value at rank q in [0, 1] (or an array of them); NaN if empty."""
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        weights = np.concatenate([np.full(len(a), 2.0 ** h) for h, a in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cum = np.cumsum(weights[order])
+        idx = np.searchsorted(cum, np.asarray(q, dtype=float) * cum[-1], side="left")
+        out = items[order][np.minimum(idx, len(items) - 1)]
+        return out if np.ndim(q) else float(out)
+
+
+class StreamingStats:
+    """
+    One-pass summary of a stream of floats.
+
+    Args:
+        bins   : histogram bins over range
+        range  : (lo, hi) of the histogram; values outside are counted
+                 as underflow / overflow. None: set from the first batch
+        sketch : KLL sketch size k (0 disables quantiles)
+        seed   : seeds the sketch's compaction offsets
+
+    Non-finite values are counted apart and left out of every estimate.
+    Batches may be tagged with a group, an independent replicate (e.g. one
+    scrambling of a low-discrepancy sequence); with two or more groups,
+    stderr is the spread of the group means, which stays valid when the
+    samples within a group are not independent. Requires NumPy.
+    """
+
+    def __init__(self, bins: int = 64, range: tuple[float, float] | None = None,
+                 sketch: int = 256, seed: int = 0):
+        if np is None:
+            raise RuntimeError("StreamingStats requires NumPy")
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.nonfinite = 0
+        self.bins = int(bins)
+        self.range = None
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.underflow = self.overflow = 0
+        self.groups: dict = {}           # group -> [n, mean]
+        self.sketch = QuantileSketch(sketch, seed) if sketch else None
+        if range is not None:
+            self._set_range(range)
+
+    def _set_range(self, range) -> None:
+        lo, hi = float(range[0]), float(range[1])
+        if not hi > lo:
+            hi = lo + max(abs(lo), 1.0) * 1e-9
+        self.range = (lo, hi)
+
+    def update(self, values, group=None) -> None:
+        """Add a batch of values (any shape), optionally of a replicate group."""
+        values = np.asarray(values, dtype=float).ravel()
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.nonfinite += int((~finite).sum())
+            values = values[finite]
+        n_b = len(values)
+        if not n_b:
+            return
+        if self.range is None:
+            self._set_range((values.min(), values.max()))
+
+        # Chan et al.: merge the batch's (n, mean, M2) into the running one
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        self._combine(n_b, mean_b, m2_b)
+        if group is not None:
+            self._group(group, n_b, mean_b)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        lo, hi = self.range
+        self.underflow += int((values < lo).sum())
+        self.overflow += int((values > hi).sum())
+        inside = values[(values >= lo) & (values <= hi)]
+        self.counts += np.histogram(inside, bins=self.bins, range=self.range)[0]
+        if self.sketch is not None:
+            self.sketch.update(values)
+
+    def _combine(self, n_b: int, mean_b: float, m2_b: float) -> None:
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+
+    def _group(self, group, n_b: int, mean_b: float) -> None:
+        g = self.groups.setdefault(group, [0, 0.0])
+        g[0] += n_b
+        g[1] += (mean_b - g[1]) * n_b / g[0]
+
+    def merge(self, other: StreamingStats) -> None:
+        """Fold in another summary (histograms must share bins and range)."""
+        if other.n:
+            self._combine(other.n, other.mean, other.m2)
+        for group, (n_b, mean_b) in other.groups.items():
+            self._group(group, n_b, mean_b)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.nonfinite += other.nonfinite
+        if self.range is None:
+            self.range = other.range
+        if other.range is not None:
+            if other.range != self.range or other.bins != self.bins:
+                raise ValueError("cannot merge histograms with different bins")
+            self.counts += other.counts
+            self.underflow += other.underflow
+            self.overflow += other.overflow
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+
+    # Estimates -------------------------------------------------------------
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.n if self.n else float("nan")
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.n else float("nan")
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean (from group means, if grouped)."""
+        means = [mean for n, mean in self.groups.values() if n]
+        if len(means) >= 2:
+            return float(np.std(means, ddof=1)) / math.sqrt(len(means))
+        return self.std / math.sqrt(self.n) if self.n else float("nan")
+
+    def quantile(self, q):
+        if self.sketch is None:
+            raise ValueError("quantiles need a sketch (sketch > 0)")
+        return self.sketch.quantile(q)
+
+    def histogram(self):
+        """(counts, bin edges) over range."""
+        lo, hi = self.range if self.range is not None else (0.0, 1.0)
+        return self.counts.copy(), np.linspace(lo, hi, self.bins + 1)
+
+    def summary(self) -> dict:
+        out = {"n": self.n, "min": self.min, "max": self.max, "mean": self.mean,
+               "std": self.std, "stderr": self.stderr, "nonfinite": self.nonfinite}
+        if self.sketch is not None:
+            q = self.quantile([0.01, 0.25, 0.5, 0.75, 0.99])
+            out.update(zip(("q01", "q25", "q50", "q75", "q99"), (float(v) for v in q)))
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Probing fields
+# ---------------------------------------------------------------------------
+
+def _evaluate(fn: Callable, pts, outputs: int):
+    """outputs value arrays at (N, 3) points: one array call, or per point."""
+    n = len(pts)
+    try:
+        out = fn(pts[:, 0], pts[:, 1], pts[:, 2])
+        cols = out if outputs > 1 else (out,)
+        return [np.broadcast_to(np.asarray(c, dtype=float), (n,)) for c in cols]
+    except (TypeError, ValueError):
+        rows = [fn(*p) for p in pts.tolist()]
+        if outputs == 1:
+            return [np.array(rows, dtype=float)]
+        return [np.array(col, dtype=float) for col in zip(*rows)]
+
+
+def _batch_points(index: int, size: int, state: dict):
+    """(points, group) of batch index; QMC batches cycle through replicates."""
+    if state["sampler"] == "random":
+        gen = np.random.default_rng([state["seed"], index])
+        return state["lo"] + gen.random((size, 3)) * state["span"], None
+    group, run = index % state["replicates"], index // state["replicates"]
+    seqs = state.setdefault("sequences", {})
+    if group not in seqs:
+        seqs[group] = SEQUENCES[state["sampler"]]((state["seed"], group))
+    unit = seqs[group].block(run * state["batch"], size)
+    return state["lo"] + unit * state["span"], group
+
+
+# Per-process state set by _init_worker; tasks then only carry batch ranges
+_WORKER: dict = {}
+
+
+def _init_worker(state: dict):
+    _WORKER.update(state)
+
+
+def _summarise(first: int, last: int) -> list:
+    """Merged StreamingStats of batches first..last-1, one per output."""
+    w = _WORKER
+    out = [StreamingStats(w["bins"], r, w["sketch"], seed=w["seed"] + first)
+           for r in w["ranges"]]
+    for index in range(first, last):
+        size = min(w["batch"], w["samples"] - index * w["batch"])
+        pts, group = _batch_points(index, size, w)
+        for s, values in zip(out, _evaluate(w["fn"], pts, len(out))):
+            s.update(values, group)
+    return out
+
+
+def probe_statistics(
+    fields,
+    bounds_min: Vec3 = (-1.0, -1.0, -1.0),
+    bounds_max: Vec3 = (1.0, 1.0, 1.0),
+    samples: int = 1_000_000,
+    batch: int = 1 << 16,
+    workers: int | None = None,
+    seed: int = 0,
+    bins: int = 64,
+    sketch: int = 256,
+    progress: Progress | None = None,
+    sampler: str = "random",
+    replicates: int = 8,
+) -> dict[str, StreamingStats]:
+    """
+    StreamingStats of each field over `samples` uniform points in a box.
+
+    fields is a mapping {name: ScalarFn}, or (names, fn) with fn returning
+    one value per name (e.g. a compile_fields function, so shared leaves
+    are evaluated once). Fields are evaluated on whole batches of points
+    as arrays (per point if they are not array-capable).
+
+    sampler is "random" (NumPy generator per batch) or "sobol" / "halton":
+    then batches cycle through `replicates` independently scrambled
+    sequences (batch shrunk, to a power of two, so each replicate gets
+    one), and stderr comes from the spread of the replicate means.
+
+    Batch 0 is evaluated first, in-process; it fixes each histogram range
+    (its min/max, widened by a tenth each side). The remaining batches
+    are summarised in groups, across `workers` processes (None = one per
+    CPU, <= 1 = in-process), and merged in batch order; progress, if
+    given, is called after each group as progress(samples so far, stats).
+    Requires NumPy.
+    """
+    if np is None:
+        raise RuntimeError("probe_statistics requires NumPy")
+    if sampler != "random" and sampler not in SEQUENCES:
+        raise ValueError(f"unknown sampler {sampler!r}")
+    if isinstance(fields, Mapping):
+        names = list(fields)
+        fns = [fields[k] for k in names]
+        fn = fns[0] if len(fns) == 1 else (lambda x, y, z: tuple(f(x, y, z) for f in fns))
+    else:
+        names, fn = list(fields[0]), fields[1]
+
+    lo = np.array(bounds_min, dtype=float)
+    span = np.array(bounds_max, dtype=float) - lo
+    batch = max(int(batch), 1)
+    replicates = max(int(replicates), 1)
+    if sampler != "random":
+        per = max(samples // replicates, 1)
+        batch = min(batch, 1 << (per.bit_length() - 1))
+    total = max(int(math.ceil(samples / batch)), 1)
+    state = dict(fn=fn, seed=seed, batch=batch, samples=samples, lo=lo, span=span,
+                 sampler=sampler, replicates=replicates)
+
+    pts, group = _batch_points(0, min(batch, samples), state)
+    pilot = _evaluate(fn, pts, len(names))
+    ranges = []
+    for values in pilot:
+        finite = values[np.isfinite(values)]
+        a, b = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+        pad = 0.1 * (b - a) if b > a else 1e-9 * max(abs(a), 1.0)
+        ranges.append((a - pad, b + pad))
+    stats = {name: StreamingStats(bins, r, sketch, seed=seed) for name, r in zip(names, ranges)}
+    for name, values in zip(names, pilot):
+        stats[name].update(values, group)
+    done = min(batch, samples)
+    if progress is not None:
+        progress(done, stats)
+
+    state.update(bins=bins, sketch=sketch, ranges=ranges)
+    state.pop("sequences", None)
+    # Groups small enough to report progress often, large enough to amortise
+    per_task = max(1, min(8, (total - 1) // 32))
+    groups = [(i, min(i + per_task, total)) for i in range(1, total, per_task)]
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = min(workers, len(groups))
+    ctx = _pool_context(fn) if workers > 1 else None
+
+    def fold(first, last, parts):
+        nonlocal done
+        for name, part in zip(names, parts):
+            stats[name].merge(part)
+        done = min(last * batch, samples)
+        if progress is not None:
+            progress(done, stats)
+
+    if ctx is None:
+        _init_worker(state)
+        try:
+            for first, last in groups:
+                fold(first, last, _summarise(first, last))
+        finally:
+            _WORKER.clear()
+        return stats
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(state,)) as pool:
+        futures = [pool.submit(_summarise, first, last) for first, last in groups]
+        for (first, last), fut in zip(groups, futures):
+            fold(first, last, fut.result())
+    return stats
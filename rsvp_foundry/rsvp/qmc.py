@@ -0,0 +1,265 @@
+"""
+Scrambled low-discrepancy sequences: Sobol and Halton.
+
+Both are random.Random subclasses, so they can be passed wherever an rng
+is accepted. random() returns the coordinates of successive points in
+turn (dim per point), so code drawing rng.uniform(...) once per axis gets
+evenly spread points instead of independent ones. points(n) returns whole
+points as an (n, d) array, and block(start, n) any run of the sequence
+without touching the state, for batched and parallel use.
+
+Sequences are randomised by scrambling, deterministic per seed: Sobol by
+hash-based nested uniform (Owen) scrambling (Burley 2020), Halton by
+random digit permutations. Different seeds give independent replicates,
+whose spread estimates the error of a quasi-Monte Carlo mean. Integer
+methods (getrandbits, and anything else not built on random()) come from
+the underlying Mersenne Twister, seeded alike.
+"""
+
+from __future__ import annotations
+import hashlib
+import math
+import os
+import random
+
+from .arrays import np
+
+_BITS = 32
+_MASK = (1 << _BITS) - 1
+_SCALE = 1.0 / (1 << _BITS)
+
+# Sobol primitive polynomials and initial direction numbers (Joe & Kuo,
+# new-joe-kuo-6.21201) for dimensions 2.. ; dimension 1 is van der Corput
+# (s, a, m_1..m_s)
+_SOBOL_TABLE = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+)
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53)
+
+
+def _directions(s: int, a: int, m: tuple[int, ...]) -> list[int]:
+    """_BITS direction numbers v_k = m_k << (_BITS - k) of one dimension."""
+    m = list(m)
+    for k in range(s, _BITS):
+        value = m[k - s] ^ (m[k - s] << s)
+        for j in range(1, s):
+            if (a >> (s - 1 - j)) & 1:
+                value ^= m[k - j] << j
+        m.append(value)
+    return [mk << (_BITS - 1 - k) for k, mk in enumerate(m[:_BITS])]
+
+
+_SOBOL_DIRECTIONS = [[1 << (_BITS - 1 - k) for k in range(_BITS)]] + [
+    _directions(*row) for row in _SOBOL_TABLE
+]
+
+
+def _seed_words(seed, count: int) -> list[int]:
+    """count 32-bit words derived from seed (any int, str, bytes or tuple)."""
+    if seed is None:
+        seed = os.urandom(16)
+    text = seed if isinstance(seed, bytes) else repr(seed).encode("utf-8")
+    words, counter = [], 0
+    while len(words) < count:
+        digest = hashlib.sha256(text + counter.to_bytes(4, "little")).digest()
+        words.extend(int.from_bytes(digest[i:i + 4], "little") for i in range(0, 32, 4))
+        counter += 1
+    return words[:count]
+
+
+def _reverse_bits(x: int) -> int:
+    return int(format(x, "032b")[::-1], 2)
+
+
+def _owen(x: int, seed: int) -> int:
+    """Nested uniform scramble of a 32-bit fraction (Laine-Karras hash)."""
+    x = _reverse_bits(x)
+    x = (x + seed) & _MASK
+    x ^= (x * 0x6C50B47C) & _MASK
+    x ^= (x * 0xB82F1E52) & _MASK
+    x ^= (x * 0xC7AFE638) & _MASK
+    x ^= (x * 0x8D22F6E6) & _MASK
+    return _reverse_bits(x)
+
+
+def _owen_array(x, seed: int):
+    x = _reverse_bits_array(x)
+    x = x + np.uint32(seed)
+    for c in (0x6C50B47C, 0xB82F1E52, 0xC7AFE638, 0x8D22F6E6):
+        x ^= x * np.uint32(c)
+    return _reverse_bits_array(x)
+
+
+def _reverse_bits_array(x):
+    x = ((x >> np.uint32(1)) & np.uint32(0x55555555)) | ((x & np.uint32(0x55555555)) << np.uint32(1))
+    x = ((x >> np.uint32(2)) & np.uint32(0x33333333)) | ((x & np.uint32(0x33333333)) << np.uint32(2))
+    x = ((x >> np.uint32(4)) & np.uint32(0x0F0F0F0F)) | ((x & np.uint32(0x0F0F0F0F)) << np.uint32(4))
+    x = ((x >> np.uint32(8)) & np.uint32(0x00FF00FF)) | ((x & np.uint32(0x00FF00FF)) << np.uint32(8))
+    return (x >> np.uint32(16)) | (x << np.uint32(16))
+
+
+# ---------------------------------------------------------------------------
+# Sequences
+# ---------------------------------------------------------------------------
+
+class LowDiscrepancy(random.Random):
+    """
+    Base for scrambled sequences: point i, coordinate j is _coordinate(i, j)
+    (scalar) or _coordinates(indices, j) (NumPy). Subclasses set max_dim.
+    """
+
+    max_dim = 0
+
+    def __init__(self, seed=0, dim: int = 3):
+        if not 1 <= dim <= self.max_dim:
+            raise ValueError(f"{type(self).__name__} supports 1..{self.max_dim} dimensions")
+        self.dim = dim
+        super().__init__(seed)
+
+    def seed(self, a=None, version: int = 2) -> None:
+        """Rescramble from a and restart at point 0."""
+        self._seed = a
+        self._scramble(a)
+        self.index = 0
+        self.position = 0
+        super().seed(a if isinstance(a, (int, float, str, bytes, bytearray, type(None)))
+                     else repr(a), version)
+
+    def _scramble(self, a) -> None:
+        raise NotImplementedError
+
+    def random(self) -> float:
+        """Next coordinate: axis position of point index, then advance."""
+        u = self._coordinate(self.index, self.position)
+        self.position += 1
+        if self.position == self.dim:
+            self.position = 0
+            self.index += 1
+        return u
+
+    def block(self, start: int, n: int, dim: int | None = None):
+        """Points start..start+n-1 as an (n, dim) array (list of tuples without NumPy)."""
+        dim = self.dim if dim is None else dim
+        if dim > self.max_dim:
+            raise ValueError(f"{type(self).__name__} supports 1..{self.max_dim} dimensions")
+        if np is None:
+            return [tuple(self._coordinate(i, j) for j in range(dim))
+                    for i in range(start, start + n)]
+        indices = np.arange(start, start + n, dtype=np.uint64)
+        out = np.empty((n, dim))
+        for j in range(dim):
+            out[:, j] = self._coordinates(indices, j)
+        return out
+
+    def points(self, n: int, dim: int | None = None):
+        """Next n whole points (a partly drawn point is skipped)."""
+        if self.position:
+            self.index += 1
+            self.position = 0
+        out = self.block(self.index, n, dim)
+        self.index += n
+        return out
+
+    def getstate(self):
+        version, state, gauss = super().getstate()
+        return (type(self).__name__, (self.index, self.position, self.dim, *state),
+                (gauss, self._seed))
+
+    def setstate(self, state) -> None:
+        _, values, (gauss, seed) = state
+        index, position, dim, *mt = values
+        if seed != self._seed:
+            self._seed = seed
+            self._scramble(seed)
+        self.index, self.position, self.dim = int(index), int(position), int(dim)
+        super().setstate((random.Random.VERSION, tuple(mt), gauss))
+
+
+class Sobol(LowDiscrepancy):
+    """
+    Owen-scrambled Sobol sequence (up to 16 dimensions). Every power-of-two
+    run of points aligned to a multiple of its length is a (t, m, s)-net:
+    statistics are best at sample counts 2^k.
+    """
+
+    max_dim = len(_SOBOL_DIRECTIONS)
+
+    def _scramble(self, a) -> None:
+        self._keys = _seed_words(("sobol", a), self.max_dim)
+
+    def _coordinate(self, i: int, j: int) -> float:
+        if i >> _BITS:
+            raise OverflowError("Sobol sequence exhausted (2^32 points)")
+        x, v = 0, _SOBOL_DIRECTIONS[j]
+        k = 0
+        while i:
+            if i & 1:
+                x ^= v[k]
+            i >>= 1
+            k += 1
+        return _owen(x, self._keys[j]) * _SCALE
+
+    def _coordinates(self, indices, j: int):
+        if len(indices) and int(indices[-1]) >> _BITS:
+            raise OverflowError("Sobol sequence exhausted (2^32 points)")
+        x = np.zeros(len(indices), dtype=np.uint32)
+        for k, vk in enumerate(_SOBOL_DIRECTIONS[j]):
+            high = indices >> np.uint64(k)
+            if not high.any():
+                break
+            x[(high & np.uint64(1)).astype(bool)] ^= np.uint32(vk)
+        return _owen_array(x, self._keys[j]) * _SCALE
+
+
+class Halton(LowDiscrepancy):
+    """
+    Halton sequence (up to 16 dimensions, prime bases 2..53) with an
+    independent random permutation of the digits at each position.
+    """
+
+    max_dim = len(_PRIMES)
+
+    def _scramble(self, a) -> None:
+        gen = random.Random(_seed_words(("halton", a), 1)[0])
+        self._perms = []
+        for b in _PRIMES:
+            digits = math.ceil(53 / math.log2(b))
+            self._perms.append([gen.sample(range(b), b) for _ in range(digits)])
+
+    def _coordinate(self, i: int, j: int) -> float:
+        b = _PRIMES[j]
+        u, scale = 0.0, 1.0 / b
+        for perm in self._perms[j]:
+            i, d = divmod(i, b)
+            u += perm[d] * scale
+            scale /= b
+        return min(u, 1.0 - 2.0 ** -53)
+
+    def _coordinates(self, indices, j: int):
+        b = np.uint64(_PRIMES[j])
+        u = np.zeros(len(indices))
+        scale = 1.0 / _PRIMES[j]
+        i = indices.copy()
+        for perm in self._perms[j]:
+            u += np.asarray(perm, dtype=float)[(i % b).astype(np.intp)] * scale
+            i //= b
+            scale /= _PRIMES[j]
+        return np.minimum(u, 1.0 - 2.0 ** -53)
+
+
+SEQUENCES = {"sobol": Sobol, "halton": Halton}
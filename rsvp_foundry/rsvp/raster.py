@@ -0,0 +1,262 @@
+"""
+Tiled, process-parallel rasterisation of fields onto regular grids.
+
+The grid is cut into tiles that are evaluated independently, optionally
+across a process pool, and written into one shared float32 (by default)
+array. Tiles are the unit of caching and progress reporting.
+
+Fields reach worker processes in one of three ways: inherited as-is where
+the "fork" start method exists (closures included), pickled if they can
+be, or rebuilt from a FieldRecipe (a module-level builder plus picklable
+dataclass specs). Failing all three, tiles are evaluated in-process.
+Results never depend on the number of workers.
+"""
+
+from __future__ import annotations
+import itertools
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Callable, MutableMapping, Sequence
+
+from .vec import lerp
+from .fields import ScalarFn
+from .arrays import np, evaluate_grid
+
+Progress = Callable[[int, int], None]   # (tiles done, tiles total)
+
+
+@dataclass(frozen=True)
+class FieldRecipe:
+    """
+    Picklable description of a field: builder(*args), optionally indexed
+    by key (for builders that return a dict of operators). Args that are
+    FieldRecipes are built first, so compositions nest:
+
+        FieldRecipe(add_scalar_fields, (
+            FieldRecipe(make_landscape_operators, key="terrain"),
+            FieldRecipe(HarmonicField.scalar, (extra_spec,)),
+        ))
+
+    The builder must be importable by name (a module-level function or
+    method). A recipe is itself a ScalarFn; it builds its field on first use.
+    """
+    builder: Callable
+    args: tuple = ()
+    key: str | None = None
+
+    def build(self) -> ScalarFn:
+        args = [a.build() if isinstance(a, FieldRecipe) else a for a in self.args]
+        out = self.builder(*args)
+        return out[self.key] if self.key is not None else out
+
+    def __call__(self, x, y, z):
+        fn = self.__dict__.get("_fn")
+        if fn is None:
+            fn = self.build()
+            object.__setattr__(self, "_fn", fn)
+        return fn(x, y, z)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k != "_fn"}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+def _axis(lo: float, hi: float, n: int) -> list[float]:
+    return [lerp(lo, hi, i / max(n - 1, 1)) for i in range(n)]
+
+
+def _tiles(shape: tuple[int, ...], tile: tuple[int, ...]) -> list[tuple[slice, ...]]:
+    """Row-major list of tile index windows covering shape."""
+    ranges = [
+        [slice(i, min(i + t, n)) for i in range(0, n, t)]
+        for n, t in zip(shape, tile)
+    ]
+    return list(itertools.product(*ranges))
+
+
+def _evaluate_tile(field: ScalarFn, axes, fixed, scale: float):
+    """One tile as float64: broadcast if the field allows, else per point."""
+    values = evaluate_grid(field, axes, fixed)
+    if values is not None:
+        return scale * values
+    out = np.empty(tuple(len(a) for a in axes))
+    for idx in itertools.product(*(range(len(a)) for a in axes)):
+        out[idx] = scale * field(*(a[i] for a, i in zip(axes, idx)), *fixed)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+# Per-process state set by _init_worker; tasks then only carry tile windows
+_WORKER: dict = {}
+
+
+def _init_worker(field, shm_name, shape, dtype, axes, fixed, scale):
+    from multiprocessing import shared_memory
+    if isinstance(field, FieldRecipe):
+        field = field.build()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER.update(
+        field=field, shm=shm, axes=axes, fixed=fixed, scale=scale,
+        out=np.ndarray(shape, dtype=dtype, buffer=shm.buf),
+    )
+
+
+def _render_tile(window: tuple[slice, ...]) -> tuple[slice, ...]:
+    w = _WORKER
+    axes = [a[s] for a, s in zip(w["axes"], window)]
+    w["out"][window] = _evaluate_tile(w["field"], axes, w["fixed"], w["scale"])
+    return window
+
+
+def _pool_context(field):
+    """Multiprocessing context able to hand field to workers, or None."""
+    import multiprocessing as mp
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    try:
+        pickle.dumps(field)
+    except Exception:
+        return None
+    return mp.get_context()
+
+
+# ---------------------------------------------------------------------------
+# Rasterisers
+# ---------------------------------------------------------------------------
+
+def rasterize_grid(
+    field: ScalarFn,
+    axes: Sequence[Sequence[float]],
+    fixed: Sequence[float] = (),
+    scale: float = 1.0,
+    tile: int | Sequence[int] = 256,
+    workers: int | None = None,
+    progress: Progress | None = None,
+    cache: MutableMapping | None = None,
+    cache_key: object = None,
+    dtype=None,
+):
+    """
+    Evaluate scale * field over the tensor grid of 1-D coordinate axes.
+
+    Args:
+        axes      : coordinates along each leading argument, as for evaluate_grid
+        fixed     : trailing constant arguments (e.g. z=0.0 for a height map)
+        tile      : tile edge in samples, int or one per axis
+        workers   : processes; None = one per CPU, <= 1 = in-process
+        progress  : called as progress(done, total) after each tile
+        cache     : mapping reused across calls; finished tiles are stored
+                    in it and matching tiles are copied out instead of
+                    re-evaluated
+        cache_key : identifies the field in cache keys (default: the field
+                    object itself, which is stable for FieldRecipes and
+                    dataclass primitives and per-object otherwise)
+        dtype     : output dtype (default float32)
+
+    Returns an ndarray of shape (len(axes[0]), len(axes[1]), ...).
+    Requires NumPy.
+    """
+    if np is None:
+        raise RuntimeError("rasterize_grid requires NumPy")
+    dtype = np.dtype(np.float32 if dtype is None else dtype)
+    axes = [np.asarray(a, dtype=float) for a in axes]
+    fixed = tuple(fixed)
+    shape = tuple(len(a) for a in axes)
+    if isinstance(tile, int):
+        tile = (tile,) * len(shape)
+    windows = _tiles(shape, tuple(max(int(t), 1) for t in tile))
+    total = len(windows)
+    out = np.empty(shape, dtype=dtype)
+
+    token = field if cache_key is None else cache_key
+
+    def key(window):
+        span = tuple((float(a[s][0]), float(a[s][-1]), len(a[s])) for a, s in zip(axes, window))
+        return (token, span, fixed, float(scale), dtype.str)
+
+    # Cache hits first; the rest is the work list
+    done = 0
+    todo = []
+    for window in windows:
+        hit = cache.get(key(window)) if cache is not None else None
+        if hit is not None:
+            out[window] = hit
+            done += 1
+            if progress is not None:
+                progress(done, total)
+        else:
+            todo.append(window)
+
+    def finish(window):
+        nonlocal done
+        if cache is not None:
+            cache[key(window)] = out[window].copy()
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = min(workers, len(todo))
+    ctx = _pool_context(field) if workers > 1 else None
+
+    if ctx is None:
+        for window in todo:
+            sub = [a[s] for a, s in zip(axes, window)]
+            out[window] = _evaluate_tile(field, sub, fixed, scale)
+            finish(window)
+        return out
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(out.nbytes, 1))
+    try:
+        shared = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        init = (field, shm.name, shape, dtype, axes, fixed, scale)
+        with ProcessPoolExecutor(workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=init) as pool:
+            futures = [pool.submit(_render_tile, w) for w in todo]
+            for fut in as_completed(futures):
+                window = fut.result()
+                out[window] = shared[window]
+                finish(window)
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+    return out
+
+
+def rasterize_height_map(
+    field: ScalarFn,
+    nx: int,
+    ny: int,
+    bounds_min: tuple[float, float] = (-1.0, -1.0),
+    bounds_max: tuple[float, float] = (1.0, 1.0),
+    z_scale: float = 1.0,
+    **options,
+):
+    """
+    Height map of field at z=0 as an (nx, ny) array. Options are those of
+    rasterize_grid (tile, workers, progress, cache, cache_key, dtype).
+    """
+    xs = _axis(bounds_min[0], bounds_max[0], nx)
+    ys = _axis(bounds_min[1], bounds_max[1], ny)
+    return rasterize_grid(field, (xs, ys), fixed=(0.0,), scale=z_scale, **options)
+
+
+def rasterize_scalar_grid(field: ScalarFn, grid, **options):
+    """
+    Field on a GridSpec as an (nx, ny, nz) array. Options are those of
+    rasterize_grid; tiles default to 64 samples per axis.
+    """
+    options.setdefault("tile", 64)
+    axes = [_axis(lo, hi, n) for lo, hi, n in
+            zip(grid.bounds_min, grid.bounds_max, (grid.nx, grid.ny, grid.nz))]
+    return rasterize_grid(field, axes, **options)
@@ -6,11 +6,16 @@ lists that Blender scripts can iterate over.
 """
 
 from __future__ import annotations
+import math
 import random
 from dataclasses import dataclass
 
 from .vec import Vec3, lerp
 from .fields import ScalarFn
+from .arrays import np, evaluate_grid
+from .raster import rasterize_scalar_grid
+from .interval import prune_boxes
+from .qmc import LowDiscrepancy
 
 
 @dataclass(frozen=True)
@@ -23,24 +28,22 @@ class GridSpec:
 
 
 def sample_scalar_grid(field: ScalarFn, grid: GridSpec) -> list[list[list[float]]]:
-    """Evaluate field on a regular 3-D grid. Returns [ix][iy][iz] indexing."""
+    """
+    Evaluate field on a regular 3-D grid. Returns [ix][iy][iz] indexing.
+
+    List form of rasterize_scalar_grid (float64, in-process); without
+    NumPy, one call per grid point.
+    """
+    if np is not None:
+        return rasterize_scalar_grid(field, grid, workers=1, dtype=float).tolist()
+
     xmin, ymin, zmin = grid.bounds_min
     xmax, ymax, zmax = grid.bounds_max
+    xs = [lerp(xmin, xmax, ix / max(grid.nx - 1, 1)) for ix in range(grid.nx)]
+    ys = [lerp(ymin, ymax, iy / max(grid.ny - 1, 1)) for iy in range(grid.ny)]
+    zs = [lerp(zmin, zmax, iz / max(grid.nz - 1, 1)) for iz in range(grid.nz)]
 
-    return [
-        [
-            [
-                field(
-                    lerp(xmin, xmax, ix / max(grid.nx - 1, 1)),
-                    lerp(ymin, ymax, iy / max(grid.ny - 1, 1)),
-                    lerp(zmin, zmax, iz / max(grid.nz - 1, 1)),
-                )
-                for iz in range(grid.nz)
-            ]
-            for iy in range(grid.ny)
-        ]
-        for ix in range(grid.nx)
-    ]
+    return [[[field(x, y, z) for z in zs] for y in ys] for x in xs]
 
 
 def seed_points_from_field(
@@ -57,6 +60,7 @@ def seed_points_from_field(
 
     Returns however many points were found within max_tries attempts —
     callers should check len(result) == count if exact count is required.
+    With a Sobol or Halton rng (dim 3) the candidates are evenly spread.
     """
     rng = rng or random.Random()
     out: list[Vec3] = []
@@ -71,3 +75,412 @@ def seed_points_from_field(
             out.append((x, y, z))
 
     return out
+
+
+# Subdivision depth of the interval pruning seed_points_importance falls
+# back on when the pilot block shows low acceptance
+_PRUNE_DEPTH = 6
+
+
+def _linspace(lo: float, hi: float, n: int) -> list[float]:
+    return [lerp(lo, hi, i / max(n - 1, 1)) for i in range(n)]
+
+
+def _admissible_cells(field, bounds_min, bounds_max, cells, threshold):
+    """
+    Cells of a coarse grid that may contain field >= threshold.
+
+    The field is sampled at cell corners. A cell is admissible if its
+    largest corner value plus half its corner spread reaches the threshold
+    (peaks rarely rise further than that between corners), and admissible
+    cells are dilated by one cell. Returns (lo, cell size, (M, 3) cell
+    indices, corner evaluations), or None if the field is not
+    array-capable.
+    """
+    shape = tuple(1 if hi <= lo else n for lo, hi, n in zip(bounds_min, bounds_max, cells))
+    axes = [_linspace(lo, hi, n + 1) if n > 1 else [lo]
+            for lo, hi, n in zip(bounds_min, bounds_max, shape)]
+    corners = evaluate_grid(field, axes)
+    if corners is None:
+        return None
+
+    # Corner samples -> per-cell max / min, one axis at a time
+    hi_v, lo_v = corners, corners
+    for axis, n in enumerate(shape):
+        if n > 1:
+            a, b = range(n), range(1, n + 1)
+            hi_v = np.maximum(hi_v.take(a, axis=axis), hi_v.take(b, axis=axis))
+            lo_v = np.minimum(lo_v.take(a, axis=axis), lo_v.take(b, axis=axis))
+    hit = hi_v + 0.5 * (hi_v - lo_v) >= threshold
+
+    grown = hit.copy()
+    for axis, n in enumerate(shape):
+        if n > 1:
+            ahead = [slice(None)] * 3
+            behind = [slice(None)] * 3
+            ahead[axis], behind[axis] = slice(1, None), slice(None, -1)
+            grown[tuple(ahead)] |= hit[tuple(behind)]
+            grown[tuple(behind)] |= hit[tuple(ahead)]
+
+    lo = np.array(bounds_min, dtype=float)
+    size = (np.array(bounds_max, dtype=float) - lo) / np.array(shape)
+    return lo, size, np.argwhere(grown), corners.size
+
+
+def seed_points_importance(
+    field: ScalarFn,
+    count: int,
+    bounds_min: Vec3 = (-1.0, -1.0, -1.0),
+    bounds_max: Vec3 = (1.0, 1.0, 1.0),
+    threshold: float = 0.0,
+    rng: random.Random | None = None,
+    grid: int | tuple[int, int, int] | None = 32,
+    block: int = 1024,
+    max_evaluations: int = 10_000_000,
+    stats: dict | None = None,
+    intervals: int | None = None,
+) -> list[Vec3]:
+    """
+    Batch version of seed_points_from_field that returns exactly `count`
+    points (unless the admissible region is empty or max_evaluations runs
+    out).
+
+    Candidates are drawn in blocks and the field is evaluated on each
+    block as arrays; the first, pilot block holds min(block, 4 * count)
+    candidates. With grid set and the pilot's acceptance so low that
+    finishing uniformly would cost more evaluations than the grid's
+    corners, further candidates are drawn from a narrowed region, so
+    tight thresholds stop wasting evaluations on empty space.
+
+    Fields with interval bounds are narrowed by prune_boxes (depth
+    _PRUNE_DEPTH): boxes where the bounds prove the field stays below the
+    threshold are discarded, boxes proven above it accept their
+    candidates without evaluating the field, and only the remaining boxes
+    are rejection-sampled. This never misses part of the region. Other
+    fields are sampled at the corners of a coarse grid, keeping only
+    cells that may reach the threshold. That test is a heuristic which
+    can miss peaks narrower than a cell, so sampling stays uniform if it
+    admits no cell or excludes a cell the pilot found points in.
+
+    Accepted points are uniform over the thresholded region, as with
+    rejection sampling, apart from any sub-cell peak the corner test
+    misses. With intervals set (a subdivision depth), prune_boxes runs up
+    front at that depth instead of after the pilot; fields without
+    interval bounds then fall back to grid.
+
+    Deterministic per rng state: one getrandbits(64) draw from rng seeds
+    the block generator. A Sobol or Halton rng supplies the candidates
+    itself instead, as 4-D points (the first coordinate picks the cell or
+    box), so seeds cover the region evenly. If stats is a dict it receives
+    evaluations, grid_evaluations (corners sampled or boxes bounded, 0
+    if the region was not narrowed), candidates, accepted,
+    acceptance_rate and admissible_fraction.
+    """
+    rng = rng or random.Random()
+    if np is None:
+        out = seed_points_from_field(field, count, bounds_min, bounds_max, threshold,
+                                     max_evaluations, rng)
+        if stats is not None:
+            stats.update(evaluations=None, grid_evaluations=0, candidates=None,
+                         accepted=len(out), acceptance_rate=None, admissible_fraction=1.0)
+        return out
+
+    qmc = isinstance(rng, LowDiscrepancy)
+    gen = None if qmc else np.random.default_rng(rng.getrandbits(64))
+    lo = np.array(bounds_min, dtype=float)
+    size = np.array(bounds_max, dtype=float) - lo
+    cells = boxes = None
+    grid_evals = 0
+    admissible = 1.0
+
+    if intervals:
+        boxes = _pruned_boxes(field, bounds_min, bounds_max, threshold, intervals)
+        if boxes is not None:
+            box_lo, box_hi, inside, weight, grid_evals, admissible = boxes
+            grid = None
+
+    # The region is only narrowed if the pilot block shows it would pay
+    if grid and isinstance(grid, int):
+        grid = (grid, grid, grid)
+    pending = grid if grid and boxes is None else None
+    shape = np.array([1 if hi <= l else g for l, hi, g in
+                      zip(bounds_min, bounds_max, grid)]) if pending else None
+
+    points = []
+    evaluations = grid_evals
+    candidates = accepted = hits = 0
+    since_candidates = since_hits = 0
+    n = max(min(int(block), 4 * count), 1)
+    while (accepted < count and evaluations < max_evaluations
+           and (cells is None or len(cells)) and (boxes is None or len(weight))):
+        n = min(n, max_evaluations - evaluations)
+        if boxes is not None:
+            # Box by volume, then uniform in it; proven boxes skip the field
+            u = rng.points(n, 4) if qmc else None
+            a = u[:, 0] if qmc else gen.random(n)
+            pick = np.searchsorted(weight, a * weight[-1], side="right")
+            pick = np.minimum(pick, len(weight) - 1)
+            offset = u[:, 1:] if qmc else gen.random((n, 3))
+            pts = box_lo[pick] + offset * (box_hi - box_lo)[pick]
+            ok = inside[pick].copy()
+            test = ~ok
+            if test.any():
+                ok[test] = _evaluate_points(field, pts[test]) >= threshold
+            keep = pts[ok]
+            evaluations += int(test.sum())
+        elif cells is None:
+            pts = lo + (rng.points(n, 3) if qmc else gen.random((n, 3))) * size
+            keep = pts[_evaluate_points(field, pts) >= threshold]
+            evaluations += n
+        else:
+            if qmc:
+                u = rng.points(n, 4)
+                pick = cells[np.minimum((u[:, 0] * len(cells)).astype(np.intp), len(cells) - 1)]
+                pts = lo + (pick + u[:, 1:]) * size
+            else:
+                pick = cells[gen.integers(0, len(cells), n)]
+                pts = lo + (pick + gen.random((n, 3))) * size
+            keep = pts[_evaluate_points(field, pts) >= threshold]
+            evaluations += n
+        candidates += n
+        hits += len(keep)
+        since_candidates += n
+        since_hits += len(keep)
+        take = keep[:count - accepted]
+        points.extend(tuple(p) for p in take.tolist())
+        accepted += len(take)
+
+        if pending and accepted < count:
+            corner_count = np.prod([1 if hi <= l else g + 1 for l, hi, g in
+                                    zip(bounds_min, bounds_max, pending)])
+            if not hits or (count - accepted) * candidates / hits > corner_count:
+                # Interval bounds first: they never discard part of the region
+                boxes = None if intervals else _pruned_boxes(
+                    field, bounds_min, bounds_max, threshold, _PRUNE_DEPTH)
+                found = None
+                if boxes is not None:
+                    box_lo, box_hi, inside, weight, grid_evals, admissible = boxes
+                    evaluations += grid_evals
+                else:
+                    found = _admissible_cells(field, bounds_min, bounds_max, pending, threshold)
+                if found is not None:
+                    cell_lo, cell_size, cell_index, grid_evals = found
+                    evaluations += grid_evals
+                    # The corner test can miss peaks narrower than a cell:
+                    # keep drawing uniformly if it admits nothing or drops
+                    # a cell the pilot already found points in
+                    admitted = np.zeros(tuple(shape), dtype=bool)
+                    admitted[tuple(cell_index.T)] = True
+                    seen = ((keep - cell_lo) / np.where(cell_size > 0, cell_size, 1.0)).astype(np.intp)
+                    seen = np.clip(seen, 0, shape - 1)
+                    if len(cell_index) and admitted[tuple(seen.T)].all():
+                        lo, size, cells = cell_lo, cell_size, cell_index
+                        admissible = float(len(cells) / shape.prod())
+                if boxes is not None or cells is not None:
+                    # The new region accepts at a new rate: pilot it afresh
+                    since_candidates = since_hits = 0
+                    n = max(min(int(block), 4 * (count - accepted)), 1)
+                    pending = None
+                    continue
+        pending = None
+
+        # Size the next block from the acceptance rate seen so far
+        rate = max(since_hits, 1) / since_candidates
+        n = int(min(max((count - accepted) / rate * 1.2, 64), 1 << 16))
+
+    if stats is not None:
+        stats.update(
+            evaluations=evaluations,
+            grid_evaluations=grid_evals,
+            candidates=candidates,
+            accepted=accepted,
+            acceptance_rate=hits / candidates if candidates else 0.0,
+            admissible_fraction=admissible,
+        )
+    return points
+
+
+def _pruned_boxes(field, bounds_min, bounds_max, threshold, depth):
+    """
+    prune_boxes for seeding: (box_lo, box_hi, inside, cumulative box
+    volume, boxes bounded, kept volume fraction), or None if the field has
+    no interval bounds.
+    """
+    prune: dict = {}
+    found = prune_boxes(field, bounds_min, bounds_max, lower=threshold,
+                        depth=depth, stats=prune)
+    if found is None:
+        return None
+    box_lo, box_hi, inside = found
+    free = [i for i in range(3) if bounds_max[i] > bounds_min[i]]
+    weight = np.cumsum(np.prod((box_hi - box_lo)[:, free], axis=1))
+    return box_lo, box_hi, inside, weight, prune["boxes"], prune["volume_fraction"]
+
+
+def _evaluate_points(field: ScalarFn, pts):
+    """Field values at (N, 3) points: one array call, or per point."""
+    try:
+        values = np.asarray(field(pts[:, 0], pts[:, 1], pts[:, 2]), dtype=float)
+        return np.broadcast_to(values, (pts.shape[0],))
+    except (TypeError, ValueError):
+        return np.array([field(*p) for p in pts.tolist()])
+
+
+def poisson_disk_points(
+    bounds_min: Vec3 = (-1.0, -1.0, -1.0),
+    bounds_max: Vec3 = (1.0, 1.0, 1.0),
+    radius: float = 0.1,
+    max_radius: float | None = None,
+    density_field: ScalarFn | None = None,
+    density_range: tuple[float, float] = (0.0, 1.0),
+    field: ScalarFn | None = None,
+    threshold: float = 0.0,
+    k: int = 10,
+    max_points: int | None = None,
+    rng: random.Random | None = None,
+    stats: dict | None = None,
+) -> list[Vec3]:
+    """
+    Blue-noise (Poisson-disk) points in a box.
+
+    Points are at least `radius` apart. With density_field and max_radius
+    the spacing varies per point: density_range[1] or more gives radius,
+    density_range[0] or less gives max_radius, linear in between; two
+    points keep the mean of their radii apart. With field set, only
+    points where field >= threshold are kept. Axes with min == max are
+    held fixed (a plane in 3-D space).
+
+    Like Bridson's sampler this keeps a uniform hash grid of cell size
+    radius / sqrt(d), at most one point per cell, so a spacing check reads
+    a fixed neighbourhood of cells. Darts are thrown into empty cells in
+    phase groups (cells at least max_radius apart), so a whole group is
+    checked and inserted as one array operation without in-group
+    conflicts. A cell is retired after k failed darts, as Bridson retires
+    an active point after k failed candidates (k=10 leaves no gap wider
+    than ~1.1 radius). With field set, cells that cannot reach the
+    threshold (coarse corner test, as in seed_points_importance) are
+    retired up front. Requires NumPy.
+
+    Deterministic per rng state. If stats is a dict it receives points,
+    darts, evaluations and rounds.
+    """
+    if np is None:
+        raise ImportError("poisson_disk_points requires NumPy")
+    rng = rng or random.Random()
+    gen = np.random.default_rng(rng.getrandbits(64))
+
+    lo3 = np.array(bounds_min, dtype=float)
+    hi3 = np.array(bounds_max, dtype=float)
+    axes = [i for i in range(3) if hi3[i] > lo3[i]]
+    d = len(axes)
+    if d == 0:
+        return [tuple(bounds_min)]
+    r_min = float(radius)
+    varying = density_field is not None and max_radius is not None and max_radius > r_min
+    r_max = float(max_radius) if varying else r_min
+
+    lo, hi = lo3[axes], hi3[axes]
+    cell = r_min / math.sqrt(d)
+    shape = np.array([int(math.ceil((b - a) / cell)) for a, b in zip(lo, hi)])
+    reach = int(math.ceil(r_max / cell))
+
+    # Hash grid padded by `reach` ghost cells per side, so every
+    # neighbourhood lookup is a valid flat index. Empty cells hold a point
+    # at "infinity", which never conflicts.
+    padded = shape + 2 * reach
+    strides = np.cumprod(np.concatenate([[1], padded[::-1][:-1]]))[::-1]
+    span = np.arange(-reach, reach + 1)
+    offsets = np.stack(np.meshgrid(*([span] * d), indexing="ij"), axis=-1).reshape(-1, d)
+    # Drop neighbour cells whose nearest approach is already >= r_max
+    gap = np.maximum(np.abs(offsets) - 1, 0) * cell
+    offsets = offsets[(gap * gap).sum(axis=1) < r_max * r_max]
+    neighbours = offsets @ strides
+
+    pts = np.full((d, int(np.prod(padded))), 1e30)   # per-axis columns gather faster
+    rad = np.zeros(pts.shape[1])
+    filled = np.zeros(pts.shape[1], dtype=bool)
+
+    coords = np.stack(np.unravel_index(np.arange(int(np.prod(shape))), tuple(shape)), axis=1)
+    slots = (coords + reach) @ strides
+    misses = np.zeros(len(coords), dtype=np.int64)
+    taken = np.zeros(len(coords), dtype=bool)
+    phase = ((coords % (reach + 1)) * (reach + 1) ** np.arange(d)).sum(axis=1)
+    # Phase groups, split into chunks so neighbourhood temporaries stay small
+    chunk = max(4096, (1 << 18) // len(neighbours))
+    groups = [part for g in range((reach + 1) ** d)
+              for cells in [np.flatnonzero(phase == g)]
+              for part in np.array_split(cells, max(1, len(cells) // chunk))]
+
+    limit = max_points if max_points is not None else len(coords)
+    count = darts = evaluations = rounds = 0
+
+    # Retire cells that cannot reach the threshold before throwing darts
+    if field is not None:
+        top = lo3.copy()
+        top[axes] = lo + shape * cell
+        per_axis = [1, 1, 1]
+        for a, n in zip(axes, shape):
+            per_axis[a] = int(n)
+        found = _admissible_cells(field, lo3, top, per_axis, threshold)
+        if found is not None:
+            admissible = np.zeros(len(coords), dtype=bool)
+            admissible[np.ravel_multi_index(found[2][:, axes].T, tuple(shape))] = True
+            misses[~admissible] = k
+            evaluations += found[3]
+
+    def lift(p):
+        full = np.repeat(lo3[None, :], len(p), axis=0)
+        full[:, axes] = p
+        return full
+
+    while count < limit:
+        if not (~taken & (misses < k)).any():
+            break
+        rounds += 1
+        for g in gen.permutation(len(groups)):
+            cells = groups[g]
+            cells = cells[~taken[cells] & (misses[cells] < k)]
+            if len(cells) == 0:
+                continue
+            cand = lo + (coords[cells] + gen.random((len(cells), d))) * cell
+            darts += len(cells)
+            ok = np.all(cand <= hi, axis=1)
+
+            full = lift(cand)
+            if field is not None:
+                ok &= _evaluate_points(field, full) >= threshold
+                evaluations += len(cells)
+            r = np.full(len(cells), r_min)
+            if varying:
+                a, b = density_range
+                t = (_evaluate_points(density_field, full) - a) / ((b - a) or 1.0)
+                r = r_max + (r_min - r_max) * np.clip(t, 0.0, 1.0)
+                evaluations += len(cells)
+
+            # Spacing against the neighbourhood; cells of one phase group
+            # are too far apart to conflict with each other
+            near = slots[cells][:, None] + neighbours[None, :]
+            dist2 = 0.0
+            for i in range(d):
+                delta = pts[i][near] - cand[:, i, None]
+                dist2 = dist2 + delta * delta
+            if varying:
+                need = 0.5 * (r[:, None] + rad[near])
+                ok &= ~(dist2 < need * need).any(axis=1)
+            else:
+                ok &= ~(dist2 < r_min * r_min).any(axis=1)
+
+            won = np.flatnonzero(ok)[:max(limit - count, 0)]
+            slot = slots[cells[won]]
+            pts[:, slot] = cand[won].T
+            rad[slot] = r[won]
+            filled[slot] = True
+            taken[cells[won]] = True
+            misses[cells[~ok]] += 1
+            count += len(won)
+            if count >= limit:
+                break
+
+    if stats is not None:
+        stats.update(points=count, darts=darts, evaluations=evaluations, rounds=rounds)
+    return [tuple(p) for p in lift(pts[:, filled].T).tolist()]
@@ -3,12 +3,18 @@ Seam and obstruction operators for TARTAN-style gluing artifacts.
 
 seam_displacement maps a point to its displaced position near a seam plane.
 seam_obstruction_metric returns [0,1] proximity to a seam (1 = on seam).
+
+The *_points variants take (M, 3) vertex arrays and any number of Seams,
+for whole meshes at once (NumPy required).
 """
 
 from __future__ import annotations
 import math
+from dataclasses import dataclass
+from typing import Sequence
 
 from .vec import Vec3, smoothstep
+from .arrays import np
 
 _AXES = {"x": 0, "y": 1, "z": 2}
 
@@ -74,3 +80,73 @@ def seam_obstruction_metric(
     idx = _AXES[seam_axis]
     coord = (x, y, z)[idx]
     return 1.0 - smoothstep(0.0, width, abs(coord - seam_position))
+
+
+# ---------------------------------------------------------------------------
+# Whole-mesh variants
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Seam:
+    """One seam: the keyword arguments of seam_displacement."""
+    axis: str = "x"
+    position: float = 0.0
+    width: float = 0.15
+    offset: Vec3 = (0.15, 0.0, 0.0)
+    twist: float = 0.0
+
+
+# Coordinates rotated by a twist about each axis
+_TWIST_PLANE = {0: (1, 2), 1: (0, 2), 2: (0, 1)}
+
+
+def _smoothstep(edge0, edge1, x):
+    """Array smoothstep; like vec.smoothstep, 0 where edge0 == edge1."""
+    span = edge1 - edge0
+    t = np.clip((x - edge0) / np.where(span == 0, 1.0, span), 0.0, 1.0)
+    return np.where(span == 0, 0.0, t * t * (3.0 - 2.0 * t))
+
+
+def seam_obstruction_points(points, seams: Sequence[Seam]):
+    """
+    seam_obstruction_metric for every point and seam in one pass:
+    (M, 3) points -> (S, M) masks.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    axis = np.array([_AXES[s.axis] for s in seams], dtype=np.int64)
+    position = np.array([s.position for s in seams], dtype=float)[:, None]
+    width = np.array([s.width for s in seams], dtype=float)[:, None]
+    d = np.abs(points.T[axis] - position)
+    return 1.0 - _smoothstep(0.0, width, d)
+
+
+def seam_displacement_points(points, seams: Sequence[Seam]):
+    """
+    seam_displacement for every point: (M, 3) points -> (M, 3) displaced.
+
+    Seams apply in order, each to the output of the previous one, as if
+    seam_displacement were chained per vertex.
+    """
+    p = np.array(points, dtype=float).reshape(-1, 3)
+    for seam in seams:
+        idx = _AXES[seam.axis]
+        blend = _smoothstep(-seam.width, seam.width, p[:, idx] - seam.position)
+        centered = 2.0 * blend - 1.0
+        p += np.asarray(seam.offset, dtype=float) * centered[:, None]
+
+        if seam.twist != 0.0:
+            angle = seam.twist * centered
+            c, s = np.cos(angle), np.sin(angle)
+            i, j = _TWIST_PLANE[idx]
+            u, v = p[:, i].copy(), p[:, j]
+            p[:, i] = c * u - s * v
+            p[:, j] = s * u + c * v
+    return p
+
+
+def apply_seams(points, seams: Sequence[Seam]):
+    """
+    Displaced points and per-seam masks, both measured from the input:
+    ((M, 3) displaced, (S, M) masks).
+    """
+    return seam_displacement_points(points, seams), seam_obstruction_points(points, seams)
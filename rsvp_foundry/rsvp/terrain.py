@@ -11,6 +11,8 @@ import math
 from .vec import Vec3, lerp
 from .fields import ScalarFn, VectorFn, Basin, HarmonicField, DirectionalBias, EntropyCap
 from .operators import scalar_gradient
+from .arrays import np
+from .raster import rasterize_height_map
 
 
 # ---------------------------------------------------------------------------
@@ -25,17 +27,21 @@ def sample_height_map(
     bounds_max: tuple[float, float] = (1.0, 1.0),
     z_scale: float = 1.0,
 ) -> list[list[float]]:
-    """Rasterise field at z=0 into a 2-D height map (nx rows, ny columns)."""
+    """
+    Rasterise field at z=0 into a 2-D height map (nx rows, ny columns).
+
+    List form of rasterize_height_map (float64, in-process); prefer that
+    for large maps.
+    """
+    if np is not None:
+        return rasterize_height_map(field, nx, ny, bounds_min, bounds_max, z_scale,
+                                    workers=1, dtype=float).tolist()
+
     xmin, ymin = bounds_min
     xmax, ymax = bounds_max
-
-    return [
-        [z_scale * field(lerp(xmin, xmax, ix / max(nx - 1, 1)),
-                         lerp(ymin, ymax, iy / max(ny - 1, 1)),
-                         0.0)
-         for iy in range(ny)]
-        for ix in range(nx)
-    ]
+    xs = [lerp(xmin, xmax, ix / max(nx - 1, 1)) for ix in range(nx)]
+    ys = [lerp(ymin, ymax, iy / max(ny - 1, 1)) for iy in range(ny)]
+    return [[z_scale * field(x, y, 0.0) for y in ys] for x in xs]
 
 
 # ---------------------------------------------------------------------------
@@ -40,6 +40,10 @@ EXTRA_PARAMS=""
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# Shared field cache: sampled fields and growth paths are reused across
+# seeds, jobs and replay.sh runs (set RSVP_CACHE_DIR= to disable)
+export RSVP_CACHE_DIR="${RSVP_CACHE_DIR-${SCRIPT_DIR}/rsvp_output/.cache}"
+
 # ---------------------------------------------------------------------------
 # Argument parsing
 # ---------------------------------------------------------------------------